@@ -21,18 +21,30 @@ if SCRIPT_DIR not in sys.path:
 
 # Importar el extractor de características
 try:
-    from scripts.nlp_features import NLPFeatureExtractor
+    from scripts.nlp_features import NLPFeatureExtractor, MOTOR_ORACIONES_DEFECTO
     print("✓ NLPFeatureExtractor importado correctamente")
 except ImportError as e:
     print(f"⚠️ Error al importar NLPFeatureExtractor: {e}")
     print(f"⚠️ Asegúrate de que existe scripts/__init__.py y scripts/nlp_features.py")
     NLPFeatureExtractor = None
+    MOTOR_ORACIONES_DEFECTO = 'punkt'
 
 # Configuración
 MODEL_DIR = os.path.join(SCRIPT_DIR, "models")
 MODEL_PATH = os.path.join(MODEL_DIR, "review_helpfulness_model_latest.pkl")
 METADATA_PATH = os.path.join(MODEL_DIR, "review_helpfulness_model_latest_metadata.json")
 
+# Límite duro del texto de entrada: por encima se responde 413. Entre el
+# presupuesto del extractor (MAX_CARACTERES_TEXTO) y este límite el texto se
+# acepta, pero las características se calculan sobre su inicio (truncated=True)
+MAX_CARACTERES_ENTRADA = 200000
+
+# Características que usa generar_sugerencias además de las del modelo (las
+# de sentimiento solo se usan si el modelo ya las calcula)
+CARACTERISTICAS_SUGERENCIAS = [
+    'word_count', 'sentence_count', 'lexical_diversity', 'question_count', 'exclamation_count'
+]
+
 # Inicializar FastAPI
 app = FastAPI(
     title="Review Helpfulness Prediction API",
@@ -77,6 +89,7 @@ class PredictionResponse(BaseModel):
     confidence: str = Field(..., description="Nivel de confianza: 'high', 'medium', 'low'")
     features: Dict[str, float] = Field(..., description="Características extraídas de la reseña")
     suggestions: List[str] = Field(..., description="Sugerencias para mejorar la reseña")
+    truncated: bool = Field(False, description="True si el texto superaba el presupuesto de caracteres y solo se analizó su inicio")
 
 
 class HealthResponse(BaseModel):
@@ -113,14 +126,23 @@ def cargar_modelo():
         with open(METADATA_PATH, 'r') as f:
             metadata = json.load(f)
             feature_columns = metadata.get('feature_columns', [])
+            # Mismo motor de oraciones que en el entrenamiento
+            motor_oraciones = metadata.get('sentence_engine', MOTOR_ORACIONES_DEFECTO)
     else:
         raise FileNotFoundError(f"Metadatos no encontrados en {METADATA_PATH}")
 
-    # Inicializar extractor de características
-    feature_extractor = NLPFeatureExtractor()
+    # Inicializar extractor de características: solo calcula lo que
+    # necesitan el modelo y las sugerencias
+    columnas = feature_columns + [col for col in CARACTERISTICAS_SUGERENCIAS if col not in feature_columns]
+    feature_extractor = NLPFeatureExtractor(motor_oraciones=motor_oraciones, columnas=columnas)
 
     print(f"✓ Modelo cargado desde: {MODEL_PATH}")
     print(f"✓ Características: {len(feature_columns)}")
+    print(f"✓ Motor de oraciones: {motor_oraciones}")
+    print(f"✓ Plan de características: {feature_extractor.plan.resumen()}")
+    if feature_extractor.plan.faltantes:
+        print(f"⚠️ El modelo usa columnas que la API no calcula (se envían como 0): "
+              f"{feature_extractor.plan.faltantes}")
 
 
 def generar_sugerencias(features: Dict[str, float], probability: float) -> List[str]:
@@ -148,12 +170,14 @@ def generar_sugerencias(features: Dict[str, float], probability: float) -> List[
     if sentence_count < 3:
         sugerencias.append("Estructura tu reseña en varios puntos para hacerla más clara y fácil de leer.")
 
-    # Sentimiento
-    vader_compound = features.get('vader_compound', 0)
-    textblob_polarity = features.get('textblob_polarity', 0)
+    # Sentimiento (solo si el modelo lo calcula: no se carga VADER ni
+    # TextBlob únicamente para esta sugerencia)
+    if 'vader_compound' in features or 'textblob_polarity' in features:
+        vader_compound = features.get('vader_compound', 0)
+        textblob_polarity = features.get('textblob_polarity', 0)
 
-    if abs(vader_compound) < 0.2 and abs(textblob_polarity) < 0.2:
-        sugerencias.append("Tu reseña parece neutral. Expresa claramente si recomiendas el producto y por qué.")
+        if abs(vader_compound) < 0.2 and abs(textblob_polarity) < 0.2:
+            sugerencias.append("Tu reseña parece neutral. Expresa claramente si recomiendas el producto y por qué.")
 
     # Diversidad léxica
     lexical_diversity = features.get('lexical_diversity', 0)
@@ -254,6 +278,12 @@ async def predict_helpfulness(review: ReviewInput):
             detail="Modelo no disponible. Por favor entrena el modelo primero ejecutando model_training.py"
         )
 
+    if len(review.text) > MAX_CARACTERES_ENTRADA:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Texto demasiado largo ({len(review.text)} caracteres). Máximo: {MAX_CARACTERES_ENTRADA}"
+        )
+
     try:
         # Extraer características
         features = feature_extractor.extraer_todas_caracteristicas(review.text, review.score)
@@ -276,7 +306,8 @@ async def predict_helpfulness(review: ReviewInput):
             is_helpful=is_helpful,
             confidence=confidence,
             features=features,
-            suggestions=suggestions
+            suggestions=suggestions,
+            truncated=feature_extractor.excede_presupuesto(review.text)
         )
 
     except Exception as e:
@@ -306,6 +337,9 @@ async def model_info():
         "features_count": len(feature_columns),
         "feature_columns": feature_columns,
         "metrics": metadata.get('metrics', {}),
+        "sentence_engine": metadata.get('sentence_engine', MOTOR_ORACIONES_DEFECTO),
+        "feature_groups": feature_extractor.plan.grupos if feature_extractor is not None else [],
+        "missing_features": feature_extractor.plan.faltantes if feature_extractor is not None else [],
         "timestamp": metadata.get('timestamp', 'unknown')
     }
 
@@ -0,0 +1,604 @@
+"""
+Benchmarks - Review Helpfulness Prediction
+Mide el rendimiento de las etapas del pipeline sobre copias locales del dataset.
+
+Uso:
+    python benchmarks.py snap --snap data/finefoods.txt.gz --csv data/Reviews.csv
+    python benchmarks.py csv --csv data/Reviews.csv --tamanos 50000 200000 0
+    python benchmarks.py limpieza --csv data/Reviews.csv --nrows 50000
+    python benchmarks.py limpieza-completa --csv data/Reviews.csv --procesos 1 2 4 8
+    python benchmarks.py importacion --modulos limpieza nlp_features
+    python benchmarks.py offsets --csv data/Reviews.csv --nrows 50000
+    python benchmarks.py caracteristicas --csv data/Reviews.csv --nrows 50000
+    python benchmarks.py oraciones --csv data/Reviews.csv --nrows 50000
+    python benchmarks.py validacion --csv data/Reviews.csv --nrows 5000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+
+# Añadir el directorio scripts al path
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(SCRIPT_DIR, "scripts")
+sys.path.append(SCRIPTS_DIR)
+
+DATA_DIR = os.path.join(SCRIPT_DIR, "data")
+
+
+def print_section(title):
+    """Imprime una sección con formato."""
+    print("\n" + "="*70)
+    print(f"  {title}")
+    print("="*70 + "\n")
+
+
+def medir(func, *args, repeticiones=1, **kwargs):
+    """
+    Ejecuta una función y mide su mejor tiempo de pared.
+
+    Args:
+        func: Función a medir
+        repeticiones: Número de ejecuciones (se informa la más rápida)
+
+    Returns:
+        tuple: (segundos, resultado de la última ejecución)
+    """
+    mejor = float('inf')
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = func(*args, **kwargs)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def benchmark_snap(ruta_snap, ruta_csv, nrows=None, repeticiones=1):
+    """
+    Compara el parser SNAP (finefoods.txt.gz) con pd.read_csv sobre Reviews.csv.
+
+    Args:
+        ruta_snap: Ruta local a finefoods.txt.gz
+        ruta_csv: Ruta local a Reviews.csv
+        nrows: Reseñas a leer de cada archivo (None para todas)
+        repeticiones: Repeticiones por medición
+    """
+    import pandas as pd
+    from formato_snap import leer_snap
+
+    print_section("INGESTA: SNAP finefoods.txt.gz vs Reviews.csv")
+
+    t_snap, tabla = medir(leer_snap, ruta_snap, nrows=nrows, repeticiones=repeticiones)
+    print(f"SNAP -> Arrow:        {t_snap:8.2f} s  ({tabla.num_rows / t_snap:,.0f} filas/s)")
+
+    t_snap_pd, df_snap = medir(lambda: leer_snap(ruta_snap, nrows=nrows).to_pandas(), repeticiones=repeticiones)
+    print(f"SNAP -> pandas:       {t_snap_pd:8.2f} s  ({len(df_snap) / t_snap_pd:,.0f} filas/s)")
+
+    t_csv, df_csv = medir(pd.read_csv, ruta_csv, nrows=nrows, repeticiones=repeticiones)
+    print(f"CSV  -> pandas:       {t_csv:8.2f} s  ({len(df_csv) / t_csv:,.0f} filas/s)")
+
+    print(f"\nRelación SNAP/CSV (pandas): {t_snap_pd / t_csv:.2f}x")
+
+
+def benchmark_csv(ruta_csv, tamanos=(50000, 200000, None), repeticiones=1):
+    """
+    Compara los motores de lectura de CSV (pandas 'c' vs pyarrow multihilo).
+
+    Para cada tamaño se genera una copia temporal con las primeras filas
+    del CSV y se mide leer_csv con cada motor.
+
+    Args:
+        ruta_csv: Ruta local a Reviews.csv
+        tamanos: Filas de cada copia (None para el archivo completo)
+        repeticiones: Repeticiones por medición
+    """
+    from data_loader import leer_csv
+
+    print_section("INGESTA CSV: pandas (c) vs pyarrow (multihilo)")
+    print(f"Hilos disponibles: {os.cpu_count()}\n")
+    print(f"{'Filas':>10} {'c (s)':>10} {'pyarrow (s)':>12} {'Speedup':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for tamano in tamanos:
+            ruta = ruta_csv
+            if tamano is not None:
+                ruta = os.path.join(tmp, f"reviews_{tamano}.csv")
+                leer_csv(ruta_csv, nrows=tamano, motor='c').to_csv(ruta, index=False)
+
+            t_c, df = medir(leer_csv, ruta, motor='c', repeticiones=repeticiones)
+            t_arrow, _ = medir(leer_csv, ruta, motor='pyarrow', repeticiones=repeticiones)
+            print(f"{len(df):>10} {t_c:>10.2f} {t_arrow:>12.2f} {t_c / t_arrow:>8.1f}x")
+
+
+def benchmark_limpieza(ruta_csv, nrows=50000, repeticiones=1):
+    """
+    Compara la limpieza básica fila a fila con la versión vectorizada.
+
+    Verifica además que FullReview y CleanText sean idénticos en ambas.
+
+    Args:
+        ruta_csv: Ruta local a Reviews.csv
+        nrows: Reseñas a limpiar
+        repeticiones: Repeticiones por medición
+    """
+    from data_loader import cargar_datos
+    from limpieza import limpiar_texto_basico
+
+    print_section("LIMPIEZA BÁSICA: fila a fila vs vectorizada")
+
+    df = cargar_datos(ruta_csv, nrows=nrows, columns=['Summary', 'Text'])
+
+    t_fila, df_fila = medir(lambda: limpiar_texto_basico(df.copy(), vectorizado=False), repeticiones=repeticiones)
+    t_vec, df_vec = medir(lambda: limpiar_texto_basico(df.copy(), vectorizado=True), repeticiones=repeticiones)
+
+    identico = all(
+        df_fila[col].astype(object).equals(df_vec[col].astype(object))
+        for col in ['FullReview', 'CleanText']
+    )
+
+    print(f"\nFila a fila (apply): {t_fila:8.2f} s  ({len(df) / t_fila:,.0f} filas/s)")
+    print(f"Vectorizada:         {t_vec:8.2f} s  ({len(df) / t_vec:,.0f} filas/s)")
+    print(f"Speedup: {t_fila / t_vec:.1f}x")
+    print(f"Salida idéntica: {'✓ sí' if identico else '❌ NO'}")
+
+
+def benchmark_limpieza_completa(ruta_csv, nrows=50000, procesos=(1, 2, 4), chunksize=5000):
+    """
+    Mide la escalabilidad de la limpieza completa con distinto número de procesos.
+
+    Verifica además que ProcessedText sea idéntico al de la ejecución secuencial.
+
+    Args:
+        ruta_csv: Ruta local a Reviews.csv
+        nrows: Reseñas a limpiar (None para todas)
+        procesos: Números de procesos a probar
+        chunksize: Reseñas por lote en modo paralelo
+    """
+    from data_loader import cargar_datos
+    from limpieza import limpiar_texto_basico, aplicar_limpieza_completa
+
+    print_section("LIMPIEZA COMPLETA: escalabilidad por procesos")
+
+    df = limpiar_texto_basico(cargar_datos(ruta_csv, nrows=nrows, columns=['Summary', 'Text']))
+
+    referencia = None
+    t_base = None
+    filas = []
+    for n in procesos:
+        t, df_n = medir(lambda: aplicar_limpieza_completa(df.copy(), n_jobs=n, chunksize=chunksize))
+        if referencia is None:
+            referencia, t_base = df_n['ProcessedText'], t
+        filas.append((n, t, df_n['ProcessedText'].equals(referencia)))
+
+    print(f"\n{'Procesos':>9} {'Tiempo (s)':>11} {'Filas/s':>10} {'Speedup':>9} {'Idéntico':>9}")
+    for n, t, identico in filas:
+        print(f"{n:>9} {t:>11.2f} {len(df) / t:>10,.0f} {t_base / t:>8.1f}x {'✓' if identico else '❌':>9}")
+
+
+def benchmark_importacion(modulos=('limpieza', 'nlp_features'), repeticiones=5):
+    """
+    Mide el tiempo de importación de módulos de scripts/ en procesos nuevos.
+
+    Cada medición se hace en un intérprete limpio para que no influyan los
+    módulos ya cargados; se informa la más rápida.
+
+    Args:
+        modulos: Nombres de módulos dentro de scripts/
+        repeticiones: Procesos lanzados por módulo
+    """
+    print_section("TIEMPO DE IMPORTACIÓN DE MÓDULOS")
+    print(f"{'Módulo':<20} {'Tiempo (s)':>11}")
+
+    for modulo in modulos:
+        codigo = (
+            "import time; inicio = time.perf_counter(); "
+            f"import {modulo}; print(time.perf_counter() - inicio)"
+        )
+        tiempos = []
+        for _ in range(repeticiones):
+            salida = subprocess.run(
+                [sys.executable, '-c', codigo], cwd=SCRIPTS_DIR,
+                capture_output=True, text=True, check=True,
+            )
+            tiempos.append(float(salida.stdout.strip().splitlines()[-1]))
+        print(f"{modulo:<20} {min(tiempos):>11.3f}")
+
+
+def _tamano_directorio(ruta):
+    """Suma el tamaño en bytes de los archivos de un directorio."""
+    return sum(
+        os.path.getsize(os.path.join(raiz, nombre))
+        for raiz, _, archivos in os.walk(ruta) for nombre in archivos
+    )
+
+
+def benchmark_offsets(ruta_csv, nrows=50000):
+    """
+    Mide el coste de guardar TokenOffsets/SentenceOffsets en el dataset preparado.
+
+    Compara el tamaño en disco del Parquet particionado con y sin las
+    columnas de offsets, y el tiempo de calcularlas. Si Punkt no está
+    instalado se miden solo los offsets de tokens. Comprueba además que los
+    offsets se lean de vuelta con cargar_dataset sin cambios.
+
+    Args:
+        ruta_csv: Ruta local a Reviews.csv
+        nrows: Reseñas a preparar
+    """
+    from data_loader import cargar_datos
+    from almacenamiento import guardar_dataset, cargar_dataset
+    from limpieza import limpiar_texto_basico
+    from recursos_nltk import RecursoNLTKNoDisponible
+    from segmentacion import agregar_offsets, COLUMNA_TOKENS, COLUMNA_ORACIONES
+
+    print_section("OFFSETS DE TOKENS Y ORACIONES: coste de almacenamiento")
+
+    df = limpiar_texto_basico(cargar_datos(ruta_csv, nrows=nrows, columns=['Id', 'Time', 'Summary', 'Text']))
+    df = df[['Id', 'Time', 'CleanText']].copy()
+
+    try:
+        t_offsets, df_offsets = medir(agregar_offsets, df.copy())
+    except RecursoNLTKNoDisponible as e:
+        print(f"⚠️ {e}\nSe miden solo los offsets de tokens.")
+        t_offsets, df_offsets = medir(agregar_offsets, df.copy(), oraciones=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sin = os.path.join(tmp, 'sin_offsets')
+        con = os.path.join(tmp, 'con_offsets')
+        guardar_dataset(df, sin)
+        guardar_dataset(df_offsets, con)
+        bytes_sin, bytes_con = _tamano_directorio(sin), _tamano_directorio(con)
+
+        # Ida y vuelta: el particionado reordena las filas, se comparan por Id
+        leido = cargar_dataset(con).sort_values('Id').reset_index(drop=True)
+        original = df_offsets.sort_values('Id').reset_index(drop=True)
+        columnas = [col for col in (COLUMNA_TOKENS, COLUMNA_ORACIONES) if col in original.columns]
+        ida_vuelta = all(leido[col].tolist() == original[col].tolist() for col in columnas)
+
+    print(f"\nFilas: {len(df)}")
+    print(f"Cálculo de offsets:   {t_offsets:8.2f} s  ({len(df) / t_offsets:,.0f} filas/s)")
+    print(f"Parquet sin offsets:  {bytes_sin / 1024**2:8.2f} MB")
+    print(f"Parquet con offsets:  {bytes_con / 1024**2:8.2f} MB  (+{(bytes_con - bytes_sin) / bytes_sin * 100:.0f}%)")
+    print(f"Lectura con cargar_dataset idéntica: {'✓ sí' if ida_vuelta else '❌ NO'}")
+
+
+def benchmark_caracteristicas(ruta_csv, nrows=50000, columna='Text'):
+    """
+    Compara extraer_todas_caracteristicas fila a fila con extraer_lote.
+
+    Verifica además que la matriz de características sea idéntica en ambas
+    (prueba de paridad) y que el lote respete el presupuesto de caracteres.
+
+    Args:
+        ruta_csv: Ruta local a Reviews.csv
+        nrows: Reseñas a procesar
+        columna: 'Text' (texto original, con filas no ASCII) o 'CleanText'
+    """
+    import numpy as np
+    from data_loader import cargar_datos
+    from limpieza import limpiar_texto_basico
+    from nlp_features import NLPFeatureExtractor
+    from recursos_nltk import RecursoNLTKNoDisponible
+
+    print_section("CARACTERÍSTICAS NLP: fila a fila vs por lote")
+
+    df = cargar_datos(ruta_csv, nrows=nrows, columns=['Summary', 'Text'])
+    if columna == 'CleanText':
+        df = limpiar_texto_basico(df)
+    textos = df[columna].fillna('').astype(str).tolist()
+
+    try:
+        extractor = NLPFeatureExtractor()
+    except RecursoNLTKNoDisponible as e:
+        print(f"❌ {e}")
+        return
+
+    def fila_a_fila():
+        return np.array([
+            [features[col] for col in extractor.columnas]
+            for features in map(extractor.extraer_todas_caracteristicas, textos)
+        ], dtype=np.float64)
+
+    t_fila, matriz_fila = medir(fila_a_fila)
+    t_lote, matriz_lote = medir(extractor.extraer_lote, textos)
+
+    # Paridad también con un presupuesto que recorta parte de los textos
+    corto = NLPFeatureExtractor(max_caracteres=100)
+    recortado = np.array_equal(
+        np.array([[f[col] for col in corto.columnas]
+                  for f in map(corto.extraer_todas_caracteristicas, textos[:5000])]),
+        corto.extraer_lote(textos[:5000])
+    )
+
+    identico = np.array_equal(matriz_fila, matriz_lote)
+    no_ascii = sum(not texto.isascii() for texto in textos)
+
+    print(f"\nFilas: {len(textos)} ({no_ascii} con caracteres no ASCII)")
+    print(f"Fila a fila:  {t_fila:8.2f} s  ({len(textos) / t_fila:,.0f} filas/s)")
+    print(f"Por lote:     {t_lote:8.2f} s  ({len(textos) / t_lote:,.0f} filas/s)")
+    print(f"Speedup: {t_fila / t_lote:.1f}x")
+    print(f"Matriz idéntica: {'✓ sí' if identico else '❌ NO'}")
+    print(f"Matriz idéntica con textos recortados: {'✓ sí' if recortado else '❌ NO'}")
+    if not identico:
+        distintas = np.flatnonzero((matriz_fila != matriz_lote).any(axis=0))
+        print(f"Columnas distintas: {[extractor.columnas[j] for j in distintas]}")
+
+
+def benchmark_caracteristicas_paralelo(ruta_csv, nrows=50000, procesos=(1, 2, 4), tamano_lote=10000):
+    """
+    Mide procesar_dataset con distintos números de procesos.
+
+    Verifica además que los conteos sean idénticos a los de la ejecución
+    secuencial y que las proporciones coincidan con precisión float32.
+
+    Args:
+        ruta_csv: Ruta local a Reviews.csv
+        nrows: Reseñas a procesar (None para todas)
+        procesos: Números de procesos a probar
+        tamano_lote: Reseñas por lote
+    """
+    import numpy as np
+    from data_loader import cargar_datos
+    from limpieza import limpiar_texto_basico
+    from nlp_features import NLPFeatureExtractor, procesar_dataset
+    from recursos_nltk import RecursoNLTKNoDisponible
+
+    print_section("CARACTERÍSTICAS NLP: escalabilidad por procesos")
+
+    df = limpiar_texto_basico(cargar_datos(ruta_csv, nrows=nrows, columns=['Summary', 'Text', 'Score']))
+
+    try:
+        extractor = NLPFeatureExtractor()
+    except RecursoNLTKNoDisponible as e:
+        print(f"❌ {e}")
+        return
+    enteras = extractor.columnas_enteras
+    reales = [col for col in extractor.columnas if col not in enteras]
+
+    referencia = None
+    t_base = None
+    filas = []
+    for n in procesos:
+        t, df_n = medir(lambda: procesar_dataset(df, tamano_lote=tamano_lote, n_jobs=n))
+        if referencia is None:
+            referencia, t_base = df_n, t
+        identico = (
+            df_n[enteras].equals(referencia[enteras])
+            and np.allclose(df_n[reales], referencia[reales], rtol=1e-6, atol=1e-7)
+        )
+        filas.append((n, t, identico))
+
+    print(f"\n{'Procesos':>9} {'Tiempo (s)':>11} {'Filas/s':>10} {'Speedup':>9} {'Idéntico':>9}")
+    for n, t, identico in filas:
+        print(f"{n:>9} {t:>11.2f} {len(df) / t:>10,.0f} {t_base / t:>8.1f}x {'✓' if identico else '❌':>9}")
+
+
+def benchmark_oraciones(ruta_csv, nrows=50000, columna='CleanText', ejemplos=5):
+    """
+    Informe de concordancia del motor de oraciones 'regex' con Punkt.
+
+    Compara sentence_count de ambos motores texto a texto (coincidencia
+    exacta, a ±1, sesgo y correlación, también de words_per_sentence) y
+    mide el tiempo de cada uno.
+
+    Args:
+        ruta_csv: Ruta local a Reviews.csv
+        nrows: Reseñas a comparar
+        columna: 'CleanText' (lo que usa el pipeline) o 'Text'
+        ejemplos: Discrepancias de ejemplo a mostrar
+    """
+    import numpy as np
+    import pyarrow as pa
+    from data_loader import cargar_datos
+    from limpieza import limpiar_texto_basico
+    from recursos_nltk import obtener_punkt, RecursoNLTKNoDisponible
+    from segmentacion import contar_oraciones, contar_oraciones_lote
+
+    print_section("CONTEO DE ORACIONES: Punkt vs regex")
+
+    df = cargar_datos(ruta_csv, nrows=nrows, columns=['Summary', 'Text'])
+    if columna == 'CleanText':
+        df = limpiar_texto_basico(df)
+    textos = df[columna].fillna('').astype(str).tolist()
+
+    try:
+        punkt = obtener_punkt()
+    except RecursoNLTKNoDisponible as e:
+        print(f"❌ {e}")
+        return
+
+    t_punkt, con_punkt = medir(lambda: np.array([len(punkt.tokenize(t)) for t in textos]))
+    t_regex, con_regex = medir(lambda: np.array([contar_oraciones(t) for t in textos]))
+
+    ascii_ = [t for t in textos if t.isascii()]
+    t_lote, por_lote = medir(contar_oraciones_lote, pa.array(ascii_, type=pa.string()))
+    lote_identico = np.array_equal(por_lote, [contar_oraciones(t) for t in ascii_])
+
+    diferencia = con_regex - con_punkt
+    palabras = np.array([len(t.split()) for t in textos])
+    wps_punkt = np.divide(palabras, con_punkt, out=np.zeros(len(textos)), where=con_punkt > 0)
+    wps_regex = np.divide(palabras, con_regex, out=np.zeros(len(textos)), where=con_regex > 0)
+
+    print(f"\nTextos: {len(textos)} ({columna})")
+    print(f"Punkt:            {t_punkt:8.2f} s  ({len(textos) / t_punkt:,.0f} textos/s)")
+    print(f"regex:            {t_regex:8.2f} s  ({len(textos) / t_regex:,.0f} textos/s)  ({t_punkt / t_regex:.1f}x)")
+    print(f"regex por lote:   {t_lote:8.2f} s  ({len(ascii_) / max(t_lote, 1e-9):,.0f} textos/s, solo ASCII)")
+    print(f"Lote idéntico a texto a texto: {'✓ sí' if lote_identico else '❌ NO'}")
+
+    print("\n--- CONCORDANCIA sentence_count ---")
+    print(f"Coincidencia exacta: {np.mean(diferencia == 0) * 100:.2f}%")
+    print(f"Diferencia de ±1:    {np.mean(np.abs(diferencia) <= 1) * 100:.2f}%")
+    print(f"Error absoluto medio: {np.mean(np.abs(diferencia)):.3f} oraciones")
+    print(f"Sesgo medio (regex - Punkt): {np.mean(diferencia):+.3f} oraciones")
+    print(f"Correlación: {np.corrcoef(con_punkt, con_regex)[0, 1]:.4f}")
+    print(f"Correlación words_per_sentence: {np.corrcoef(wps_punkt, wps_regex)[0, 1]:.4f}")
+
+    print("\nDistribución de la diferencia (regex - Punkt):")
+    valores, conteos = np.unique(np.clip(diferencia, -3, 3), return_counts=True)
+    for valor, conteo in zip(valores, conteos):
+        etiqueta = f"{valor:+d}" if abs(valor) < 3 else f"{'<=' if valor < 0 else '>='}{valor:+d}"
+        print(f"  {etiqueta:>5}: {conteo:7d} ({conteo / len(textos) * 100:5.2f}%)")
+
+    distintos = np.flatnonzero(diferencia != 0)[:ejemplos]
+    if len(distintos):
+        print("\nEjemplos de discrepancia:")
+        for i in distintos:
+            print(f"  Punkt={con_punkt[i]} regex={con_regex[i]}: {textos[i][:120]!r}")
+
+
+def benchmark_validacion(ruta_csv, nrows=5000):
+    """
+    Regresión de la validación con valores no numéricos en columnas enteras.
+
+    Copia las primeras nrows reseñas con un Time no numérico, un Score nulo
+    y un HelpfulnessNumerator no numérico, y comprueba que cada ruta de
+    cargar_datos (caché, sin caché, motor 'c' y nrows) termina la carga y
+    aparta exactamente esas filas a cuarentena en lugar de fallar.
+
+    Args:
+        ruta_csv: Ruta local a Reviews.csv
+        nrows: Reseñas a copiar (al menos 3)
+    """
+    import pandas as pd
+    import data_loader
+    from data_loader import cargar_datos, _rutas_cache
+
+    print_section("VALIDACIÓN: valores no numéricos en columnas enteras")
+
+    df = pd.read_csv(ruta_csv, nrows=nrows, dtype=str)
+    df.loc[0, 'Time'] = 'notatime'
+    df.loc[1, 'Score'] = None
+    df.loc[2, 'HelpfulnessNumerator'] = 'n/a'
+    esperados = set(df['Id'].iloc[:3].astype(int))
+
+    rutas_cuarentena = (data_loader.CUARENTENA_PATH, data_loader.CUARENTENA_PARCIAL_PATH)
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, 'regresion_validacion.csv')
+        df.to_csv(ruta, index=False)
+        # La cuarentena de la prueba no pisa la de data/
+        data_loader.CUARENTENA_PATH = os.path.join(tmp, 'cuarentena.csv')
+        data_loader.CUARENTENA_PARCIAL_PATH = os.path.join(tmp, 'cuarentena_parcial.csv')
+
+        casos = {
+            'caché Parquet': dict(),
+            'sin caché (pyarrow)': dict(usar_cache=False),
+            "sin caché (motor 'c')": dict(usar_cache=False, motor='c'),
+            'nrows con caché': dict(nrows=nrows // 2),
+            'nrows sin caché': dict(nrows=nrows // 2, usar_cache=False),
+        }
+        resultados = {}
+        try:
+            for nombre, opciones in casos.items():
+                cargado = cargar_datos(ruta, **opciones)
+                if cargado is None:
+                    resultados[nombre] = '❌ la carga falló'
+                    continue
+                parcial = 'nrows' in opciones
+                cuarentena = pd.read_csv(data_loader.CUARENTENA_PARCIAL_PATH if parcial else data_loader.CUARENTENA_PATH)
+                ok = (set(cuarentena['Id']) == esperados
+                      and not esperados & set(cargado['Id'])
+                      and len(cargado) == (opciones.get('nrows') or nrows - len(esperados))
+                      and all(pd.api.types.is_integer_dtype(cargado[col])
+                              for col in ('Score', 'Time', 'HelpfulnessNumerator')))
+                resultados[nombre] = '✓ ok' if ok else '❌ cuarentena o tipos incorrectos'
+        finally:
+            data_loader.CUARENTENA_PATH, data_loader.CUARENTENA_PARCIAL_PATH = rutas_cuarentena
+            for archivo in _rutas_cache(ruta):
+                if os.path.exists(archivo):
+                    os.remove(archivo)
+
+    print()
+    for nombre, resultado in resultados.items():
+        print(f"  {nombre:24s} {resultado}")
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(
+        description='Benchmarks de rendimiento del pipeline de utilidad de reseñas'
+    )
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    p_snap = subparsers.add_parser('snap', help='Parser SNAP vs lectura del CSV')
+    p_snap.add_argument('--snap', default=os.path.join(DATA_DIR, 'finefoods.txt.gz'))
+    p_snap.add_argument('--csv', default=os.path.join(DATA_DIR, 'Reviews.csv'))
+    p_snap.add_argument('--nrows', type=int, default=0, help='Filas a leer (0 para todas)')
+    p_snap.add_argument('--repeticiones', type=int, default=1)
+
+    p_csv = subparsers.add_parser('csv', help='Motores de lectura de CSV')
+    p_csv.add_argument('--csv', default=os.path.join(DATA_DIR, 'Reviews.csv'))
+    p_csv.add_argument('--tamanos', type=int, nargs='+', default=[50000, 200000, 0],
+                       help='Filas por prueba (0 para el archivo completo)')
+    p_csv.add_argument('--repeticiones', type=int, default=1)
+
+    p_limpieza = subparsers.add_parser('limpieza', help='Limpieza básica fila a fila vs vectorizada')
+    p_limpieza.add_argument('--csv', default=os.path.join(DATA_DIR, 'Reviews.csv'))
+    p_limpieza.add_argument('--nrows', type=int, default=50000)
+    p_limpieza.add_argument('--repeticiones', type=int, default=1)
+
+    p_completa = subparsers.add_parser('limpieza-completa', help='Limpieza completa secuencial vs paralela')
+    p_completa.add_argument('--csv', default=os.path.join(DATA_DIR, 'Reviews.csv'))
+    p_completa.add_argument('--nrows', type=int, default=50000, help='Filas a limpiar (0 para todas)')
+    p_completa.add_argument('--procesos', type=int, nargs='+', default=[1, 2, 4])
+    p_completa.add_argument('--chunksize', type=int, default=5000)
+
+    p_importacion = subparsers.add_parser('importacion', help='Tiempo de importación de los módulos')
+    p_importacion.add_argument('--modulos', nargs='+', default=['limpieza', 'nlp_features'])
+    p_importacion.add_argument('--repeticiones', type=int, default=5)
+
+    p_offsets = subparsers.add_parser('offsets', help='Coste de guardar los offsets de tokens y oraciones')
+    p_offsets.add_argument('--csv', default=os.path.join(DATA_DIR, 'Reviews.csv'))
+    p_offsets.add_argument('--nrows', type=int, default=50000)
+
+    p_caracteristicas = subparsers.add_parser('caracteristicas', help='Extracción de características fila a fila vs por lote')
+    p_caracteristicas.add_argument('--csv', default=os.path.join(DATA_DIR, 'Reviews.csv'))
+    p_caracteristicas.add_argument('--nrows', type=int, default=50000)
+    p_caracteristicas.add_argument('--columna', choices=['Text', 'CleanText'], default='Text')
+
+    p_paralelo = subparsers.add_parser('caracteristicas-paralelo', help='Extracción de características secuencial vs paralela')
+    p_paralelo.add_argument('--csv', default=os.path.join(DATA_DIR, 'Reviews.csv'))
+    p_paralelo.add_argument('--nrows', type=int, default=50000, help='Filas a procesar (0 para todas)')
+    p_paralelo.add_argument('--procesos', type=int, nargs='+', default=[1, 2, 4])
+    p_paralelo.add_argument('--tamano-lote', type=int, default=10000)
+
+    p_oraciones = subparsers.add_parser('oraciones', help='Concordancia y velocidad del motor de oraciones regex vs Punkt')
+    p_oraciones.add_argument('--csv', default=os.path.join(DATA_DIR, 'Reviews.csv'))
+    p_oraciones.add_argument('--nrows', type=int, default=50000)
+    p_oraciones.add_argument('--columna', choices=['Text', 'CleanText'], default='CleanText')
+
+    p_validacion = subparsers.add_parser('validacion', help='Regresión de la validación con valores no numéricos')
+    p_validacion.add_argument('--csv', default=os.path.join(DATA_DIR, 'Reviews.csv'))
+    p_validacion.add_argument('--nrows', type=int, default=5000)
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'snap':
+        benchmark_snap(args.snap, args.csv, nrows=args.nrows or None, repeticiones=args.repeticiones)
+    elif args.benchmark == 'csv':
+        tamanos = [t or None for t in args.tamanos]
+        benchmark_csv(args.csv, tamanos=tamanos, repeticiones=args.repeticiones)
+    elif args.benchmark == 'limpieza':
+        benchmark_limpieza(args.csv, nrows=args.nrows, repeticiones=args.repeticiones)
+    elif args.benchmark == 'limpieza-completa':
+        benchmark_limpieza_completa(args.csv, nrows=args.nrows or None,
+                                    procesos=args.procesos, chunksize=args.chunksize)
+    elif args.benchmark == 'importacion':
+        benchmark_importacion(args.modulos, repeticiones=args.repeticiones)
+    elif args.benchmark == 'offsets':
+        benchmark_offsets(args.csv, nrows=args.nrows)
+    elif args.benchmark == 'caracteristicas':
+        benchmark_caracteristicas(args.csv, nrows=args.nrows, columna=args.columna)
+    elif args.benchmark == 'caracteristicas-paralelo':
+        benchmark_caracteristicas_paralelo(args.csv, nrows=args.nrows or None,
+                                           procesos=args.procesos, tamano_lote=args.tamano_lote)
+    elif args.benchmark == 'oraciones':
+        benchmark_oraciones(args.csv, nrows=args.nrows, columna=args.columna)
+    elif args.benchmark == 'validacion':
+        benchmark_validacion(args.csv, nrows=args.nrows)
+
+
+if __name__ == "__main__":
+    main()
@@ -72,6 +72,7 @@ def check_nltk_data():
     nltk_data = [
         ('corpora/stopwords', 'stopwords'),
         ('tokenizers/punkt', 'punkt'),
+        ('tokenizers/punkt_tab', 'punkt_tab'),
         ('corpora/wordnet', 'wordnet'),
         ('sentiment/vader_lexicon.zip', 'vader_lexicon'),
     ]
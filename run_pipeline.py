@@ -27,13 +27,27 @@ def print_step(step_num, total_steps, description):
     print("-" * 70)
 
 
-def run_pipeline(nrows=50000, skip_training=False):
+def run_pipeline(nrows=50000, skip_training=False, pushdown=True,
+                 muestreo=True, estratificar_por=None, semilla=42, incremental=False,
+                 motor_oraciones='punkt', n_jobs=1):
     """
     Ejecuta el pipeline completo.
 
     Args:
         nrows: Número de filas a procesar (None para todo el dataset)
         skip_training: Si True, salta el entrenamiento del modelo
+        pushdown: Si True, carga solo las columnas usadas y las reseñas con votos
+        muestreo: Si True, las nrows filas son una muestra aleatoria de todo el
+            dataset; si False, se toman las primeras nrows filas
+        estratificar_por: Columna de estrato para la muestra (p.ej. 'Score')
+        semilla: Semilla de la muestra aleatoria
+        incremental: Si True, procesa solo las reseñas con Id posterior a la
+            marca de agua del dataset preparado (hasta nrows) y las añade a los
+            datasets existentes; el modelo se entrena con el dataset completo
+        motor_oraciones: Motor de conteo de oraciones ('punkt' o 'regex');
+            se guarda en los metadatos del modelo y la API usa el mismo
+        n_jobs: Procesos para la extracción de características (1 para
+            secuencial, None para todos los núcleos)
     """
     start_time = time.time()
 
@@ -45,31 +59,86 @@ def run_pipeline(nrows=50000, skip_training=False):
         # ===== PASO 1: CARGAR DATOS =====
         print_step(1, 4, "CARGANDO DATOS")
 
-        from data_loader import cargar_datos, DATA_PATH
+        from data_loader import cargar_datos, cargar_muestra, memoria_mb, DATA_PATH, SNAP_PATH
 
-        if not os.path.exists(DATA_PATH):
+        # Usar el CSV de Kaggle y, si no está, el finefoods.txt.gz de SNAP
+        data_path = DATA_PATH if os.path.exists(DATA_PATH) else SNAP_PATH
+
+        if not os.path.exists(data_path):
             print(f"❌ ERROR: Dataset no encontrado en {DATA_PATH}")
             print("Por favor, descarga el dataset de Amazon Reviews desde:")
             print("https://www.kaggle.com/snap/amazon-fine-food-reviews")
             print("y colócalo en la carpeta 'data/' con el nombre 'Reviews.csv'")
+            print(f"(también se admite el archivo de SNAP en {SNAP_PATH})")
             return False
 
-        df = cargar_datos(DATA_PATH, nrows=nrows)
+        from limpieza import COLUMNAS_PIPELINE, FILTRO_VOTOS, filtros_incrementales, calcular_marca_agua
+        from almacenamiento import leer_marca_agua
+
+        columns, filters = (COLUMNAS_PIPELINE, FILTRO_VOTOS) if pushdown else (None, None)
+
+        output_path_cleaned = os.path.join(SCRIPT_DIR, "data", "amazon_reviews_prepared")
+        output_path_features = os.path.join(SCRIPT_DIR, "data", "amazon_reviews_with_features")
+
+        # En modo incremental se leen solo las reseñas posteriores a la marca
+        # de agua; sin marca previa, la primera ejecución procesa desde el inicio
+        modo_escritura = 'completo'
+        if incremental:
+            if leer_marca_agua(output_path_cleaned) is not None:
+                modo_escritura = 'anadir'
+            filters = filtros_incrementales(output_path_cleaned, filters)
+
+        # Alcance de la deduplicación del paso 2: solo compara las filas
+        # cargadas aquí, no hace una pasada aparte sobre todo el archivo
+        if incremental:
+            alcance_dedup = "solo entre las reseñas nuevas (no se comparan con las ya procesadas)"
+        elif nrows and muestreo:
+            alcance_dedup = f"solo dentro de la muestra de {nrows} reseñas"
+        elif nrows:
+            alcance_dedup = f"solo entre las primeras {nrows} reseñas"
+        else:
+            alcance_dedup = "sobre todo el dataset cargado"
+
+        if nrows and muestreo and not incremental:
+            df = cargar_muestra(
+                data_path, n=nrows, semilla=semilla, estratificar_por=estratificar_por,
+                columns=columns, filters=filters
+            )
+        else:
+            df = cargar_datos(data_path, nrows=nrows, columns=columns, filters=filters)
 
         if df is None:
             print("❌ ERROR: No se pudo cargar el dataset")
             return False
 
-        print(f"✓ Dataset cargado: {len(df)} filas")
+        print(f"✓ Dataset cargado: {len(df)} filas ({memoria_mb(df):.1f} MB en memoria)")
+
+        if incremental and len(df) == 0:
+            print("✓ No hay reseñas nuevas desde la última ejecución")
+            return True
+
+        marca_agua = calcular_marca_agua(df) if incremental else None
 
         # ===== PASO 2: LIMPIEZA Y PREPROCESAMIENTO =====
         print_step(2, 4, "LIMPIEZA Y PREPROCESAMIENTO")
 
         from limpieza import (
+            DeduplicadorResenas,
+            deduplicar_resenas,
             calcular_tasa_utilidad,
             limpiar_texto_basico,
             preparar_dataset
         )
+        from cache_limpieza import CacheLimpieza
+
+        # Eliminar reseñas duplicadas antes de limpiar y extraer características
+        deduplicador = DeduplicadorResenas()
+        df = deduplicar_resenas(df, deduplicador)
+        print(f"Duplicados buscados {alcance_dedup}")
+
+        # Tiempo de las etapas de cómputo por fila (sin lecturas ni escrituras),
+        # para estimar lo que ahorra la deduplicación
+        inicio_etapa = time.perf_counter()
 
         # Calcular tasa de utilidad
         df = calcular_tasa_utilidad(df, umbral=0.7)
@@ -78,14 +147,18 @@ def run_pipeline(nrows=50000, skip_training=False):
             print("❌ ERROR: No hay datos después de filtrar por votos")
             return False
 
-        # Limpiar texto
-        df = limpiar_texto_basico(df)
+        # Limpiar texto (los textos ya limpiados en ejecuciones previas salen de la caché)
+        df = limpiar_texto_basico(df, cache=CacheLimpieza())
+        tiempo_computo = time.perf_counter() - inicio_etapa
 
-        # Guardar dataset preparado
-        output_path_cleaned = os.path.join(SCRIPT_DIR, "data", "amazon_reviews_prepared.csv")
-        df_prepared = preparar_dataset(df, output_path_cleaned, limpieza_completa=False)
+        # Guardar dataset preparado (con las oraciones de Punkt para el paso 3;
+        # el motor 'regex' no las usa)
+        df_prepared = preparar_dataset(
+            df, output_path_cleaned, limpieza_completa=False,
+            incremental=incremental, marca_agua=marca_agua, offsets=motor_oraciones == 'punkt'
+        )
 
-        print(f"✓ Limpieza completada: {len(df_prepared)} filas")
+        print(f"✓ Limpieza completada: {len(df_prepared)} filas ({memoria_mb(df_prepared):.1f} MB en memoria)")
 
         # ===== PASO 3: EXTRACCIÓN DE CARACTERÍSTICAS NLP =====
         print_step(3, 4, "EXTRAYENDO CARACTERÍSTICAS NLP")
@@ -93,25 +166,44 @@ def run_pipeline(nrows=50000, skip_training=False):
         from nlp_features import procesar_dataset, obtener_estadisticas_features
 
         # Extraer características
-        df_con_features = procesar_dataset(df_prepared, text_column='CleanText', score_column='Score')
+        inicio_etapa = time.perf_counter()
+        df_con_features = procesar_dataset(
+            df_prepared, text_column='CleanText', score_column='Score', motor_oraciones=motor_oraciones,
+            n_jobs=n_jobs
+        )
+        tiempo_computo += time.perf_counter() - inicio_etapa
 
         # Estadísticas
         obtener_estadisticas_features(df_con_features)
 
         # Guardar dataset con características
-        output_path_features = os.path.join(SCRIPT_DIR, "data", "amazon_reviews_with_features.csv")
-        df_con_features.to_csv(output_path_features, index=False)
+        from almacenamiento import guardar_dataset, cargar_dataset
+
+        guardar_dataset(df_con_features, output_path_features, modo=modo_escritura)
 
         print(f"✓ Características extraídas: {len(df_con_features.columns)} columnas")
 
+        # Tiempo ahorrado por la deduplicación: coste medio por fila de
+        # limpieza + características (tiempo real, sin la E/S de Parquet)
+        # multiplicado por las filas eliminadas
+        coste_por_fila = tiempo_computo / max(len(df_con_features), 1)
+        ahorro_dedup = deduplicador.duplicados * coste_por_fila
+        print(f"✓ Deduplicación: {deduplicador.duplicados} filas evitadas ({alcance_dedup}), "
+              f"~{ahorro_dedup:.1f}s de limpieza y características ahorrados (estimación)")
+
         # ===== PASO 4: ENTRENAR MODELO =====
         if not skip_training:
             print_step(4, 4, "ENTRENANDO MODELO")
 
             from model_training import ReviewHelpfulnessModel, crear_graficos_evaluacion
 
+            # En modo incremental se entrena con todas las reseñas acumuladas
+            if modo_escritura == 'anadir':
+                df_con_features = cargar_dataset(output_path_features)
+                print(f"Entrenando con el dataset acumulado: {len(df_con_features)} filas")
+
             # Crear instancia del modelo
-            model = ReviewHelpfulnessModel()
+            model = ReviewHelpfulnessModel(motor_oraciones=motor_oraciones)
 
             # Preparar datos
             X_train, X_test, y_train, y_test = model.preparar_datos(df_con_features, target='IsHelpful')
@@ -148,6 +240,7 @@ def run_pipeline(nrows=50000, skip_training=False):
         print("📊 RESUMEN:")
         print(f"  • Filas procesadas: {len(df_con_features)}")
         print(f"  • Características extraídas: {len(df_con_features.columns)}")
+        print(f"  • Duplicados eliminados: {deduplicador.duplicados} (~{ahorro_dedup:.1f}s de cómputo ahorrados, estimación)")
 
         if not skip_training:
             print(f"\n📈 MÉTRICAS DEL MODELO:")
@@ -198,12 +291,60 @@ def main():
         action='store_true',
         help='Omitir el entrenamiento del modelo'
     )
+    parser.add_argument(
+        '--sin-pushdown',
+        action='store_true',
+        help='Cargar todas las columnas y filas (filtrar por votos después de la carga)'
+    )
+    parser.add_argument(
+        '--head',
+        action='store_true',
+        help='Tomar las primeras --nrows filas en lugar de una muestra aleatoria'
+    )
+    parser.add_argument(
+        '--estratificar',
+        default=None,
+        help="Columna de estrato para la muestra (p.ej. 'Score' o 'Utilidad')"
+    )
+    parser.add_argument(
+        '--semilla',
+        type=int,
+        default=42,
+        help='Semilla de la muestra aleatoria (default: 42)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Procesar solo las reseñas nuevas (Id > marca de agua) y añadirlas a los datasets'
+    )
+    parser.add_argument(
+        '--oraciones',
+        choices=['punkt', 'regex'],
+        default='punkt',
+        help="Motor de conteo de oraciones: 'punkt' (NLTK) o 'regex' (más rápido, sin abreviaturas)"
+    )
+    parser.add_argument(
+        '--procesos',
+        type=int,
+        default=1,
+        help='Procesos para extraer características (0 para todos los núcleos, default: 1)'
+    )
 
     args = parser.parse_args()
 
     nrows = None if args.nrows == 0 else args.nrows
 
-    success = run_pipeline(nrows=nrows, skip_training=args.skip_training)
+    success = run_pipeline(
+        nrows=nrows,
+        skip_training=args.skip_training,
+        pushdown=not args.sin_pushdown,
+        muestreo=not args.head,
+        estratificar_por=args.estratificar,
+        semilla=args.semilla,
+        incremental=args.incremental,
+        motor_oraciones=args.oraciones,
+        n_jobs=args.procesos or None
+    )
 
     sys.exit(0 if success else 1)
 
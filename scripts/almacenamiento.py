@@ -0,0 +1,235 @@
+"""
+Almacenamiento de Datasets - Amazon Reviews
+Guarda y lee los datasets intermedios del pipeline como Parquet
+particionado por año de la reseña (derivado de Time).
+
+Estructura en disco (particionado estilo Hive):
+
+    data/amazon_reviews_prepared/
+        year=2011/part-<id>-0.parquet
+        year=2012/part-<id>-0.parquet
+        ...
+
+Las rutas que terminan en .csv se siguen leyendo y escribiendo como CSV.
+
+Los datasets generados en modo incremental guardan además su marca de agua
+(Id y Time máximos procesados) en _marca_agua.json dentro del directorio,
+o en <ruta>.marca_agua.json junto a un CSV. pyarrow.dataset ignora los
+archivos que empiezan por "_" al leer el directorio.
+"""
+
+import os
+import json
+import shutil
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from data_loader import leer_csv
+
+# Columna de partición derivada de Time
+COLUMNA_PARTICION = 'year'
+
+# Archivo de la marca de agua dentro de un dataset particionado
+ARCHIVO_MARCA_AGUA = '_marca_agua.json'
+
+
+def es_csv(ruta):
+    """Indica si la ruta corresponde a un CSV monolítico."""
+    return str(ruta).endswith('.csv')
+
+
+def _tabla_arrow(df):
+    """
+    Convierte el DataFrame en tabla Arrow.
+
+    Las columnas con dtype Arrow de tipo lista (p.ej. TokenOffsets) se
+    añaden como columnas Arrow simples, sin su dtype en los metadatos de
+    pandas: pandas no sabe reconstruir 'list<...>[pyarrow]' desde ellos.
+    """
+    listas = [
+        col for col in df.columns
+        if isinstance(df[col].dtype, pd.ArrowDtype) and pa.types.is_list(df[col].dtype.pyarrow_dtype)
+    ]
+    tabla = pa.Table.from_pandas(df.drop(columns=listas), preserve_index=False)
+    for col in listas:
+        tabla = tabla.add_column(df.columns.get_loc(col), col, pa.array(df[col]))
+    return tabla
+
+
+def _a_pandas(tabla):
+    """Convierte una tabla leída en DataFrame; las listas vuelven con dtype Arrow."""
+    return tabla.to_pandas(
+        types_mapper=lambda tipo: pd.ArrowDtype(tipo) if pa.types.is_list(tipo) else None
+    )
+
+
+def _agregar_particion(df, columna_tiempo='Time'):
+    """Devuelve la tabla Arrow del DataFrame con la columna year añadida."""
+    tabla = _tabla_arrow(df)
+    if COLUMNA_PARTICION in tabla.column_names:
+        tabla = tabla.drop_columns([COLUMNA_PARTICION])
+    years = pd.to_datetime(df[columna_tiempo], unit='s').dt.year.to_numpy(dtype='int32')
+    return tabla.append_column(COLUMNA_PARTICION, pa.array(years, type=pa.int32()))
+
+
+def guardar_particionado(df, ruta, modo='completo', columna_tiempo='Time'):
+    """
+    Guarda un DataFrame como Parquet particionado por año.
+
+    Args:
+        df: DataFrame con la columna de tiempo (segundos Unix)
+        ruta: Directorio del dataset
+        modo: 'completo' reescribe el dataset entero; 'particiones' reemplaza
+            solo los años presentes en df; 'anadir' agrega archivos nuevos
+            a las particiones sin borrar los existentes
+        columna_tiempo: Columna de la que se deriva el año
+
+    Returns:
+        list: Años escritos
+    """
+    if modo == 'completo' and os.path.isdir(ruta):
+        shutil.rmtree(ruta)
+
+    comportamiento = {
+        'completo': 'overwrite_or_ignore',
+        'particiones': 'delete_matching',
+        'anadir': 'overwrite_or_ignore',
+    }
+    if modo not in comportamiento:
+        raise ValueError(f"Modo de escritura no soportado: {modo}")
+
+    tabla = _agregar_particion(df, columna_tiempo)
+
+    # Nombre único por escritura para que 'anadir' no pise archivos previos
+    ds.write_dataset(
+        tabla,
+        ruta,
+        format='parquet',
+        partitioning=[COLUMNA_PARTICION],
+        partitioning_flavor='hive',
+        basename_template=f"part-{uuid.uuid4().hex[:12]}-{{i}}.parquet",
+        existing_data_behavior=comportamiento[modo],
+    )
+
+    return sorted(set(tabla.column(COLUMNA_PARTICION).to_pylist()))
+
+
+def _abrir_dataset(ruta):
+    """Abre el directorio particionado como pyarrow.dataset."""
+    return ds.dataset(ruta, format='parquet', partitioning='hive')
+
+
+def listar_particiones(ruta):
+    """
+    Lista los años disponibles en un dataset particionado.
+
+    Args:
+        ruta: Directorio del dataset
+
+    Returns:
+        list: Años ordenados
+    """
+    prefijo = f"{COLUMNA_PARTICION}="
+    return sorted(
+        int(nombre[len(prefijo):])
+        for nombre in os.listdir(ruta)
+        if nombre.startswith(prefijo)
+    )
+
+
+def cargar_particionado(ruta, years=None, columns=None):
+    """
+    Lee un dataset particionado, opcionalmente solo algunos años.
+
+    Solo se abren los archivos de las particiones solicitadas.
+
+    Args:
+        ruta: Directorio del dataset
+        years: Años a leer (None para todos)
+        columns: Columnas a leer (None para todas)
+
+    Returns:
+        pd.DataFrame con los datos y la columna year
+    """
+    dataset = _abrir_dataset(ruta)
+    filtro = ds.field(COLUMNA_PARTICION).isin(list(years)) if years is not None else None
+    return _a_pandas(dataset.to_table(columns=columns, filter=filtro))
+
+
+def guardar_dataset(df, ruta, modo='completo'):
+    """
+    Guarda un dataset intermedio: CSV si la ruta termina en .csv y Parquet
+    particionado por año en cualquier otro caso.
+
+    Args:
+        df: DataFrame a guardar
+        ruta: Ruta del CSV o directorio del dataset particionado
+        modo: Modo de escritura del dataset particionado (ver guardar_particionado)
+    """
+    if es_csv(ruta):
+        df.to_csv(ruta, index=False, mode='a' if modo == 'anadir' else 'w',
+                  header=not (modo == 'anadir' and os.path.exists(ruta)))
+    else:
+        guardar_particionado(df, ruta, modo=modo)
+
+
+def cargar_dataset(ruta, years=None, columns=None):
+    """
+    Lee un dataset intermedio guardado con guardar_dataset.
+
+    Args:
+        ruta: Ruta del CSV o directorio del dataset particionado
+        years: Años a leer (solo dataset particionado)
+        columns: Columnas a leer (None para todas)
+
+    Returns:
+        pd.DataFrame
+    """
+    if es_csv(ruta):
+        return leer_csv(ruta, columns=columns)
+    return cargar_particionado(ruta, years=years, columns=columns)
+
+
+def _ruta_marca_agua(ruta):
+    """Ruta del archivo con la marca de agua de un dataset."""
+    if es_csv(ruta):
+        return f"{ruta}.marca_agua.json"
+    return os.path.join(ruta, ARCHIVO_MARCA_AGUA)
+
+
+def leer_marca_agua(ruta):
+    """
+    Lee la marca de agua de un dataset generado en modo incremental.
+
+    Args:
+        ruta: Ruta del CSV o directorio del dataset particionado
+
+    Returns:
+        dict con 'Id', 'Time' y 'filas' máximos procesados, o None si no hay
+    """
+    ruta_marca = _ruta_marca_agua(ruta)
+    if not os.path.exists(ruta_marca):
+        return None
+    with open(ruta_marca) as f:
+        return json.load(f)
+
+
+def guardar_marca_agua(ruta, marca):
+    """
+    Guarda (o, con marca=None, elimina) la marca de agua de un dataset.
+
+    Args:
+        ruta: Ruta del CSV o directorio del dataset particionado
+        marca: dict con 'Id', 'Time' y 'filas', o None
+    """
+    ruta_marca = _ruta_marca_agua(ruta)
+    if marca is None:
+        if os.path.exists(ruta_marca):
+            os.remove(ruta_marca)
+        return
+    with open(ruta_marca, 'w') as f:
+        json.dump(marca, f, indent=2)
+
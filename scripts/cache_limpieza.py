@@ -0,0 +1,146 @@
+"""
+Caché de Limpieza - Amazon Reviews
+Caché direccionada por contenido para las etapas de limpieza de texto.
+
+Cada texto se identifica por el hash de 64 bits de su contenido, así que:
+- dentro de una ejecución, los textos repetidos (p.ej. la misma reseña
+  publicada en varios ProductId) se limpian una sola vez;
+- entre ejecuciones, el resultado de cada texto ya limpiado se guarda en un
+  archivo SQLite y las siguientes pasadas solo limpian los textos nuevos.
+
+Los resultados se guardan por etapa (basica, completa) con una versión: si
+cambian las reglas de limpieza basta con subir la versión para ignorar las
+entradas antiguas.
+"""
+
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from data_loader import CACHE_DIR
+from estadisticas import hash_64
+
+# Archivo por defecto de la caché persistente
+CACHE_LIMPIEZA_PATH = os.path.join(CACHE_DIR, "limpieza.sqlite")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS limpieza (
+    etapa TEXT NOT NULL,
+    huella INTEGER NOT NULL,
+    texto TEXT NOT NULL,
+    PRIMARY KEY (etapa, huella)
+) WITHOUT ROWID;
+"""
+
+
+class CacheLimpieza:
+    """
+    Caché texto -> texto limpio indexada por hash de contenido.
+
+    Con ruta=None solo elimina el trabajo repetido dentro de la ejecución.
+    Los contadores distinguen repetidos (mismo texto en la misma llamada),
+    aciertos (texto limpiado en una ejecución anterior) y fallos (textos
+    que hubo que limpiar).
+    """
+
+    def __init__(self, ruta=CACHE_LIMPIEZA_PATH):
+        """
+        Args:
+            ruta: Archivo SQLite de la caché (None para no persistir)
+        """
+        self.ruta = ruta
+        self.repetidos = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def _conectar(self):
+        """Abre (y crea si hace falta) el archivo SQLite con el esquema."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+        conexion = sqlite3.connect(self.ruta)
+        conexion.executescript(_ESQUEMA)
+        return conexion
+
+    def _buscar(self, etapa, huellas):
+        """Devuelve huella -> texto limpio de las huellas ya guardadas."""
+        if self.ruta is None or not os.path.exists(self.ruta) or len(huellas) == 0:
+            return {}
+        conexion = self._conectar()
+        try:
+            conexion.execute("CREATE TEMP TABLE consulta (huella INTEGER PRIMARY KEY)")
+            conexion.executemany(
+                "INSERT OR IGNORE INTO consulta (huella) VALUES (?)",
+                ((h,) for h in huellas.tolist()),
+            )
+            return dict(conexion.execute(
+                "SELECT l.huella, l.texto FROM limpieza l "
+                "JOIN consulta c ON l.huella = c.huella WHERE l.etapa = ?",
+                (etapa,),
+            ))
+        finally:
+            conexion.close()
+
+    def _guardar(self, etapa, huellas, textos):
+        """Guarda los textos limpios nuevos en una sola transacción."""
+        if self.ruta is None or len(huellas) == 0:
+            return
+        conexion = self._conectar()
+        try:
+            with conexion:
+                conexion.executemany(
+                    "INSERT OR REPLACE INTO limpieza (etapa, huella, texto) VALUES (?, ?, ?)",
+                    ((etapa, h, t) for h, t in zip(huellas.tolist(), textos)),
+                )
+        finally:
+            conexion.close()
+
+    def limpiar(self, serie, funcion, etapa):
+        """
+        Aplica una función de limpieza de columna pasando por la caché.
+
+        Args:
+            serie: pd.Series de textos (sin nulos)
+            funcion: Función pd.Series -> secuencia de textos limpios del
+                mismo largo (se llama solo con los textos únicos no cacheados)
+            etapa: Nombre versionado de la etapa (p.ej. 'basica-1')
+
+        Returns:
+            pd.Series con el texto limpio, el mismo índice y el mismo dtype
+            de cadena que la entrada
+        """
+        codigos, unicos = pd.factorize(serie)
+        unicos = pd.Series(unicos)
+        huellas = hash_64(unicos).view(np.int64)
+
+        guardados = self._buscar(etapa, huellas)
+        limpios = np.array([guardados.get(h) for h in huellas.tolist()], dtype=object)
+        faltan = np.flatnonzero(np.array([t is None for t in limpios], dtype=bool))
+
+        if len(faltan) > 0:
+            nuevos = list(funcion(unicos.iloc[faltan].reset_index(drop=True)))
+            limpios[faltan] = nuevos
+            self._guardar(etapa, huellas[faltan], nuevos)
+
+        self.repetidos += len(serie) - len(unicos)
+        self.aciertos += len(unicos) - len(faltan)
+        self.fallos += len(faltan)
+
+        dtype = serie.dtype if isinstance(serie.dtype, pd.StringDtype) else object
+        return pd.Series(limpios[codigos], index=serie.index, dtype=dtype)
+
+    def estadisticas(self):
+        """Contadores acumulados de la caché."""
+        return {
+            'repetidos': self.repetidos,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+        }
+
+    def mostrar(self):
+        """Imprime los contadores de la caché."""
+        total = self.repetidos + self.aciertos + self.fallos
+        print(
+            f"Caché de limpieza: {self.repetidos} repetidos, {self.aciertos} aciertos, "
+            f"{self.fallos} limpiados ({(total - self.fallos) / max(total, 1) * 100:.1f}% evitado)"
+        )
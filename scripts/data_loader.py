@@ -4,14 +4,93 @@ Carga y valida el dataset de reseñas de productos de Amazon.
 """
 
 import pandas as pd
+import numpy as np
 import os
+import json
+import hashlib
+import sys
 import urllib.request
 from pathlib import Path
 
-# Configuración de rutas
+# Añadir el directorio scripts al path
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(SCRIPT_DIR)
+
+from estadisticas import AcumuladorEstadisticas, HyperLogLog
+
+# pyarrow es opcional: sin él se lee siempre el CSV original
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from formato_snap import iter_lotes_snap, leer_snap
+except ImportError:
+    pa = None
+    pc = None
+    pacsv = None
+    ds = None
+    pq = None
+    iter_lotes_snap = None
+    leer_snap = None
+
+# Configuración de rutas
 DATA_DIR = os.path.join(SCRIPT_DIR, "..", "data")
 DATA_PATH = os.path.join(DATA_DIR, "Reviews.csv")
+SNAP_PATH = os.path.join(DATA_DIR, "finefoods.txt.gz")
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+CUARENTENA_PATH = os.path.join(DATA_DIR, "cuarentena.csv")
+# Cuarentena de las cargas parciales (nrows, muestras): no pisa la de la
+# última carga completa
+CUARENTENA_PARCIAL_PATH = os.path.join(DATA_DIR, "cuarentena_parcial.csv")
+
+# Bytes del inicio y del final del CSV que entran en la huella de la caché
+BYTES_HUELLA = 1024 * 1024
+
+# Filas por bloque en la lectura por streaming
+CHUNKSIZE_DEFECTO = 50000
+
+# Motor de lectura de CSV: 'pyarrow' decodifica bloques en paralelo con
+# varios hilos; 'c' es el lector de pandas (un solo núcleo)
+MOTOR_CSV_DEFECTO = 'pyarrow' if pacsv is not None else 'c'
+
+# Tamaño de bloque del lector de pyarrow (cada hilo decodifica un bloque)
+BLOCK_SIZE_CSV = 16 * 1024 * 1024
+
+# Tipos de las columnas del CSV de Kaggle. Fijarlos evita que cada bloque
+# infiera un tipo distinto (p.ej. float64 en un bloque de ProfileName vacío).
+# Los contadores, Score y Time se leen como texto: un valor no numérico o
+# vacío no debe abortar la carga, sino llegar a ValidadorResenas. Con Arrow
+# pasan a enteros con nulos en los valores no numéricos (ver _enteros_arrow)
+# y con pandas siguen como texto; en ambos casos se convierten a int64 solo
+# después de apartar las filas inválidas (ver tipar_numericas)
+DTYPES_CSV = {
+    'Id': 'int64',
+    'ProductId': 'object',
+    'UserId': 'object',
+    'ProfileName': 'object',
+    'HelpfulnessNumerator': 'object',
+    'HelpfulnessDenominator': 'object',
+    'Score': 'object',
+    'Time': 'object',
+    'Summary': 'object',
+    'Text': 'object',
+}
+
+# Columnas enteras que se leen como texto y se validan antes de convertirlas
+COLUMNAS_ENTERAS = ['HelpfulnessNumerator', 'HelpfulnessDenominator', 'Score', 'Time']
+
+# Entero en texto (con espacios opcionales) que se guarda tal cual en la caché
+PATRON_ENTERO = r'^\s*[+-]?\d+\s*$'
+
+# Presupuesto de coste por texto: caracteres máximos que procesan la
+# limpieza y la extracción de características. La reseña más larga del
+# corpus ronda los 21.000 caracteres, así que solo recorta entradas
+# anómalas (p.ej. un cuerpo de varios MB enviado a la API). Se puede
+# cambiar con la variable de entorno MAX_CARACTERES_TEXTO
+VARIABLE_MAX_CARACTERES = 'MAX_CARACTERES_TEXTO'
+MAX_CARACTERES_TEXTO = int(os.environ.get(VARIABLE_MAX_CARACTERES, 30000))
 
 # URL del dataset (Amazon Fine Food Reviews)
 DATASET_URL = "https://snap.stanford.edu/data/finefoods.txt.gz"
@@ -21,9 +100,15 @@ def descargar_dataset(url=DATASET_URL, output_dir=DATA_DIR):
     """
     Descarga el dataset de Amazon Reviews si no existe localmente.
 
+    Si no está el Reviews.csv de Kaggle se descarga el finefoods.txt.gz
+    original de SNAP, que cargar_datos e iter_datos leen directamente.
+
     Args:
         url: URL del dataset
         output_dir: Directorio de salida
+
+    Returns:
+        str: Ruta al archivo de datos disponible
     """
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     output_path = os.path.join(output_dir, "Reviews.csv")
@@ -32,28 +117,79 @@ def descargar_dataset(url=DATASET_URL, output_dir=DATA_DIR):
         print(f"El dataset ya existe en: {output_path}")
         return output_path
 
+    snap_path = os.path.join(output_dir, os.path.basename(url))
+    if os.path.exists(snap_path):
+        print(f"El dataset SNAP ya existe en: {snap_path}")
+        return snap_path
+
     print(f"Descargando dataset desde {url}...")
-    print("NOTA: Para este proyecto, asegúrate de tener el archivo Reviews.csv en la carpeta 'data'")
-    print("Puedes descargarlo desde: https://www.kaggle.com/snap/amazon-fine-food-reviews")
+    try:
+        urllib.request.urlretrieve(url, snap_path)
+        print(f"✓ Dataset descargado en: {snap_path}")
+        return snap_path
+    except OSError as e:
+        print(f"❌ Error al descargar el dataset: {e}")
+        print("NOTA: Para este proyecto, asegúrate de tener el archivo Reviews.csv en la carpeta 'data'")
+        print("Puedes descargarlo desde: https://www.kaggle.com/snap/amazon-fine-food-reviews")
 
     return output_path
 
 
-def validar_columnas(df):
+def es_formato_snap(path):
+    """Indica si la ruta apunta al formato clave/valor de SNAP (finefoods.txt[.gz])."""
+    return str(path).endswith(('.txt.gz', '.txt'))
+
+
+COLUMNAS_REQUERIDAS = [
+    'Id', 'ProductId', 'UserId', 'ProfileName',
+    'HelpfulnessNumerator', 'HelpfulnessDenominator',
+    'Score', 'Time', 'Summary', 'Text'
+]
+
+# Esquema compacto aplicado tras la carga (ver aplicar_esquema). Los
+# contadores caben holgadamente en int16 (máximo de votos ~900), Score en
+# int8 y Time (segundos Unix) en int32 hasta 2038
+ESQUEMA_COMPACTO = {
+    'Id': 'int32',
+    'ProductId': 'category',
+    'UserId': 'category',
+    'ProfileName': 'category',
+    'HelpfulnessNumerator': 'int16',
+    'HelpfulnessDenominator': 'int16',
+    'Score': 'int8',
+    'Time': 'int32',
+    'Summary': 'string[pyarrow]',
+    'Text': 'string[pyarrow]',
+}
+
+# Estrato derivado de la tasa de utilidad para cargar_muestra
+ESTRATO_UTILIDAD = 'Utilidad'
+
+# Operadores admitidos en los filtros de cargar_datos / iter_datos
+OPERADORES_FILTRO = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+def validar_columnas(df, columnas_requeridas=None, verbose=True):
     """
     Valida que el dataset contenga las columnas necesarias.
 
     Args:
         df: DataFrame a validar
+        columnas_requeridas: Columnas a exigir (None para COLUMNAS_REQUERIDAS)
+        verbose: Si False, solo informa cuando faltan columnas
 
     Returns:
         bool: True si todas las columnas están presentes
     """
-    columnas_requeridas = [
-        'Id', 'ProductId', 'UserId', 'ProfileName',
-        'HelpfulnessNumerator', 'HelpfulnessDenominator',
-        'Score', 'Time', 'Summary', 'Text'
-    ]
+    if columnas_requeridas is None:
+        columnas_requeridas = COLUMNAS_REQUERIDAS
 
     columnas_faltantes = set(columnas_requeridas) - set(df.columns)
 
@@ -61,91 +197,1035 @@ def validar_columnas(df):
         print(f"⚠️ Advertencia: Faltan las siguientes columnas: {columnas_faltantes}")
         return False
 
-    print("✓ Todas las columnas requeridas están presentes")
+    if verbose:
+        print("✓ Todas las columnas requeridas están presentes")
     return True
 
 
-def cargar_datos(path=DATA_PATH, nrows=None):
+def recortar_texto(text, max_caracteres=None):
+    """
+    Recorta un texto al presupuesto de caracteres.
+
+    El corte se hace en el último espacio antes del límite para no partir
+    una palabra (salvo que eso descarte más de la mitad del presupuesto).
+
+    Args:
+        text: Texto a recortar
+        max_caracteres: Límite de caracteres (None para MAX_CARACTERES_TEXTO)
+
+    Returns:
+        tuple: (texto recortado, bool indicando si se recortó)
+    """
+    if max_caracteres is None:
+        max_caracteres = MAX_CARACTERES_TEXTO
+
+    if len(text) <= max_caracteres:
+        return text, False
+
+    corte = text.rfind(' ', 0, max_caracteres + 1)
+    if corte < max_caracteres // 2:
+        corte = max_caracteres
+    return text[:corte], True
+
+
+def recortar_columna(serie, max_caracteres=None):
+    """
+    Aplica recortar_texto a las filas de una columna que superan el límite.
+
+    Args:
+        serie: pd.Series de textos (sin nulos)
+        max_caracteres: Límite de caracteres (None para MAX_CARACTERES_TEXTO)
+
+    Returns:
+        tuple: (pd.Series recortada, número de filas recortadas)
+    """
+    if max_caracteres is None:
+        max_caracteres = MAX_CARACTERES_TEXTO
+
+    largas = np.flatnonzero((serie.str.len() > max_caracteres).to_numpy(dtype=bool))
+    if len(largas) == 0:
+        return serie, 0
+
+    serie = serie.copy()
+    serie.iloc[largas] = [recortar_texto(texto, max_caracteres)[0] for texto in serie.iloc[largas]]
+    return serie, len(largas)
+
+
+def _numerica(serie):
+    """Convierte una columna a float64 (NaN para nulos y valores no numéricos)."""
+    if not pd.api.types.is_numeric_dtype(serie):
+        serie = pd.to_numeric(serie, errors='coerce')
+    return serie.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def tipar_numericas(df):
+    """
+    Convierte a int64 las COLUMNAS_ENTERAS leídas como texto o con nulos.
+
+    Se llama después de la validación: si quedan nulos o valores no
+    enteros (p.ej. con validar=False) la columna queda como float64 con
+    NaN en lugar de fallar.
+
+    Args:
+        df: DataFrame del dataset (cualquier subconjunto de columnas)
+
+    Returns:
+        DataFrame con las columnas convertidas
+    """
+    for col in COLUMNAS_ENTERAS:
+        if col not in df.columns or pd.api.types.is_integer_dtype(df[col]):
+            continue
+        valores = _numerica(df[col])
+        if not np.isnan(valores).any() and (valores == np.floor(valores)).all():
+            valores = valores.astype(np.int64)
+        df[col] = valores
+    return df
+
+
+def _regla_texto_nulo(df):
+    """Text nulo o vacío."""
+    texto = df['Text']
+    return (texto.isna() | (texto.str.len() == 0)).to_numpy(dtype=bool)
+
+
+def _regla_score_fuera_de_rango(df):
+    """Score no entero entre 1 y 5."""
+    score = _numerica(df['Score'])
+    return ~((score >= 1) & (score <= 5) & (score == np.floor(score)))
+
+
+def _regla_time_no_valido(df):
+    """Time no numérico o no positivo."""
+    time_ = _numerica(df['Time'])
+    return ~(time_ > 0)
+
+
+def _regla_votos_negativos(df):
+    """Algún contador de votos negativo, nulo o no numérico."""
+    return ~(_numerica(df['HelpfulnessNumerator']) >= 0) | ~(_numerica(df['HelpfulnessDenominator']) >= 0)
+
+
+def _regla_numerador_mayor(df):
+    """Más votos útiles que votos totales."""
+    return _numerica(df['HelpfulnessNumerator']) > _numerica(df['HelpfulnessDenominator'])
+
+
+# Reglas de validación por fila: nombre -> (columnas necesarias, función que
+# devuelve un array booleano con True en las filas que la incumplen). Una
+# regla se omite si el bloque no tiene todas sus columnas
+REGLAS_VALIDACION = {
+    'texto_nulo': (['Text'], _regla_texto_nulo),
+    'score_fuera_de_rango': (['Score'], _regla_score_fuera_de_rango),
+    'time_no_valido': (['Time'], _regla_time_no_valido),
+    'votos_negativos': (['HelpfulnessNumerator', 'HelpfulnessDenominator'], _regla_votos_negativos),
+    'numerador_mayor_que_denominador': (['HelpfulnessNumerator', 'HelpfulnessDenominator'], _regla_numerador_mayor),
+}
+
+
+class ValidadorResenas:
+    """
+    Valida rangos y tipos de las reseñas bloque a bloque.
+
+    Cada regla de REGLAS_VALIDACION se evalúa sobre columnas completas con
+    NumPy. Las filas que incumplen alguna se apartan a un CSV de cuarentena
+    (con la columna Violaciones) y se acumula un informe con el número de
+    filas por regla. El archivo de cuarentena anterior se elimina al crear
+    el validador, así que refleja solo la última carga que lo usó: las
+    cargas completas usan CUARENTENA_PATH y las parciales (nrows,
+    muestras) CUARENTENA_PARCIAL_PATH.
+    """
+
+    def __init__(self, ruta_cuarentena=CUARENTENA_PATH):
+        """
+        Args:
+            ruta_cuarentena: CSV donde guardar las filas inválidas (None para no guardarlas)
+        """
+        self.ruta_cuarentena = ruta_cuarentena
+        self.filas = 0
+        self.filas_cuarentena = 0
+        self.violaciones = {regla: 0 for regla in REGLAS_VALIDACION}
+
+        if ruta_cuarentena is not None and os.path.exists(ruta_cuarentena):
+            os.remove(ruta_cuarentena)
+
+    def filtrar(self, df):
+        """
+        Devuelve el bloque sin las filas inválidas y aparta estas a cuarentena.
+
+        Args:
+            df: Bloque del dataset (cualquier subconjunto de columnas)
+
+        Returns:
+            DataFrame con las filas que cumplen todas las reglas aplicables
+        """
+        self.filas += len(df)
+        if len(df) == 0:
+            return df
+
+        incumple = {}
+        for regla, (columnas, funcion) in REGLAS_VALIDACION.items():
+            if all(col in df.columns for col in columnas):
+                mascara = funcion(df)
+                if mascara.any():
+                    incumple[regla] = mascara
+                    self.violaciones[regla] += int(mascara.sum())
+
+        if not incumple:
+            return df
+
+        invalidas = np.logical_or.reduce(list(incumple.values()))
+        self.filas_cuarentena += int(invalidas.sum())
+
+        if self.ruta_cuarentena is not None:
+            cuarentena = df[invalidas].copy()
+            etiquetas = pd.Series('', index=cuarentena.index)
+            for regla, mascara in incumple.items():
+                etiquetas = etiquetas.where(~mascara[invalidas], etiquetas + regla + ';')
+            cuarentena['Violaciones'] = etiquetas.str.rstrip(';')
+
+            existe = os.path.exists(self.ruta_cuarentena)
+            if not existe:
+                os.makedirs(os.path.dirname(os.path.abspath(self.ruta_cuarentena)), exist_ok=True)
+            cuarentena.to_csv(self.ruta_cuarentena, mode='a' if existe else 'w', header=not existe, index=False)
+
+        return df[~invalidas]
+
+    def informe(self):
+        """
+        Resumen compacto de la validación.
+
+        Returns:
+            dict: filas revisadas, filas en cuarentena y filas por regla incumplida
+        """
+        return {
+            'filas': self.filas,
+            'cuarentena': self.filas_cuarentena,
+            'violaciones': {regla: n for regla, n in self.violaciones.items() if n > 0},
+        }
+
+    def mostrar(self):
+        """Imprime el informe de validación."""
+        if self.filas_cuarentena == 0:
+            print(f"✓ Validación: {self.filas} filas sin violaciones")
+            return
+        print(f"⚠️ Validación: {self.filas_cuarentena} de {self.filas} filas apartadas a cuarentena"
+              + (f" ({self.ruta_cuarentena})" if self.ruta_cuarentena else ""))
+        for regla, n in self.informe()['violaciones'].items():
+            print(f"    {regla}: {n}")
+
+
+def memoria_mb(df):
+    """Devuelve la memoria ocupada por el DataFrame (incluyendo textos) en MB."""
+    return df.memory_usage(deep=True).sum() / 1024**2
+
+
+def _cabe_en_entero(serie, tipo):
+    """Comprueba que una columna entera puede convertirse a tipo sin desbordar."""
+    if not pd.api.types.is_integer_dtype(serie):
+        return False
+    if len(serie) == 0:
+        return True
+    limites = np.iinfo(tipo)
+    return limites.min <= serie.min() and serie.max() <= limites.max
+
+
+def aplicar_esquema(df, esquema=ESQUEMA_COMPACTO):
+    """
+    Convierte las columnas del dataset a tipos compactos.
+
+    Los identificadores pasan a category, los contadores y Score a enteros
+    pequeños y Summary/Text a cadenas respaldadas por Arrow. Las columnas
+    ausentes se ignoran, y una columna entera que no cabe en el tipo
+    destino se deja como está en lugar de desbordar.
+
+    Args:
+        df: DataFrame con columnas del dataset de reseñas
+        esquema: Diccionario columna -> dtype destino
+
+    Returns:
+        DataFrame con los tipos convertidos
+    """
+    for col, tipo in esquema.items():
+        if col not in df.columns:
+            continue
+        if tipo.startswith('int') and not _cabe_en_entero(df[col], tipo):
+            continue
+        if tipo == 'string[pyarrow]' and pa is None:
+            continue
+        df[col] = df[col].astype(tipo)
+
+    return df
+
+
+class ResumenCarga:
+    """
+    Resumen de carga que se actualiza bloque a bloque.
+
+    Acumula número de filas, rango de fechas e identificadores únicos
+    (aproximados con HyperLogLog) con memoria constante, sin necesitar el
+    DataFrame completo.
+    """
+
+    def __init__(self):
+        """Inicializa los acumuladores vacíos."""
+        self.filas = 0
+        self.bloques = 0
+        self.time_min = None
+        self.time_max = None
+        self.productos = HyperLogLog()
+        self.usuarios = HyperLogLog()
+        self.columnas = set()
+
+    def actualizar(self, df):
+        """Incorpora un bloque de reseñas al resumen."""
+        self.filas += len(df)
+        self.bloques += 1
+        self.columnas.update(df.columns)
+
+        if 'Time' in df.columns and len(df) > 0:
+            tmin, tmax = df['Time'].min(), df['Time'].max()
+            self.time_min = tmin if self.time_min is None else min(self.time_min, tmin)
+            self.time_max = tmax if self.time_max is None else max(self.time_max, tmax)
+        if 'ProductId' in df.columns:
+            self.productos.actualizar(df['ProductId'])
+        if 'UserId' in df.columns:
+            self.usuarios.actualizar(df['UserId'])
+
+    def mostrar(self):
+        """Muestra el resumen acumulado."""
+        if self.time_min is not None:
+            print(f"\nRango de fechas: {pd.to_datetime(self.time_min, unit='s')} a {pd.to_datetime(self.time_max, unit='s')}")
+        if 'ProductId' in self.columnas:
+            print(f"Productos únicos (aprox.): {self.productos.estimar()}")
+        if 'UserId' in self.columnas:
+            print(f"Usuarios únicos (aprox.): {self.usuarios.estimar()}")
+
+
+def _huella_fuente(path):
+    """
+    Calcula la huella del CSV de origen para invalidar la caché.
+
+    Combina tamaño, fecha de modificación y un hash SHA-256 del primer y
+    último MiB del archivo. Así se detectan reemplazos del archivo aunque
+    conserven el mtime, sin tener que leer los ~300 MB completos.
+
+    Args:
+        path: Ruta al archivo de origen
+
+    Returns:
+        dict: Huella con claves size, mtime_ns y sha256
+    """
+    stat = os.stat(path)
+    sha = hashlib.sha256()
+
+    with open(path, 'rb') as f:
+        sha.update(f.read(BYTES_HUELLA))
+        if stat.st_size > 2 * BYTES_HUELLA:
+            f.seek(-BYTES_HUELLA, os.SEEK_END)
+        sha.update(f.read())
+
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha.hexdigest()
+    }
+
+
+def _dtypes_csv(columns=None):
+    """Devuelve DTYPES_CSV restringido a las columnas solicitadas."""
+    return {col: tipo for col, tipo in DTYPES_CSV.items() if columns is None or col in columns}
+
+
+def _enteros_arrow(tabla):
+    """
+    Convierte a int64 las COLUMNAS_ENTERAS de texto de una tabla Arrow.
+
+    Los valores que no son enteros pasan a nulo en lugar de abortar la
+    conversión; ValidadorResenas aparta después esas filas a cuarentena.
+    """
+    for col in COLUMNAS_ENTERAS:
+        indice = tabla.schema.get_field_index(col)
+        if indice < 0:
+            continue
+        tipo = tabla.schema.field(indice).type
+        if pa.types.is_null(tipo):
+            tabla = tabla.set_column(indice, col, tabla.column(indice).cast(pa.int64()))
+            continue
+        if not pa.types.is_string(tipo):
+            continue
+        texto = tabla.column(indice)
+        valido = pc.match_substring_regex(texto, PATRON_ENTERO)
+        enteros = pc.cast(pc.if_else(valido, pc.utf8_trim_whitespace(texto), None), pa.int64())
+        tabla = tabla.set_column(indice, col, enteros)
+    return tabla
+
+
+def _opciones_csv_arrow(columns=None):
+    """Opciones de pyarrow.csv equivalentes a la lectura de pandas con DTYPES_CSV."""
+    tipos = {'int64': pa.int64(), 'object': pa.string()}
+    return dict(
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=BLOCK_SIZE_CSV),
+        # Text y Summary contienen saltos de línea dentro de comillas
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=list(columns) if columns is not None else None,
+            column_types={col: tipos[tipo] for col, tipo in _dtypes_csv(columns).items()},
+            strings_can_be_null=True
+        )
+    )
+
+
+def leer_csv(path, nrows=None, columns=None, motor=MOTOR_CSV_DEFECTO):
+    """
+    Lee un CSV con el motor indicado.
+
+    Con motor='pyarrow' el archivo se divide en bloques que se decodifican
+    en paralelo, y las columnas de texto se entregan a pandas como cadenas
+    respaldadas por Arrow sin copiar los datos. Si se pide nrows se usa el
+    lector de pandas, que puede detenerse antes de terminar el archivo.
+
+    Args:
+        path: Ruta al CSV
+        nrows: Número de filas a leer (None para todas)
+        columns: Columnas a leer (None para todas)
+        motor: 'pyarrow' o 'c'
+
+    Returns:
+        pd.DataFrame
+    """
+    if motor == 'pyarrow' and nrows is None and pacsv is not None:
+        tabla = _enteros_arrow(pacsv.read_csv(path, **_opciones_csv_arrow(columns)))
+        return tabla.to_pandas(
+            types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get,
+            split_blocks=True,
+            self_destruct=True
+        )
+    if motor not in ('pyarrow', 'c'):
+        raise ValueError(f"Motor de CSV no soportado: {motor}")
+    return pd.read_csv(path, nrows=nrows, usecols=columns, dtype=_dtypes_csv(columns))
+
+
+def _rutas_cache(path, cache_dir=CACHE_DIR):
+    """Devuelve las rutas del Parquet cacheado y de su archivo de huella."""
+    nombre = Path(path).stem
+    ruta_parquet = os.path.join(cache_dir, f"{nombre}.parquet")
+    return ruta_parquet, ruta_parquet + ".json"
+
+
+def cache_valida(path, cache_dir=CACHE_DIR):
+    """
+    Comprueba si existe una copia Parquet vigente del CSV.
+
+    Args:
+        path: Ruta al CSV de origen
+        cache_dir: Directorio de la caché
+
+    Returns:
+        bool: True si la caché existe y su huella coincide con la del CSV
+    """
+    ruta_parquet, ruta_huella = _rutas_cache(path, cache_dir)
+
+    if not (os.path.exists(ruta_parquet) and os.path.exists(ruta_huella)):
+        return False
+
+    with open(ruta_huella, 'r') as f:
+        huella_guardada = json.load(f)
+
+    return huella_guardada == _huella_fuente(path)
+
+
+def construir_cache(path, cache_dir=CACHE_DIR):
+    """
+    Convierte el CSV completo en un Parquet tipado y comprimido (zstd).
+
+    Args:
+        path: Ruta al CSV de origen
+        cache_dir: Directorio de la caché
+
+    Returns:
+        str: Ruta al archivo Parquet generado
+    """
+    ruta_parquet, ruta_huella = _rutas_cache(path, cache_dir)
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+
+    print(f"Construyendo caché Parquet en {ruta_parquet} (solo la primera vez)...")
+    huella = _huella_fuente(path)
+
+    # Conversión por bloques: la memoria no depende del tamaño del CSV.
+    # Se escribe a un temporal y se renombra para no dejar cachés a medias
+    ruta_tmp = ruta_parquet + ".tmp"
+    writer = None
+    try:
+        for tabla in _iter_tablas_fuente(path, CHUNKSIZE_DEFECTO * 2):
+            # La caché guarda enteros con nulos en los valores no numéricos
+            tabla = _enteros_arrow(tabla)
+            if writer is None:
+                esquema = pa.schema([
+                    pa.field(campo.name, pa.string()) if pa.types.is_null(campo.type) else campo
+                    for campo in tabla.schema
+                ]).remove_metadata()
+                writer = pq.ParquetWriter(ruta_tmp, esquema, compression='zstd')
+            writer.write_table(tabla.cast(esquema))
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(ruta_tmp, ruta_parquet)
+
+    with open(ruta_huella, 'w') as f:
+        json.dump(huella, f, indent=2)
+
+    print(f"✓ Caché creada: {os.path.getsize(ruta_parquet) / 1024**2:.1f} MB")
+    return ruta_parquet
+
+
+def _iter_tablas_fuente(path, chunksize):
+    """Recorre el archivo de origen (CSV de Kaggle o SNAP) como tablas Arrow."""
+    if es_formato_snap(path):
+        for lote in iter_lotes_snap(path, batch_size=chunksize):
+            yield pa.Table.from_batches([lote])
+    else:
+        # Lector por streaming de pyarrow: bloques de BLOCK_SIZE_CSV bytes
+        lector = pacsv.open_csv(path, **_opciones_csv_arrow())
+        for lote in lector:
+            yield pa.Table.from_batches([lote])
+
+
+def _columnas_lectura(columns, filters):
+    """Columnas a leer del origen: las solicitadas más las usadas en los filtros."""
+    if columns is None:
+        return None
+    extra = [col for col, _, _ in (filters or []) if col not in columns]
+    return list(columns) + extra
+
+
+def _mascara_filtros(df, filters):
+    """
+    Evalúa una lista de filtros sobre un bloque como máscara booleana.
+
+    Los filtros siguen la convención de pyarrow: lista de tuplas
+    (columna, operador, valor) combinadas con AND.
+    """
+    mascara = pd.Series(True, index=df.index)
+    for col, op, valor in filters:
+        serie = df[col]
+        if col in COLUMNAS_ENTERAS:
+            # Sin caché llegan como texto; los no numéricos no pasan el filtro
+            serie = pd.Series(_numerica(serie), index=df.index)
+        if op in OPERADORES_FILTRO:
+            mascara &= OPERADORES_FILTRO[op](serie, valor)
+        elif op == 'in':
+            mascara &= serie.isin(valor)
+        elif op == 'not in':
+            mascara &= ~serie.isin(valor)
+        else:
+            raise ValueError(f"Operador de filtro no soportado: {op}")
+    return mascara
+
+
+def _expresion_filtros(filters):
+    """Traduce la lista de filtros a una expresión de pyarrow.dataset."""
+    expresion = None
+    for col, op, valor in filters:
+        campo = ds.field(col)
+        if op in OPERADORES_FILTRO:
+            condicion = OPERADORES_FILTRO[op](campo, valor)
+        elif op == 'in':
+            condicion = campo.isin(valor)
+        elif op == 'not in':
+            condicion = ~campo.isin(valor)
+        else:
+            raise ValueError(f"Operador de filtro no soportado: {op}")
+        expresion = condicion if expresion is None else expresion & condicion
+    return expresion
+
+
+def _leer_parquet(ruta_parquet, nrows=None, columns=None, filters=None):
+    """
+    Lee el Parquet cacheado aplicando proyección, filtros y límite de filas.
+
+    Los filtros se evalúan durante el escaneo (y descartan row groups
+    completos gracias a sus estadísticas), así que las filas y columnas
+    descartadas nunca llegan a pandas.
+    """
+    dataset = ds.dataset(ruta_parquet, format='parquet')
+    expresion = _expresion_filtros(filters) if filters else None
+
+    if nrows is None:
+        tabla = dataset.to_table(columns=columns, filter=expresion)
+    else:
+        tabla = dataset.head(nrows, columns=columns, filter=expresion)
+
+    return tabla.to_pandas()
+
+
+def _iter_bloques(path, chunksize, columns=None, filters=None, usar_cache=True):
+    """
+    Recorre el origen por bloques ya proyectados y filtrados.
+
+    Con caché el filtro se evalúa en el escaneo de Arrow; sin ella se
+    evalúa sobre cada bloque de read_csv antes de acumularlo.
+    """
+    if usar_cache and pq is not None:
+        if not cache_valida(path):
+            construir_cache(path)
+        ruta_parquet, _ = _rutas_cache(path)
+        dataset = ds.dataset(ruta_parquet, format='parquet')
+        expresion = _expresion_filtros(filters) if filters else None
+        for lote in dataset.to_batches(columns=columns, filter=expresion, batch_size=chunksize):
+            if lote.num_rows > 0:
+                yield lote.to_pandas()
+        return
+
+    columnas_lectura = _columnas_lectura(columns, filters)
+    if es_formato_snap(path):
+        bloques = (
+            (lote.select(columnas_lectura) if columnas_lectura else lote).to_pandas()
+            for lote in iter_lotes_snap(path, batch_size=chunksize)
+        )
+    else:
+        bloques = pd.read_csv(
+            path, chunksize=chunksize, usecols=columnas_lectura,
+            dtype=_dtypes_csv(columnas_lectura)
+        )
+
+    for chunk in bloques:
+        if filters:
+            chunk = chunk[_mascara_filtros(chunk, filters)]
+            if columns is not None:
+                chunk = chunk[list(columns)]
+        yield chunk
+
+
+def iter_datos(path=DATA_PATH, chunksize=CHUNKSIZE_DEFECTO, columns=None,
+               filters=None, usar_cache=True, resumen=None, compacto=True, validador=None):
+    """
+    Recorre el dataset por bloques de tamaño fijo.
+
+    La memoria máxima depende de chunksize y no del tamaño del dataset,
+    por lo que permite alimentar las etapas de limpieza y características
+    bloque a bloque. Cada bloque se valida antes de entregarse.
+
+    Args:
+        path: Ruta al archivo CSV
+        chunksize: Filas por bloque (antes de aplicar filtros)
+        columns: Columnas a cargar (None para cargar todas)
+        filters: Filtros de filas [(columna, operador, valor), ...] combinados con AND
+        usar_cache: Si True, lee de la caché Parquet cuando pyarrow está disponible
+        resumen: ResumenCarga a actualizar con cada bloque (opcional)
+        compacto: Si True, aplica ESQUEMA_COMPACTO a cada bloque. Las
+            categorías son propias de cada bloque; al concatenar bloques
+            conviene usar pd.api.types.union_categoricals
+        validador: ValidadorResenas que aparta las filas inválidas de cada
+            bloque (opcional)
+
+    Yields:
+        pd.DataFrame: Bloques con índice continuo
+    """
+    inicio = 0
+    for chunk in _iter_bloques(path, chunksize, columns, filters, usar_cache):
+        validar_columnas(chunk, columnas_requeridas=columns, verbose=False)
+
+        if validador is not None:
+            chunk = validador.filtrar(chunk)
+        tipar_numericas(chunk)
+
+        chunk.index = pd.RangeIndex(inicio, inicio + len(chunk))
+        inicio += len(chunk)
+
+        if compacto:
+            aplicar_esquema(chunk)
+
+        if resumen is not None:
+            resumen.actualizar(chunk)
+
+        yield chunk
+
+
+def _informar_error_carga(path, error):
+    """Imprime el error de una carga (cargar_datos, cargar_muestra)."""
+    if isinstance(error, FileNotFoundError):
+        print(f"❌ Error: No se encontró el archivo en {path}")
+        print(f"Asegúrate de que el archivo existe en la carpeta 'data'")
+        print(f"Puedes descargarlo desde: https://www.kaggle.com/snap/amazon-fine-food-reviews")
+    else:
+        print(f"❌ Error inesperado: {error}")
+
+
+def _leer_validando(path, nrows, columns, filters, usar_cache, validador):
+    """
+    Lee bloques validados hasta reunir nrows filas válidas.
+
+    La validación va antes del recorte, así que se devuelven nrows filas
+    aunque haya filas inválidas entre las primeras del archivo.
+    """
+    bloques = []
+    filas = 0
+    chunksize = max(min(CHUNKSIZE_DEFECTO, nrows), 1)
+    for chunk in _iter_bloques(path, chunksize, columns, filters, usar_cache and pq is not None):
+        chunk = validador.filtrar(chunk)
+        bloques.append(chunk)
+        filas += len(chunk)
+        if filas >= nrows:
+            break
+    df = pd.concat(bloques, ignore_index=True) if bloques else pd.DataFrame(columns=columns)
+    return df.head(nrows)
+
+
+def cargar_datos(path=DATA_PATH, nrows=None, columns=None, filters=None, usar_cache=True,
+                 compacto=True, motor=MOTOR_CSV_DEFECTO, validar=True):
     """
     Carga el dataset de reseñas desde un archivo CSV.
 
+    La primera vez se genera una copia Parquet en data/cache/ y las
+    siguientes cargas la leen directamente. La copia se regenera cuando
+    cambia la huella (tamaño, mtime o hash parcial) del CSV.
+
+    La proyección (columns) y los filtros (filters) se aplican durante la
+    lectura, bloque a bloque, de modo que las filas y columnas descartadas
+    nunca se materializan completas.
+
     Args:
         path: Ruta al archivo CSV
-        nrows: Número de filas a cargar (None para cargar todas)
+        nrows: Número de filas a devolver, ya filtradas (None para todas)
+        columns: Columnas a cargar (None para cargar todas)
+        filters: Filtros de filas [(columna, operador, valor), ...] combinados con AND,
+            p.ej. [('HelpfulnessDenominator', '>=', 1)]
+        usar_cache: Si True, usa la caché Parquet cuando pyarrow está disponible
+        compacto: Si True, aplica ESQUEMA_COMPACTO (ver aplicar_esquema)
+        motor: Motor de lectura del CSV sin caché: 'pyarrow' (multihilo) o 'c'
+        validar: Si True, aparta a cuarentena las filas que incumplen
+            REGLAS_VALIDACION (ver ValidadorResenas), antes de aplicar nrows:
+            data/cuarentena.csv en una carga completa (nrows=None) y
+            data/cuarentena_parcial.csv con nrows
 
     Returns:
         pd.DataFrame: DataFrame con los datos cargados, o None si hay error
     """
     print(f"Cargando datos desde {path}...")
 
+    validador = None
+    if validar:
+        validador = ValidadorResenas(CUARENTENA_PATH if nrows is None else CUARENTENA_PARCIAL_PATH)
+
     try:
-        # Cargar el dataset
-        df = pd.read_csv(path, nrows=nrows)
+        if validador is not None and nrows is not None:
+            df = _leer_validando(path, nrows, columns, filters, usar_cache, validador)
+        elif usar_cache and pq is not None:
+            if not cache_valida(path):
+                construir_cache(path)
+            ruta_parquet, _ = _rutas_cache(path)
+            df = _leer_parquet(ruta_parquet, nrows=nrows, columns=columns, filters=filters)
+        elif es_formato_snap(path) and not filters:
+            tabla = leer_snap(path, nrows=nrows)
+            df = (tabla.select(columns) if columns else tabla).to_pandas()
+        elif not filters:
+            df = leer_csv(path, nrows=nrows, columns=columns, motor=motor)
+        else:
+            # Filtrar bloque a bloque y acumular solo las filas que pasan
+            bloques = []
+            filas = 0
+            for chunk in _iter_bloques(path, CHUNKSIZE_DEFECTO, columns, filters, usar_cache=False):
+                bloques.append(chunk)
+                filas += len(chunk)
+                if nrows is not None and filas >= nrows:
+                    break
+            df = pd.concat(bloques, ignore_index=True) if bloques else pd.DataFrame(columns=columns)
+            if nrows is not None:
+                df = df.head(nrows)
         print(f"✓ Datos cargados exitosamente: {len(df)} filas, {len(df.columns)} columnas")
 
         # Validar columnas
-        validar_columnas(df)
+        validar_columnas(df, columnas_requeridas=columns)
+
+        # Validar rangos y tipos; las filas inválidas van a cuarentena (con
+        # nrows ya se validó bloque a bloque durante la lectura)
+        if validador is not None:
+            if nrows is None:
+                df = validador.filtrar(df).reset_index(drop=True)
+            validador.mostrar()
+
+        # Enteros solo después de apartar las filas no numéricas
+        tipar_numericas(df)
+
+        # Reducir memoria con el esquema compacto
+        if compacto:
+            memoria_antes = memoria_mb(df)
+            aplicar_esquema(df)
+            print(f"Memoria: {memoria_antes:.1f} MB -> {memoria_mb(df):.1f} MB con esquema compacto")
 
         # Mostrar información básica
-        print(f"\nRango de fechas: {pd.to_datetime(df['Time'], unit='s').min()} a {pd.to_datetime(df['Time'], unit='s').max()}")
-        print(f"Productos únicos: {df['ProductId'].nunique()}")
-        print(f"Usuarios únicos: {df['UserId'].nunique()}")
+        resumen = ResumenCarga()
+        resumen.actualizar(df)
+        resumen.mostrar()
 
         return df
 
-    except FileNotFoundError:
-        print(f"❌ Error: No se encontró el archivo en {path}")
-        print(f"Asegúrate de que el archivo existe en la carpeta 'data'")
-        print(f"Puedes descargarlo desde: https://www.kaggle.com/snap/amazon-fine-food-reviews")
+    except Exception as e:
+        _informar_error_carga(path, e)
         return None
 
+
+def _columna_estrato(df, estratificar_por):
+    """
+    Calcula la etiqueta de estrato de cada fila.
+
+    'Utilidad' es un estrato derivado: -1 para reseñas sin votos y, si no,
+    el cuartil de HelpfulnessNumerator / HelpfulnessDenominator (0-3).
+    """
+    partes = []
+    for col in estratificar_por:
+        if col == ESTRATO_UTILIDAD:
+            den = df['HelpfulnessDenominator'].to_numpy()
+            num = df['HelpfulnessNumerator'].to_numpy()
+            tasa = np.divide(num, den, out=np.zeros(len(df)), where=den > 0)
+            cuartil = np.minimum((tasa * 4).astype(int), 3)
+            partes.append(pd.Series(np.where(den > 0, cuartil, -1), index=df.index).astype(str))
+        else:
+            partes.append(df[col].astype(str))
+
+    estrato = partes[0]
+    for parte in partes[1:]:
+        estrato = estrato + '|' + parte
+    return estrato
+
+
+def _asignar_cuotas(conteos, n, asignacion='proporcional'):
+    """
+    Reparte n filas entre estratos según su tamaño observado.
+
+    Args:
+        conteos: dict estrato -> filas vistas en el dataset
+        n: Tamaño total de la muestra
+        asignacion: 'proporcional' (según el tamaño del estrato) o
+            'igual' (mismo número por estrato cuando hay suficientes filas)
+
+    Returns:
+        dict: estrato -> filas a muestrear
+    """
+    total = sum(conteos.values())
+    n = min(n, total)
+
+    if asignacion == 'proporcional':
+        # Método del mayor resto para que las cuotas sumen exactamente n
+        exactas = {e: n * c / total for e, c in conteos.items()}
+        cuotas = {e: int(v) for e, v in exactas.items()}
+        restantes = n - sum(cuotas.values())
+        for e in sorted(exactas, key=lambda e: exactas[e] - cuotas[e], reverse=True)[:restantes]:
+            cuotas[e] += 1
+        return cuotas
+
+    if asignacion == 'igual':
+        cuotas = {e: 0 for e in conteos}
+        restantes = n
+        while restantes > 0:
+            con_hueco = [e for e in sorted(conteos) if cuotas[e] < conteos[e]]
+            por_estrato = max(1, restantes // len(con_hueco))
+            for e in con_hueco:
+                extra = min(por_estrato, conteos[e] - cuotas[e], restantes)
+                cuotas[e] += extra
+                restantes -= extra
+                if restantes == 0:
+                    break
+        return cuotas
+
+    raise ValueError(f"Asignación no soportada: {asignacion}")
+
+
+def cargar_muestra(path=DATA_PATH, n=50000, semilla=42, estratificar_por=None,
+                   asignacion='proporcional', columns=None, filters=None,
+                   chunksize=CHUNKSIZE_DEFECTO, usar_cache=True, compacto=True, validar=True):
+    """
+    Obtiene una muestra aleatoria de n reseñas en una sola pasada.
+
+    A cada fila se le asigna una clave aleatoria y se conservan las n de
+    menor clave (muestreo de reserva por bloques), por lo que la memoria
+    es O(n + chunksize) y el resultado solo depende de la semilla. Con
+    estratificar_por se conserva una reserva por estrato y al final se
+    reparte n entre estratos (memoria O(n · estratos)).
+
+    Args:
+        path: Ruta al archivo de datos
+        n: Tamaño de la muestra
+        semilla: Semilla del generador aleatorio
+        estratificar_por: Columna o lista de columnas de estrato (p.ej. 'Score').
+            'Utilidad' estratifica por cuartil de tasa de utilidad
+        asignacion: 'proporcional' o 'igual' (ver _asignar_cuotas)
+        columns: Columnas a devolver (None para todas)
+        filters: Filtros de filas, como en cargar_datos
+        chunksize: Filas por bloque de lectura
+        usar_cache: Si True, lee de la caché Parquet cuando pyarrow está disponible
+        compacto: Si True, aplica ESQUEMA_COMPACTO a la muestra
+        validar: Si True, la muestra se toma solo entre filas válidas y las
+            inválidas van a data/cuarentena_parcial.csv (ver ValidadorResenas)
+
+    Returns:
+        pd.DataFrame: Muestra en el orden original del archivo, o None si hay error
+    """
+    if isinstance(estratificar_por, str):
+        estratificar_por = [estratificar_por]
+
+    descripcion = f", estratos: {', '.join(estratificar_por)}" if estratificar_por else ""
+    print(f"Muestreando {n} reseñas de {path} (semilla={semilla}{descripcion})...")
+
+    columnas_lectura = columns
+    if columns is not None and estratificar_por:
+        necesarias = []
+        for col in estratificar_por:
+            necesarias += ['HelpfulnessNumerator', 'HelpfulnessDenominator'] if col == ESTRATO_UTILIDAD else [col]
+        columnas_lectura = list(columns) + [c for c in dict.fromkeys(necesarias) if c not in columns]
+
+    rng = np.random.default_rng(semilla)
+    reserva = None
+    conteos = {}
+    validador = ValidadorResenas(CUARENTENA_PARCIAL_PATH) if validar else None
+
+    try:
+        for chunk in iter_datos(path, chunksize, columnas_lectura, filters, usar_cache,
+                                compacto=False, validador=validador):
+            chunk['_clave'] = rng.random(len(chunk))
+
+            if estratificar_por:
+                chunk['_estrato'] = _columna_estrato(chunk, estratificar_por)
+                for estrato, cuenta in chunk['_estrato'].value_counts().items():
+                    conteos[estrato] = conteos.get(estrato, 0) + cuenta
+
+            reserva = chunk if reserva is None else pd.concat([reserva, chunk])
+
+            if estratificar_por:
+                reserva = reserva.sort_values('_clave').groupby('_estrato', sort=False).head(n)
+            else:
+                reserva = reserva.nsmallest(n, '_clave')
+
     except Exception as e:
-        print(f"❌ Error inesperado: {e}")
+        _informar_error_carga(path, e)
         return None
 
+    if reserva is None:
+        return pd.DataFrame(columns=columns)
 
-def obtener_estadisticas_basicas(df):
+    if estratificar_por:
+        cuotas = _asignar_cuotas(conteos, n, asignacion)
+        reserva = reserva.sort_values('_clave')
+        reserva = pd.concat([
+            grupo.head(cuotas[estrato])
+            for estrato, grupo in reserva.groupby('_estrato', sort=True)
+        ])
+        print("Filas por estrato: " + ", ".join(f"{e}={cuotas[e]}" for e in sorted(cuotas)))
+
+    df = reserva.sort_index().drop(columns=['_clave', '_estrato'], errors='ignore')
+    if columns is not None:
+        df = df[list(columns)]
+    df = df.reset_index(drop=True)
+
+    print(f"✓ Muestra obtenida: {len(df)} filas, {len(df.columns)} columnas")
+    if validador is not None:
+        validador.mostrar()
+
+    if compacto:
+        aplicar_esquema(df)
+
+    resumen = ResumenCarga()
+    resumen.actualizar(df)
+    resumen.mostrar()
+
+    return df
+
+
+def mostrar_estadisticas(acumulador):
     """
-    Calcula y muestra estadísticas básicas del dataset.
+    Muestra las estadísticas básicas guardadas en un AcumuladorEstadisticas.
 
     Args:
-        df: DataFrame con los datos
+        acumulador: AcumuladorEstadisticas ya actualizado
     """
     print("\n" + "="*60)
     print("ESTADÍSTICAS BÁSICAS DEL DATASET")
     print("="*60)
 
-    print(f"\nDimensiones: {df.shape[0]} filas × {df.shape[1]} columnas")
+    print(f"\nDimensiones: {acumulador.filas} filas × {len(acumulador.nulos)} columnas")
 
     print(f"\nValores nulos por columna:")
-    nulos = df.isnull().sum()
-    for col, count in nulos.items():
+    for col, count in acumulador.nulos.items():
         if count > 0:
-            pct = (count / len(df)) * 100
+            pct = (count / acumulador.filas) * 100
             print(f"  {col}: {count} ({pct:.2f}%)")
 
-    print(f"\nDistribución de calificaciones (Score):")
-    print(df['Score'].value_counts().sort_index())
+    if acumulador.time_min is not None:
+        print(f"\nRango de fechas: {pd.to_datetime(acumulador.time_min, unit='s')} a {pd.to_datetime(acumulador.time_max, unit='s')}")
+    for col in acumulador.distintos:
+        if col in acumulador.nulos:
+            print(f"{col} distintos (aprox.): {acumulador.n_distintos(col)}")
+
+    if acumulador.scores:
+        print(f"\nDistribución de calificaciones (Score):")
+        print(pd.Series(acumulador.scores, name='count').sort_index())
+
+    numericas = acumulador.columnas_numericas or []
+    if 'HelpfulnessNumerator' in numericas and 'HelpfulnessDenominator' in numericas:
+        print(f"\nEstadísticas de utilidad:")
+        print(f"  HelpfulnessNumerator - Media: {acumulador.media('HelpfulnessNumerator'):.2f}")
+        print(f"  HelpfulnessDenominator - Media: {acumulador.media('HelpfulnessDenominator'):.2f}")
+        print(f"  Tasa de utilidad promedio: {acumulador.tasa_utilidad_media():.2%}")
+
+
+def obtener_estadisticas_basicas(df):
+    """
+    Calcula y muestra estadísticas básicas del dataset.
+
+    Args:
+        df: DataFrame con los datos
+
+    Returns:
+        AcumuladorEstadisticas con las estadísticas calculadas
+    """
+    acumulador = AcumuladorEstadisticas()
+    acumulador.actualizar(df)
+    mostrar_estadisticas(acumulador)
+    return acumulador
+
+
+def obtener_estadisticas_streaming(path=DATA_PATH, chunksize=CHUNKSIZE_DEFECTO, columns=None,
+                                   filters=None, usar_cache=True):
+    """
+    Calcula las estadísticas básicas de todo el dataset con memoria constante.
+
+    Recorre el archivo con iter_datos y actualiza un único acumulador, así
+    que la memoria depende de chunksize y no del número de reseñas.
+
+    Args:
+        path: Ruta al archivo de datos
+        chunksize: Filas por bloque
+        columns: Columnas a cargar (None para todas)
+        filters: Filtros de filas, como en cargar_datos
+        usar_cache: Si True, lee de la caché Parquet cuando pyarrow está disponible
+
+    Returns:
+        AcumuladorEstadisticas con las estadísticas de todo el dataset
+    """
+    acumulador = None
+    for chunk in iter_datos(path, chunksize, columns, filters, usar_cache):
+        if acumulador is None:
+            columnas_numericas = list(chunk.select_dtypes(include=[np.number]).columns)
+            acumulador = AcumuladorEstadisticas(columnas_numericas=columnas_numericas)
+        acumulador.actualizar(chunk)
 
-    print(f"\nEstadísticas de utilidad:")
-    print(f"  HelpfulnessNumerator - Media: {df['HelpfulnessNumerator'].mean():.2f}")
-    print(f"  HelpfulnessDenominator - Media: {df['HelpfulnessDenominator'].mean():.2f}")
+    if acumulador is None:
+        acumulador = AcumuladorEstadisticas()
 
-    # Calcular tasa de utilidad
-    df_temp = df[df['HelpfulnessDenominator'] > 0].copy()
-    df_temp['HelpfulnessRate'] = df_temp['HelpfulnessNumerator'] / df_temp['HelpfulnessDenominator']
-    print(f"  Tasa de utilidad promedio: {df_temp['HelpfulnessRate'].mean():.2%}")
+    mostrar_estadisticas(acumulador)
+    return acumulador
 
 
 if __name__ == "__main__":
     print(f"Ejecutando script desde: {os.path.abspath(__file__)}\n")
 
-    # Verificar si existe el dataset, si no, informar sobre descarga
-    if not os.path.exists(DATA_PATH):
-        descargar_dataset()
+    # Verificar si existe el dataset, si no, descargar la versión de SNAP
+    data_path = DATA_PATH
+    if not os.path.exists(data_path):
+        data_path = descargar_dataset()
 
-    # Cargar datos (limitar a 50000 filas para pruebas rápidas, quitar nrows para cargar todo)
-    df = cargar_datos(DATA_PATH, nrows=50000)
+    # Muestra aleatoria de 50000 filas para pruebas rápidas (usar cargar_datos para cargar todo)
+    df = cargar_muestra(data_path, n=50000)
 
     if df is not None:
         print("\n--- PRIMERAS FILAS ---")
@@ -0,0 +1,132 @@
+"""
+Diccionario de Lemas - Amazon Reviews
+Tabla persistente token -> lema (y lista de stopwords) en un archivo SQLite
+bajo data/, compartida por el pipeline, la API y los notebooks.
+
+Cada proceso la lee completa al arrancar con una sola consulta, de modo que
+lematizar un token conocido es una búsqueda en un dict; WordNet solo se
+consulta para los tokens que aún no están en la tabla, y esos lemas nuevos
+se añaden al final de cada ejecución.
+"""
+
+import os
+import sqlite3
+
+from data_loader import DATA_DIR
+
+# Ruta por defecto del diccionario
+LEMAS_PATH = os.path.join(DATA_DIR, "lemas.sqlite")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS lemas (
+    token TEXT PRIMARY KEY,
+    lema TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS stopwords (
+    idioma TEXT NOT NULL,
+    palabra TEXT NOT NULL,
+    PRIMARY KEY (idioma, palabra)
+) WITHOUT ROWID;
+"""
+
+
+def _conectar(ruta):
+    """Abre (y crea si hace falta) el archivo SQLite con el esquema."""
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+    conexion = sqlite3.connect(ruta)
+    conexion.executescript(_ESQUEMA)
+    return conexion
+
+
+def cargar_lemas(ruta=LEMAS_PATH):
+    """
+    Lee la tabla token -> lema completa.
+
+    Args:
+        ruta: Archivo SQLite del diccionario
+
+    Returns:
+        dict: token -> lema (vacío si el archivo no existe)
+    """
+    if ruta is None or not os.path.exists(ruta):
+        return {}
+    conexion = sqlite3.connect(ruta)
+    try:
+        return dict(conexion.execute("SELECT token, lema FROM lemas"))
+    except sqlite3.OperationalError:
+        return {}
+    finally:
+        conexion.close()
+
+
+def guardar_lemas(lemas, ruta=LEMAS_PATH):
+    """
+    Añade (o actualiza) pares token -> lema en una sola transacción.
+
+    Args:
+        lemas: dict token -> lema
+        ruta: Archivo SQLite del diccionario
+
+    Returns:
+        int: Pares escritos
+    """
+    if not lemas:
+        return 0
+    conexion = _conectar(ruta)
+    try:
+        with conexion:
+            conexion.executemany(
+                "INSERT OR REPLACE INTO lemas (token, lema) VALUES (?, ?)",
+                lemas.items(),
+            )
+    finally:
+        conexion.close()
+    return len(lemas)
+
+
+def cargar_stopwords(idioma='english', ruta=LEMAS_PATH):
+    """
+    Lee la lista de stopwords guardada para un idioma.
+
+    Args:
+        idioma: Idioma de la lista
+        ruta: Archivo SQLite del diccionario
+
+    Returns:
+        frozenset o None si no hay lista guardada
+    """
+    if ruta is None or not os.path.exists(ruta):
+        return None
+    conexion = sqlite3.connect(ruta)
+    try:
+        palabras = [
+            fila[0] for fila in
+            conexion.execute("SELECT palabra FROM stopwords WHERE idioma = ?", (idioma,))
+        ]
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conexion.close()
+    return frozenset(palabras) if palabras else None
+
+
+def guardar_stopwords(palabras, idioma='english', ruta=LEMAS_PATH):
+    """
+    Reemplaza la lista de stopwords guardada para un idioma.
+
+    Args:
+        palabras: Colección de stopwords
+        idioma: Idioma de la lista
+        ruta: Archivo SQLite del diccionario
+    """
+    conexion = _conectar(ruta)
+    try:
+        with conexion:
+            conexion.execute("DELETE FROM stopwords WHERE idioma = ?", (idioma,))
+            conexion.executemany(
+                "INSERT INTO stopwords (idioma, palabra) VALUES (?, ?)",
+                ((idioma, palabra) for palabra in sorted(palabras)),
+            )
+    finally:
+        conexion.close()
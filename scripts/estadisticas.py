@@ -0,0 +1,293 @@
+"""
+Estadísticas Incrementales - Amazon Reviews
+Acumuladores combinables para calcular estadísticas del dataset bloque a
+bloque (o en paralelo) con memoria constante.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Precisión por defecto del HyperLogLog: 2^14 registros (~16 KB),
+# error estándar ~0.8%
+PRECISION_HLL = 14
+
+
+def hash_64(serie):
+    """Devuelve un hash de 64 bits por valor, estable entre bloques y procesos."""
+    return pd.util.hash_pandas_object(serie, index=False).to_numpy(dtype=np.uint64)
+
+
+class HyperLogLog:
+    """
+    Estimador de valores distintos con memoria fija (HyperLogLog).
+
+    Los registros se actualizan de forma vectorizada con NumPy y dos
+    estimadores se combinan con un máximo elemento a elemento, así que
+    puede alimentarse por bloques o en procesos independientes.
+    """
+
+    def __init__(self, precision=PRECISION_HLL):
+        """Inicializa los 2^precision registros a cero."""
+        self.precision = precision
+        self.m = 1 << precision
+        self.registros = np.zeros(self.m, dtype=np.uint8)
+
+    def actualizar_hashes(self, hashes):
+        """Incorpora un array de hashes uint64."""
+        if len(hashes) == 0:
+            return
+        bits_resto = 64 - self.precision
+        indices = (hashes >> np.uint64(bits_resto)).astype(np.intp)
+        resto = hashes & np.uint64((1 << bits_resto) - 1)
+
+        # Posición del primer bit a 1 en los bits restantes. resto < 2^53,
+        # así que la conversión a float es exacta y frexp da su bit_length
+        _, longitud = np.frexp(resto.astype(np.float64))
+        rango = (bits_resto - longitud + 1).astype(np.uint8)
+
+        np.maximum.at(self.registros, indices, rango)
+
+    def actualizar(self, serie):
+        """Incorpora los valores no nulos de una Serie."""
+        self.actualizar_hashes(hash_64(serie.dropna()))
+
+    def combinar(self, otro):
+        """Combina con otro estimador de la misma precisión."""
+        if otro.precision != self.precision:
+            raise ValueError("Solo se pueden combinar HyperLogLog de la misma precisión")
+        np.maximum(self.registros, otro.registros, out=self.registros)
+        return self
+
+    def estimar(self):
+        """Devuelve el número estimado de valores distintos."""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimacion = alpha * self.m ** 2 / np.sum(np.ldexp(1.0, -self.registros.astype(int)))
+
+        # Corrección para cardinalidades pequeñas (conteo lineal)
+        vacios = np.count_nonzero(self.registros == 0)
+        if estimacion <= 2.5 * self.m and vacios > 0:
+            estimacion = self.m * np.log(self.m / vacios)
+
+        return int(round(estimacion))
+
+
+class AcumuladorEstadisticas:
+    """
+    Acumulador combinable de estadísticas del dataset de reseñas.
+
+    Mantiene conteos, nulos por columna, rango de Time, distribución de
+    Score, valores distintos aproximados (HyperLogLog) de los
+    identificadores, y media/varianza/co-momentos de las columnas numéricas
+    para calcular correlaciones sin tener el DataFrame completo. Los
+    momentos se combinan con la fórmula paralela de Chan et al.
+
+    La media y la varianza de cada columna usan todos sus valores no nulos
+    (no dependen de los nulos de otras columnas); los co-momentos de las
+    correlaciones usan solo las filas sin nulos en ninguna columna numérica
+    (las demás se cuentan en filas_descartadas).
+    """
+
+    def __init__(self, columnas_numericas=None, columnas_distintas=('ProductId', 'UserId')):
+        """
+        Inicializa el acumulador vacío.
+
+        Args:
+            columnas_numericas: Columnas para media/varianza/correlación
+                (None para tomar las numéricas del primer bloque)
+            columnas_distintas: Columnas con conteo aproximado de distintos
+        """
+        self.filas = 0
+        self.nulos = {}
+        self.time_min = None
+        self.time_max = None
+        self.scores = {}
+        self.suma_tasa = 0.0
+        self.filas_con_votos = 0
+        self.distintos = {col: HyperLogLog() for col in columnas_distintas}
+
+        self.columnas_numericas = list(columnas_numericas) if columnas_numericas is not None else None
+        self.n_momentos = 0
+        self.filas_descartadas = 0
+        self.medias = None
+        self.comomentos = None
+
+        # Momentos por columna (valores no nulos de cada una)
+        self.n_columnas = None
+        self.medias_columnas = None
+        self.m2_columnas = None
+
+    def _actualizar_momentos(self, df):
+        """
+        Incorpora un bloque a los momentos por columna (valores no nulos) y
+        a las medias y co-momentos conjuntos (filas sin nulos).
+        """
+        if self.columnas_numericas is None:
+            self.columnas_numericas = list(df.select_dtypes(include=[np.number]).columns)
+        columnas = [col for col in self.columnas_numericas if col in df.columns]
+        if columnas != self.columnas_numericas:
+            raise ValueError("Todos los bloques deben contener las mismas columnas numéricas")
+
+        X = df[columnas].to_numpy(dtype=np.float64)
+
+        validos = ~np.isnan(X)
+        n_b = validos.sum(axis=0)
+        medias_b = np.divide(np.where(validos, X, 0).sum(axis=0), n_b,
+                             out=np.zeros(len(columnas)), where=n_b > 0)
+        m2_b = (np.where(validos, X - medias_b, 0) ** 2).sum(axis=0)
+        self._combinar_columnas(n_b, medias_b, m2_b)
+
+        completas = validos.all(axis=1)
+        self.filas_descartadas += int((~completas).sum())
+        X = X[completas]
+        if len(X) == 0:
+            return
+
+        medias = X.mean(axis=0)
+        centrado = X - medias
+        self._combinar_momentos(len(X), medias, centrado.T @ centrado)
+
+    def _combinar_columnas(self, n_b, medias_b, m2_b):
+        """Combina conteos, medias y M2 por columna de otro bloque (Chan et al.)."""
+        if self.n_columnas is None:
+            self.n_columnas = n_b.copy()
+            self.medias_columnas = medias_b.copy()
+            self.m2_columnas = m2_b.copy()
+            return
+
+        n_a = self.n_columnas
+        n = n_a + n_b
+        peso_b = np.divide(n_b, n, out=np.zeros(len(n)), where=n > 0)
+        delta = medias_b - self.medias_columnas
+        self.m2_columnas += m2_b + delta ** 2 * n_a * peso_b
+        self.medias_columnas += delta * peso_b
+        self.n_columnas = n
+
+    def _combinar_momentos(self, n_b, medias_b, comomentos_b):
+        """Combina medias y co-momentos de otro bloque (Chan et al.)."""
+        if self.n_momentos == 0:
+            self.n_momentos = n_b
+            self.medias = medias_b.copy()
+            self.comomentos = comomentos_b.copy()
+            return
+
+        n_a = self.n_momentos
+        n = n_a + n_b
+        delta = medias_b - self.medias
+        self.comomentos += comomentos_b + np.outer(delta, delta) * n_a * n_b / n
+        self.medias += delta * n_b / n
+        self.n_momentos = n
+
+    def actualizar(self, df):
+        """
+        Incorpora un bloque de reseñas.
+
+        Args:
+            df: Bloque del dataset (cualquier subconjunto de columnas)
+
+        Returns:
+            self
+        """
+        self.filas += len(df)
+
+        for col, cuenta in df.isnull().sum().items():
+            self.nulos[col] = self.nulos.get(col, 0) + int(cuenta)
+
+        if 'Time' in df.columns and len(df) > 0:
+            tmin, tmax = df['Time'].min(), df['Time'].max()
+            self.time_min = tmin if self.time_min is None else min(self.time_min, tmin)
+            self.time_max = tmax if self.time_max is None else max(self.time_max, tmax)
+
+        if 'Score' in df.columns:
+            for score, cuenta in df['Score'].value_counts().items():
+                self.scores[score] = self.scores.get(score, 0) + int(cuenta)
+
+        if 'HelpfulnessNumerator' in df.columns and 'HelpfulnessDenominator' in df.columns:
+            den = df['HelpfulnessDenominator'].to_numpy()
+            num = df['HelpfulnessNumerator'].to_numpy()
+            con_votos = den > 0
+            self.suma_tasa += float((num[con_votos] / den[con_votos]).sum())
+            self.filas_con_votos += int(con_votos.sum())
+
+        for col, hll in self.distintos.items():
+            if col in df.columns:
+                hll.actualizar(df[col])
+
+        self._actualizar_momentos(df)
+
+        return self
+
+    def combinar(self, otro):
+        """
+        Combina con otro acumulador (p.ej. calculado en otro proceso).
+
+        Args:
+            otro: AcumuladorEstadisticas con las mismas columnas numéricas
+
+        Returns:
+            self
+        """
+        self.filas += otro.filas
+        for col, cuenta in otro.nulos.items():
+            self.nulos[col] = self.nulos.get(col, 0) + cuenta
+        for score, cuenta in otro.scores.items():
+            self.scores[score] = self.scores.get(score, 0) + cuenta
+
+        if otro.time_min is not None:
+            self.time_min = otro.time_min if self.time_min is None else min(self.time_min, otro.time_min)
+            self.time_max = otro.time_max if self.time_max is None else max(self.time_max, otro.time_max)
+
+        self.suma_tasa += otro.suma_tasa
+        self.filas_con_votos += otro.filas_con_votos
+
+        for col, hll in otro.distintos.items():
+            if col in self.distintos:
+                self.distintos[col].combinar(hll)
+            else:
+                self.distintos[col] = hll
+
+        if otro.n_columnas is not None:
+            if self.columnas_numericas is None:
+                self.columnas_numericas = otro.columnas_numericas
+            elif self.columnas_numericas != otro.columnas_numericas:
+                raise ValueError("Los acumuladores deben tener las mismas columnas numéricas")
+            self._combinar_columnas(otro.n_columnas, otro.medias_columnas, otro.m2_columnas)
+            if otro.n_momentos > 0:
+                self._combinar_momentos(otro.n_momentos, otro.medias, otro.comomentos)
+        self.filas_descartadas += otro.filas_descartadas
+
+        return self
+
+    def media(self, col):
+        """Media de los valores no nulos de una columna numérica."""
+        i = self.columnas_numericas.index(col)
+        return self.medias_columnas[i] if self.n_columnas[i] > 0 else np.nan
+
+    def varianza(self, col):
+        """Varianza muestral (ddof=1) de los valores no nulos de una columna numérica."""
+        i = self.columnas_numericas.index(col)
+        return self.m2_columnas[i] / (self.n_columnas[i] - 1) if self.n_columnas[i] > 1 else np.nan
+
+    def tasa_utilidad_media(self):
+        """Media de HelpfulnessNumerator / HelpfulnessDenominator en reseñas con votos."""
+        return self.suma_tasa / self.filas_con_votos if self.filas_con_votos else np.nan
+
+    def n_distintos(self, col):
+        """Número aproximado de valores distintos de una columna."""
+        return self.distintos[col].estimar()
+
+    def correlaciones(self, target):
+        """
+        Correlación de Pearson de cada columna numérica con target (solo
+        filas sin nulos en ninguna columna numérica).
+
+        Args:
+            target: Columna numérica objetivo
+
+        Returns:
+            pd.Series: Correlaciones (NaN para columnas constantes)
+        """
+        i = self.columnas_numericas.index(target)
+        diagonal = np.diag(self.comomentos)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = self.comomentos[:, i] / np.sqrt(diagonal * diagonal[i])
+        return pd.Series(corr, index=self.columnas_numericas)
@@ -0,0 +1,181 @@
+"""
+Formato SNAP - Amazon Fine Food Reviews
+Lee por streaming el archivo finefoods.txt.gz publicado por SNAP y lo
+convierte en lotes Arrow con las mismas columnas que el CSV de Kaggle.
+
+Cada reseña del archivo es un bloque de líneas clave/valor separado por
+una línea en blanco:
+
+    product/productId: B001E4KFG0
+    review/userId: A3SGXH7AUHU8GW
+    review/profileName: delmartian
+    review/helpfulness: 1/1
+    review/score: 5.0
+    review/time: 1303862400
+    review/summary: Good Quality Dog Food
+    review/text: I have bought several of the Vitality canned dog food...
+"""
+
+import gzip
+
+import pyarrow as pa
+
+# Filas por lote Arrow
+BATCH_SIZE_DEFECTO = 50000
+
+# El archivo de SNAP no es UTF-8 válido en todas sus líneas
+ENCODING_SNAP = 'latin-1'
+
+# Esquema de salida, idéntico en nombres al CSV de Kaggle
+ESQUEMA_SNAP = pa.schema([
+    ('Id', pa.int64()),
+    ('ProductId', pa.string()),
+    ('UserId', pa.string()),
+    ('ProfileName', pa.string()),
+    ('HelpfulnessNumerator', pa.int64()),
+    ('HelpfulnessDenominator', pa.int64()),
+    ('Score', pa.int64()),
+    ('Time', pa.int64()),
+    ('Summary', pa.string()),
+    ('Text', pa.string()),
+])
+
+# Posición en ESQUEMA_SNAP de cada clave de texto del formato
+_COLUMNA_POR_CLAVE = {
+    'product/productId': 1,
+    'review/userId': 2,
+    'review/profileName': 3,
+    'review/summary': 8,
+    'review/text': 9,
+}
+
+_COL_NUMERADOR = 4
+_COL_DENOMINADOR = 5
+_COL_SCORE = 6
+_COL_TIME = 7
+
+
+def _abrir(path):
+    """Abre el archivo en modo texto, descomprimiendo si termina en .gz."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding=ENCODING_SNAP, newline='\n')
+    return open(path, 'r', encoding=ENCODING_SNAP, newline='\n')
+
+
+def _crear_lote(columnas):
+    """Convierte las listas por columna en un RecordBatch con ESQUEMA_SNAP."""
+    arrays = [
+        pa.array(valores, type=campo.type)
+        for valores, campo in zip(columnas, ESQUEMA_SNAP)
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=ESQUEMA_SNAP)
+
+
+def iter_lotes_snap(path, batch_size=BATCH_SIZE_DEFECTO):
+    """
+    Recorre el archivo SNAP y produce lotes Arrow de tamaño fijo.
+
+    Los valores se acumulan directamente en una lista por columna (sin un
+    dict por reseña) y cada batch_size reseñas se vuelcan a un RecordBatch.
+    Los campos ausentes o vacíos en una reseña quedan como nulos (igual que
+    en el CSV de Kaggle) y, si una clave se repite dentro de la misma
+    reseña, se conserva su primer valor (así todas las columnas avanzan a
+    la vez). Como el formato no trae identificador, Id se numera de forma
+    secuencial desde 1.
+
+    Args:
+        path: Ruta a finefoods.txt.gz (o a la versión descomprimida)
+        batch_size: Reseñas por lote
+
+    Yields:
+        pa.RecordBatch: Lotes con el esquema ESQUEMA_SNAP
+    """
+    columnas = [[] for _ in ESQUEMA_SNAP]
+    col_id = columnas[0]
+    col_num = columnas[_COL_NUMERADOR]
+    col_den = columnas[_COL_DENOMINADOR]
+    col_score = columnas[_COL_SCORE]
+    col_time = columnas[_COL_TIME]
+
+    siguiente_id = 1
+    en_registro = False
+
+    def cerrar_registro():
+        # Rellenar con nulos los campos que no aparecieron en la reseña
+        n = len(col_id)
+        for valores in columnas:
+            if len(valores) < n:
+                valores.append(None)
+
+    with _abrir(path) as f:
+        for linea in f:
+            # Línea en blanco (también '\r\n' en archivos con fin de línea de Windows)
+            if not linea.strip():
+                if en_registro:
+                    cerrar_registro()
+                    en_registro = False
+                    if len(col_id) >= batch_size:
+                        yield _crear_lote(columnas)
+                        for valores in columnas:
+                            valores.clear()
+                continue
+
+            clave, _, valor = linea.partition(':')
+            valor = valor.strip()
+
+            if not en_registro:
+                col_id.append(siguiente_id)
+                siguiente_id += 1
+                en_registro = True
+
+            # Una columna ya tiene el valor de esta reseña si su longitud
+            # alcanzó la de col_id: las claves repetidas se ignoran
+            n = len(col_id)
+            indice = _COLUMNA_POR_CLAVE.get(clave)
+            # Un valor vacío es nulo, como en el CSV de Kaggle
+            if indice is not None:
+                if len(columnas[indice]) < n:
+                    columnas[indice].append(valor or None)
+            elif clave == 'review/helpfulness':
+                if len(col_num) < n:
+                    numerador, _, denominador = valor.partition('/')
+                    col_num.append(int(numerador) if numerador else None)
+                    col_den.append(int(denominador) if denominador else None)
+            elif clave == 'review/score':
+                if len(col_score) < n:
+                    col_score.append(int(float(valor)) if valor else None)
+            elif clave == 'review/time':
+                if len(col_time) < n:
+                    col_time.append(int(valor) if valor else None)
+
+    if en_registro:
+        cerrar_registro()
+    if col_id:
+        yield _crear_lote(columnas)
+
+
+def leer_snap(path, nrows=None, batch_size=BATCH_SIZE_DEFECTO):
+    """
+    Lee el archivo SNAP completo (o sus primeras nrows reseñas) en una tabla Arrow.
+
+    Args:
+        path: Ruta a finefoods.txt.gz
+        nrows: Número de reseñas a leer (None para todas)
+        batch_size: Reseñas por lote interno
+
+    Returns:
+        pa.Table: Tabla con el esquema ESQUEMA_SNAP
+    """
+    if nrows is not None:
+        batch_size = max(1, min(batch_size, nrows))
+
+    lotes = []
+    leidas = 0
+    for lote in iter_lotes_snap(path, batch_size=batch_size):
+        lotes.append(lote)
+        leidas += lote.num_rows
+        if nrows is not None and leidas >= nrows:
+            break
+
+    tabla = pa.Table.from_batches(lotes, schema=ESQUEMA_SNAP)
+    return tabla if nrows is None else tabla.slice(0, nrows)
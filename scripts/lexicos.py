@@ -0,0 +1,253 @@
+"""
+Léxicos de Dominio - Amazon Reviews
+Cuenta los términos de los léxicos de dominio (sabor, textura, precio...)
+con la semántica de str.count sobre el texto en minúsculas: cada término
+es una subcadena ('than' cuenta dentro de 'thank'), sus apariciones no se
+solapan entre sí y cada término se cuenta de forma independiente.
+
+Los léxicos son datos (lexicos.json): cada característica tiene un tipo
+('conteo': suma de apariciones de sus términos; 'presencia': 1 si aparece
+alguno) y uno o varios grupos de términos.
+"""
+
+import os
+import re
+import json
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Léxicos por defecto
+LEXICOS_PATH = os.path.join(SCRIPT_DIR, "lexicos.json")
+
+TIPOS_LEXICO = ('conteo', 'presencia')
+
+
+def cargar_lexicos(ruta=LEXICOS_PATH):
+    """
+    Lee los léxicos de un archivo JSON.
+
+    Args:
+        ruta: Archivo con {característica: {'tipo': ..., 'grupos': {grupo: [términos]}}}
+
+    Returns:
+        dict con los léxicos en el orden del archivo
+    """
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _solapa_consigo(termino):
+    """Indica si dos apariciones del término pueden solaparse (p.ej. 'aa')."""
+    return any(termino[:k] == termino[-k:] for k in range(1, len(termino)))
+
+
+def _sin_solapamiento(posiciones, longitud):
+    """Elige, de izquierda a derecha, las apariciones que contaría str.count."""
+    elegidas = []
+    fin = -1
+    for posicion in posiciones.tolist():
+        if posicion >= fin:
+            elegidas.append(posicion)
+            fin = posicion + longitud
+    return np.array(elegidas, dtype=np.int64)
+
+
+def _expresion_trie(terminos):
+    """
+    Alternativa de regex con forma de trie: en cada posición el motor
+    descarta con un solo carácter todas las ramas que no empiezan por él,
+    en lugar de probar cada término por separado.
+    """
+    arbol = {}
+    for termino in terminos:
+        nodo = arbol
+        for caracter in termino:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[''] = {}
+
+    def emitir(nodo):
+        ramas = [re.escape(caracter) + emitir(hijo) for caracter, hijo in sorted(nodo.items()) if caracter]
+        if not ramas:
+            return ''
+        cuerpo = ramas[0] if len(ramas) == 1 else '(?:' + '|'.join(ramas) + ')'
+        return f'(?:{cuerpo})?' if '' in nodo else cuerpo
+
+    return emitir(arbol)
+
+
+class ContadorLexicos:
+    """
+    Cuenta todos los términos de los léxicos a la vez.
+
+    Un texto suelto se pasa a minúsculas y se recorre una sola vez con una
+    regex compilada en forma de trie que marca las posiciones donde empieza
+    algún término; en cada una se verifican solo los términos con sus 2
+    primeros caracteres. Un lote de textos ASCII se recorre una sola vez:
+    una tabla indexada por los 2 primeros bytes de cada término marca las
+    posiciones candidatas de todo el lote y el resto de bytes de cada
+    término se verifica con NumPy solo en sus candidatas.
+    """
+
+    def __init__(self, lexicos=None):
+        """
+        Args:
+            lexicos: dict de léxicos (None para cargar LEXICOS_PATH)
+
+        Raises:
+            ValueError: Si un tipo o un término no es válido
+        """
+        if lexicos is None:
+            lexicos = cargar_lexicos()
+
+        self.caracteristicas = list(lexicos)
+        self.terminos = []
+        indices = {}
+        asignaciones = []
+
+        for j, (nombre, lexico) in enumerate(lexicos.items()):
+            if lexico.get('tipo') not in TIPOS_LEXICO:
+                raise ValueError(f"Tipo de léxico no válido en {nombre}: {lexico.get('tipo')!r}")
+            for grupo, terminos in lexico['grupos'].items():
+                for termino in terminos:
+                    if not termino or '\x00' in termino or termino != termino.lower():
+                        raise ValueError(f"Término no válido en {nombre}/{grupo}: {termino!r}")
+                    if termino not in indices:
+                        indices[termino] = len(self.terminos)
+                        self.terminos.append(termino)
+                    asignaciones.append((indices[termino], j))
+
+        # Veces que cada término suma en cada característica
+        self.pesos = np.zeros((len(self.terminos), len(self.caracteristicas)), dtype=np.int64)
+        for i, j in asignaciones:
+            self.pesos[i, j] += 1
+        self.presencia = np.array(
+            [lexicos[nombre]['tipo'] == 'presencia' for nombre in self.caracteristicas], dtype=bool
+        )
+
+        # Lo mismo en listas de Python para el camino de un solo texto
+        self._indices = [
+            [i for i, j in asignaciones if j == columna] for columna in range(len(self.caracteristicas))
+        ]
+
+        self._compilar()
+        self._compilar_texto()
+
+    def _compilar_texto(self):
+        """Prepara la búsqueda en un solo texto (cualquier alfabeto)."""
+        self._grupos_texto = {}
+        for i, termino in enumerate(self.terminos):
+            self._grupos_texto.setdefault(termino[:2], []).append((i, termino, len(termino)))
+        # Términos de un carácter: comparten posición con los de su prefijo
+        self._hay_cortos_texto = any(len(termino) == 1 for termino in self.terminos)
+        self._re_inicios = re.compile('(?=' + _expresion_trie(self.terminos) + ')')
+
+    def _compilar(self):
+        """Prepara la búsqueda por lotes (solo términos ASCII)."""
+        ascii_ = [(i, t.encode('ascii')) for i, t in enumerate(self.terminos) if t.isascii()]
+        self._cortos = [(i, t[0]) for i, t in ascii_ if len(t) == 1]
+        largos = [(i, t) for i, t in ascii_ if len(t) > 1]
+
+        # Prefijo de 2 bytes (little-endian) -> grupo de términos (0: ninguno)
+        prefijos = sorted({t[:2] for _, t in largos})
+        self._tabla = np.zeros(1 << 16, dtype=np.uint16 if len(prefijos) < (1 << 16) - 1 else np.uint32)
+        for grupo, prefijo in enumerate(prefijos, 1):
+            self._tabla[prefijo[0] | (prefijo[1] << 8)] = grupo
+
+        self._largos = [
+            (i, t, int(self._tabla[t[0] | (t[1] << 8)]), _solapa_consigo(t)) for i, t in largos
+        ]
+        self._n_prefijos = len(prefijos)
+        self._longitud_maxima = max((len(t) for _, t in ascii_), default=1)
+
+    def _combinar(self, conteos):
+        """Pasa de conteos por término (n x términos) a características."""
+        totales = conteos @ self.pesos
+        totales[:, self.presencia] = totales[:, self.presencia] > 0
+        return totales
+
+    def contar(self, text):
+        """
+        Características léxicas de un texto.
+
+        Args:
+            text: Texto (se pasa a minúsculas aquí)
+
+        Returns:
+            dict: característica -> int
+        """
+        minusculas = text.lower()
+        conteos = [0] * len(self.terminos)
+        # Fin de la última aparición contada de cada término: como en
+        # str.count, las apariciones de un término no se solapan
+        fines = [0] * len(self.terminos)
+
+        grupos = self._grupos_texto
+        for inicio in self._re_inicios.finditer(minusculas):
+            p = inicio.start()
+            candidatos = grupos.get(minusculas[p:p + 2], ())
+            if self._hay_cortos_texto and p + 1 < len(minusculas):
+                candidatos = [*candidatos, *grupos.get(minusculas[p], ())]
+            for i, termino, longitud in candidatos:
+                if p >= fines[i] and minusculas.startswith(termino, p):
+                    conteos[i] += 1
+                    fines[i] = p + longitud
+
+        features = {}
+        for nombre, indices, presencia in zip(self.caracteristicas, self._indices, self.presencia.tolist()):
+            total = sum(conteos[i] for i in indices)
+            features[nombre] = int(total > 0) if presencia else total
+        return features
+
+    def contar_lote(self, textos):
+        """
+        Características léxicas de un lote de textos ASCII en una sola pasada.
+
+        Args:
+            textos: Secuencia de textos ASCII
+
+        Returns:
+            np.ndarray int64 de forma (len(textos), len(self.caracteristicas))
+        """
+        textos = list(textos)
+        conteos = np.zeros((len(textos), len(self.terminos)), dtype=np.int64)
+        if not textos:
+            return self._combinar(conteos)
+
+        # Textos unidos por '\x00' (ningún término lo contiene, así que una
+        # aparición nunca cruza de un texto al siguiente) y con relleno al
+        # final para leer cualquier término sin salirse del buffer
+        unido = '\x00'.join(textos).lower().encode('ascii')
+        n = len(unido)
+        buf = np.frombuffer(unido + b'\x00' * self._longitud_maxima, dtype=np.uint8)
+
+        longitudes = np.fromiter(map(len, textos), dtype=np.int64, count=len(textos))
+        inicios = np.concatenate(([0], np.cumsum(longitudes[:-1] + 1)))
+
+        def asignar(i, posiciones):
+            filas = np.searchsorted(inicios, posiciones, side='right') - 1
+            conteos[:, i] = np.bincount(filas, minlength=len(textos))
+
+        for i, byte in self._cortos:
+            asignar(i, np.flatnonzero(buf[:n] == byte))
+
+        if self._largos:
+            # Única pasada sobre el lote: grupo del prefijo en cada posición
+            claves = buf[:n].astype(np.uint16) | (buf[1:n + 1].astype(np.uint16) << 8)
+            grupos = self._tabla[claves]
+            candidatas = np.flatnonzero(grupos)
+            grupos = grupos[candidatas]
+            orden = np.argsort(grupos, kind='stable')
+            candidatas = candidatas[orden]
+            limites = np.searchsorted(grupos[orden], np.arange(1, self._n_prefijos + 2))
+
+            for i, termino, grupo, solapa in self._largos:
+                posiciones = candidatas[limites[grupo - 1]:limites[grupo]]
+                for k in range(2, len(termino)):
+                    posiciones = posiciones[buf[posiciones + k] == termino[k]]
+                if solapa:
+                    posiciones = _sin_solapamiento(posiciones, len(termino))
+                asignar(i, posiciones)
+
+        return self._combinar(conteos)
@@ -4,10 +4,10 @@ Limpia el texto de las reseñas y calcula la tasa de utilidad para clasificació
 """
 
 import pandas as pd
+import numpy as np
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+import functools
+from concurrent.futures import ProcessPoolExecutor
 import os
 import sys
 
@@ -15,23 +15,157 @@ import sys
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(SCRIPT_DIR)
 
-from data_loader import cargar_datos, DATA_PATH
+from data_loader import cargar_datos, cargar_muestra, recortar_columna, DATA_PATH, MAX_CARACTERES_TEXTO
+from recursos_nltk import requerir
+from cache_limpieza import CacheLimpieza, CACHE_LIMPIEZA_PATH
+from diccionario_lemas import (
+    LEMAS_PATH, cargar_lemas, guardar_lemas, cargar_stopwords, guardar_stopwords
+)
 
-# Descargar recursos necesarios de NLTK (solo la primera vez)
+# pyarrow es opcional: sin él la limpieza vectorizada usa los métodos .str de pandas
 try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from segmentacion import agregar_offsets, bytes_columnas, COLUMNA_TOKENS, COLUMNA_ORACIONES
+except ImportError:
+    pa = None
+    pc = None
+    agregar_offsets = None
+
+# Columnas del dataset original que usan las etapas posteriores.
+# ProfileName no se usa, así que no se carga; Id sirve de marca de agua
+# en el modo incremental
+COLUMNAS_PIPELINE = [
+    'Id', 'ProductId', 'UserId', 'Score', 'Time',
+    'HelpfulnessNumerator', 'HelpfulnessDenominator',
+    'Summary', 'Text'
+]
+
+# Filtro de calcular_tasa_utilidad (al menos 1 voto) aplicado ya en la lectura
+FILTRO_VOTOS = [('HelpfulnessDenominator', '>=', 1)]
+
+# Patrones de limpieza compilados una sola vez
+PATRON_URL = re.compile(r"http\S+|www\S+|https\S+", flags=re.MULTILINE)
+PATRON_NO_PERMITIDOS_BASICO = re.compile(r'[^a-zA-Z\s.,!?]')
+PATRON_ESPACIOS = re.compile(r'\s+')
+
+# Equivalentes RE2 para los kernels de Arrow, válidos solo para texto ASCII.
+# RE2 no incluye \x0b ni \x1c-\x1f en \s, así que se listan explícitamente
+# los caracteres ASCII que Python considera espacio
+_ESPACIOS_ASCII = r'\t\n\x0b\x0c\r\x1c-\x1f '
+_RE2_URL = rf'(?:http|www)[^{_ESPACIOS_ASCII}]+'
+_RE2_NO_PERMITIDOS_BASICO = rf'[^a-zA-Z{_ESPACIOS_ASCII}.,!?]'
+_RE2_ESPACIOS = rf'[{_ESPACIOS_ASCII}]+'
+
+# Patrones de la limpieza completa (solo letras y espacios)
+PATRON_NO_ALFABETICOS = re.compile(r'[^a-zA-Z\s]')
+
+# Entradas máximas de la caché token -> lema. El vocabulario sigue una
+# distribución de Zipf, así que unas decenas de miles de tokens cubren
+# casi todas las apariciones
+TAMANO_CACHE_LEMAS = 50000
+
+# Lemas nuevos pendientes a partir de los cuales se vuelcan al diccionario
+# (y se pasan a la tabla en memoria) sin esperar a persistir()
+MAX_LEMAS_PENDIENTES = 10000
+
+# Reseñas por tarea en la limpieza completa en paralelo
+CHUNKSIZE_LIMPIEZA = 5000
+
+# Etapas de la caché de limpieza. Subir la versión al cambiar las reglas
+# de limpieza para que no se reutilicen resultados antiguos
+ETAPA_BASICA = 'basica-1'
+ETAPA_COMPLETA = 'completa-1'
+
+
+class DeduplicadorResenas:
+    """
+    Elimina reseñas duplicadas en una sola pasada, bloque a bloque.
+
+    Cada reseña se identifica con un hash de 64 bits de
+    (UserId, ProductId, texto normalizado). Solo se guardan los hashes ya
+    vistos (8 bytes por reseña única, en un array ordenado), de modo que el
+    mismo objeto puede recibir bloques sucesivos de iter_datos. Los hashes
+    nuevos de cada bloque se intercalan en el array sin reordenarlo, así
+    que cada bloque cuesta O(vistos + bloque) y no una ordenación completa.
+    """
 
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+    columnas_clave = ['UserId', 'ProductId', 'Text']
+
+    def __init__(self):
+        """Inicializa el conjunto de huellas vacío."""
+        self.vistos = np.empty(0, dtype=np.uint64)
+        self.filas_entrada = 0
+        self.duplicados = 0
+
+    @staticmethod
+    def normalizar_texto(serie):
+        """Normaliza el texto para la clave: minúsculas y espacios colapsados."""
+        return (
+            serie.fillna('').astype(str).str.lower()
+            .str.replace(r'\s+', ' ', regex=True).str.strip()
+        )
+
+    def huellas(self, df):
+        """Calcula el hash de 64 bits de la clave de cada reseña."""
+        clave = pd.DataFrame({
+            'UserId': df['UserId'].astype(str),
+            'ProductId': df['ProductId'].astype(str),
+            'Text': self.normalizar_texto(df['Text']),
+        })
+        return pd.util.hash_pandas_object(clave, index=False).to_numpy(dtype=np.uint64)
+
+    def filtrar(self, df):
+        """
+        Devuelve el bloque sin las reseñas ya vistas (en este u otros bloques).
+
+        Args:
+            df: Bloque con columnas UserId, ProductId y Text
+
+        Returns:
+            DataFrame con la primera aparición de cada reseña
+        """
+        hashes = self.huellas(df)
+
+        # Duplicados dentro del bloque y respecto a bloques anteriores
+        nuevos = ~pd.Series(hashes).duplicated().to_numpy()
+        if len(self.vistos) > 0:
+            posiciones = np.searchsorted(self.vistos, hashes)
+            posiciones[posiciones == len(self.vistos)] = 0
+            nuevos &= self.vistos[posiciones] != hashes
+
+        # Intercalar los nuevos (ya únicos y ausentes de vistos) en su posición
+        anadir = np.sort(hashes[nuevos])
+        self.vistos = np.insert(self.vistos, np.searchsorted(self.vistos, anadir), anadir)
+        self.filas_entrada += len(df)
+        self.duplicados += int((~nuevos).sum())
+
+        return df[nuevos]
+
+
+def deduplicar_resenas(df, deduplicador=None):
+    """
+    Elimina reseñas duplicadas por (UserId, ProductId, texto normalizado).
 
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet', quiet=True)
+    Args:
+        df: DataFrame (o bloque) con columnas UserId, ProductId y Text
+        deduplicador: DeduplicadorResenas a reutilizar entre bloques (opcional)
+
+    Returns:
+        DataFrame sin duplicados
+    """
+    print("\n--- ELIMINANDO RESEÑAS DUPLICADAS ---")
+
+    if deduplicador is None:
+        deduplicador = DeduplicadorResenas()
+
+    duplicados_antes = deduplicador.duplicados
+    df_unico = deduplicador.filtrar(df)
+    eliminadas = deduplicador.duplicados - duplicados_antes
+
+    print(f"Reseñas duplicadas eliminadas: {eliminadas} de {len(df)} ({eliminadas/max(len(df), 1)*100:.1f}%)")
+
+    return df_unico
 
 
 def calcular_tasa_utilidad(df, umbral=0.7):
@@ -68,39 +202,132 @@ def calcular_tasa_utilidad(df, umbral=0.7):
     return df_filtered
 
 
-def limpiar_texto_basico(df):
+def clean_text_basic(text):
+    """Limpieza básica: lowercase, URLs, caracteres especiales"""
+    # Convertir a minúsculas
+    text = text.lower()
+
+    # Eliminar URLs
+    text = PATRON_URL.sub('', text)
+
+    # Eliminar caracteres especiales pero mantener puntuación básica
+    text = PATRON_NO_PERMITIDOS_BASICO.sub('', text)
+
+    # Eliminar espacios extra
+    text = PATRON_ESPACIOS.sub(' ', text).strip()
+
+    return text
+
+
+def unir_resumen_texto(df):
+    """
+    Une Summary y Text en una sola columna (FullReview) de forma vectorizada.
+
+    Args:
+        df: DataFrame con columnas Summary y Text
+
+    Returns:
+        pd.Series con "Summary Text" (cadena vacía en lugar de nulos)
+    """
+    if pc is None:
+        return df["Summary"].fillna("").astype(str) + " " + df["Text"].fillna("").astype(str)
+
+    resumen = pa.array(df["Summary"].fillna("").astype(str), type=pa.string())
+    texto = pa.array(df["Text"].fillna("").astype(str), type=pa.string())
+    unido = pc.binary_join_element_wise(resumen, texto, " ")
+    return pd.Series(unido.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get).array, index=df.index)
+
+
+def limpiar_columna_basico(serie):
+    """
+    Aplica clean_text_basic a una columna completa de forma vectorizada.
+
+    Con pyarrow, las filas ASCII (la gran mayoría del corpus) se limpian
+    con kernels de cadenas de Arrow sobre la columna entera y solo las
+    filas con caracteres no ASCII pasan por clean_text_basic, porque las
+    reglas de minúsculas y espacios Unicode de Python difieren de las de
+    RE2. El resultado es idéntico al de aplicar clean_text_basic fila a fila.
+
+    Args:
+        serie: pd.Series de textos (sin nulos)
+
+    Returns:
+        pd.Series con el texto limpio y el mismo índice
+    """
+    if pc is None:
+        return (
+            serie.astype(str).str.lower()
+            .str.replace(PATRON_URL, '', regex=True)
+            .str.replace(PATRON_NO_PERMITIDOS_BASICO, '', regex=True)
+            .str.replace(PATRON_ESPACIOS, ' ', regex=True)
+            .str.strip()
+        )
+
+    textos = pa.array(serie.astype(str), type=pa.string())
+    es_ascii = pc.string_is_ascii(textos).to_numpy(zero_copy_only=False)
+
+    limpio = pc.ascii_lower(textos)
+    limpio = pc.replace_substring_regex(limpio, pattern=_RE2_URL, replacement='')
+    limpio = pc.replace_substring_regex(limpio, pattern=_RE2_NO_PERMITIDOS_BASICO, replacement='')
+    limpio = pc.replace_substring_regex(limpio, pattern=_RE2_ESPACIOS, replacement=' ')
+    limpio = pc.utf8_trim(limpio, characters=' ')
+
+    resultado = limpio.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+
+    # Filas con caracteres no ASCII: limpieza exacta con Python
+    no_ascii = np.flatnonzero(~es_ascii)
+    if len(no_ascii) > 0:
+        originales = serie.iloc[no_ascii].astype(str)
+        resultado.iloc[no_ascii] = [clean_text_basic(texto) for texto in originales]
+
+    resultado.index = serie.index
+    return resultado
+
+
+def limpiar_texto_basico(df, vectorizado=True, cache=None, max_caracteres=MAX_CARACTERES_TEXTO):
     """
     Realiza limpieza básica del texto sin remover stopwords ni lematizar.
     Útil para preservar más información para análisis de sentimiento.
 
+    Cada texto distinto se limpia una sola vez por ejecución; con una
+    CacheLimpieza persistente, tampoco se vuelven a limpiar los textos
+    vistos en ejecuciones anteriores.
+
     Args:
         df: DataFrame con columnas Summary y Text
+        vectorizado: Si True, limpia la columna completa con limpiar_columna_basico;
+            si False, aplica clean_text_basic fila a fila (mismo resultado)
+        cache: CacheLimpieza a usar (por defecto, una solo en memoria)
+        max_caracteres: Presupuesto de caracteres por reseña. FullReview se
+            conserva completo; CleanText se calcula solo sobre los primeros
+            max_caracteres (recortando en un espacio)
 
     Returns:
         DataFrame con columna adicional: CleanText
     """
     print("\n--- LIMPIEZA BÁSICA DE TEXTO ---")
 
-    # Unificar texto (Resumen + Texto completo)
-    df["FullReview"] = df["Summary"].fillna("").astype(str) + " " + df["Text"].fillna("").astype(str)
-
-    def clean_text_basic(text):
-        """Limpieza básica: lowercase, URLs, caracteres especiales"""
-        # Convertir a minúsculas
-        text = text.lower()
-
-        # Eliminar URLs
-        text = re.sub(r"http\S+|www\S+|https\S+", '', text, flags=re.MULTILINE)
+    if cache is None:
+        cache = CacheLimpieza(ruta=None)
 
-        # Eliminar caracteres especiales pero mantener puntuación básica
-        text = re.sub(r'[^a-zA-Z\s.,!?]', '', text)
+    if vectorizado:
+        # Unificar texto (Resumen + Texto completo)
+        df["FullReview"] = unir_resumen_texto(df)
+    else:
+        df["FullReview"] = df["Summary"].fillna("").astype(str) + " " + df["Text"].fillna("").astype(str)
 
-        # Eliminar espacios extra
-        text = re.sub(r'\s+', ' ', text).strip()
+    entrada, recortadas = recortar_columna(df["FullReview"], max_caracteres)
+    if recortadas:
+        print(f"⚠️ {recortadas} reseñas superan {max_caracteres} caracteres: se limpia solo el inicio")
 
-        return text
+    if vectorizado:
+        df["CleanText"] = cache.limpiar(entrada, limpiar_columna_basico, ETAPA_BASICA)
+    else:
+        df["CleanText"] = cache.limpiar(
+            entrada, lambda serie: serie.apply(clean_text_basic), ETAPA_BASICA
+        )
 
-    df["CleanText"] = df["FullReview"].apply(clean_text_basic)
+    cache.mostrar()
 
     # Estadísticas
     df['text_length'] = df['CleanText'].str.len()
@@ -110,49 +337,208 @@ def limpiar_texto_basico(df):
     return df
 
 
-def limpiar_texto_completo(text):
+class NormalizadorTexto:
+    """
+    Limpieza completa reutilizable: minúsculas, sin URLs ni símbolos,
+    sin stopwords y lematizada.
+
+    Las stopwords y la tabla token -> lema se leen una sola vez del
+    diccionario persistente (ver diccionario_lemas), así que lematizar un
+    token conocido es una búsqueda en un dict. self.lemas es esa tabla
+    completa más los lemas ya volcados, de modo que ocupa lo que el
+    vocabulario del diccionario (no crece con el número de reseñas). Solo
+    los tokens que no están en la tabla pasan por WordNet, con una caché
+    LRU acotada; esos lemas nuevos quedan pendientes en self.lemas_nuevos
+    hasta llamar a persistir() o hasta reunir max_pendientes, momento en
+    que se vuelcan al diccionario.
+
+    nltk se importa al crear el objeto, no al importar este módulo, y
+    WordNet solo se busca cuando aparece el primer token desconocido.
+    """
+
+    def __init__(self, idioma='english', max_lemas=TAMANO_CACHE_LEMAS, ruta_lemas=LEMAS_PATH,
+                 max_pendientes=MAX_LEMAS_PENDIENTES):
+        """
+        Carga el diccionario de lemas y las stopwords.
+
+        Args:
+            idioma: Idioma de la lista de stopwords
+            max_lemas: Tamaño máximo de la caché LRU de lemas de WordNet
+            ruta_lemas: Archivo SQLite del diccionario (None para no persistir)
+            max_pendientes: Lemas nuevos pendientes que provocan un volcado
+        """
+        self.ruta_lemas = ruta_lemas
+        self.max_pendientes = max_pendientes
+        self.lemas = cargar_lemas(ruta_lemas)
+        self.lemas_nuevos = {}
+
+        from nltk.stem import WordNetLemmatizer
+        from nltk.tokenize import word_tokenize
+
+        stop_words = cargar_stopwords(idioma, ruta_lemas)
+        if stop_words is None:
+            requerir('stopwords')
+            from nltk.corpus import stopwords
+            stop_words = frozenset(stopwords.words(idioma))
+            if ruta_lemas is not None:
+                guardar_stopwords(stop_words, idioma, ruta_lemas)
+        self.stop_words = stop_words
+
+        self.lematizador = WordNetLemmatizer()
+        self._tokenizar = word_tokenize
+        self._lematizar_wordnet = functools.lru_cache(maxsize=max_lemas)(self._lema_wordnet)
+
+    def _lema_wordnet(self, token):
+        """Lematiza con WordNet un token ausente del diccionario."""
+        requerir('wordnet')
+        lema = self.lematizador.lemmatize(token)
+        self.registrar_lemas({token: lema})
+        return lema
+
+    def registrar_lemas(self, lemas):
+        """
+        Añade lemas nuevos pendientes (p.ej. los devueltos por los workers)
+        y los vuelca al diccionario si superan max_pendientes.
+
+        Args:
+            lemas: dict token -> lema
+        """
+        self.lemas_nuevos.update(lemas)
+        if len(self.lemas_nuevos) >= self.max_pendientes:
+            self.persistir()
+
+    def lematizar(self, token):
+        """Devuelve el lema de un token (diccionario y, si falta, WordNet)."""
+        lema = self.lemas.get(token)
+        return lema if lema is not None else self._lematizar_wordnet(token)
+
+    @staticmethod
+    def limpiar(text):
+        """Minúsculas, sin URLs, solo letras y espacios simples."""
+        text = text.lower()
+        text = PATRON_URL.sub('', text)
+        text = PATRON_NO_ALFABETICOS.sub('', text)
+        return PATRON_ESPACIOS.sub(' ', text).strip()
+
+    def normalizar(self, text):
+        """
+        Quita stopwords y lematiza un texto ya limpio (solo letras y espacios).
+
+        Args:
+            text: Texto limpio
+
+        Returns:
+            Lemas separados por espacios
+        """
+        # El texto no tiene puntuación, así que no hace falta segmentarlo
+        # en oraciones con Punkt antes de tokenizar
+        tokens = self._tokenizar(text, preserve_line=True)
+        stop_words = self.stop_words
+        lemas = self.lemas
+        wordnet = self._lematizar_wordnet
+        return " ".join([
+            lemas[w] if w in lemas else wordnet(w)
+            for w in tokens if w and w not in stop_words
+        ])
+
+    def __call__(self, text):
+        """Aplica la limpieza completa a un texto."""
+        return self.normalizar(self.limpiar(text))
+
+    def tomar_lemas_nuevos(self):
+        """
+        Devuelve los lemas calculados con WordNet desde la última llamada y
+        los incorpora al diccionario en memoria.
+
+        Returns:
+            dict: token -> lema
+        """
+        nuevos = self.lemas_nuevos
+        self.lemas.update(nuevos)
+        self.lemas_nuevos = {}
+        return nuevos
+
+    def persistir(self):
+        """
+        Guarda en el diccionario los lemas nuevos pendientes (incluidos los
+        que se hayan añadido con registrar_lemas desde otros procesos).
+
+        Returns:
+            int: Lemas añadidos al diccionario
+        """
+        nuevos = self.tomar_lemas_nuevos()
+        if self.ruta_lemas is None:
+            return 0
+        return guardar_lemas(nuevos, self.ruta_lemas)
+
+    def info_cache(self):
+        """Aciertos, fallos y tamaño de la caché LRU de WordNet."""
+        return self._lematizar_wordnet.cache_info()
+
+
+_normalizador_defecto = None
+
+
+def obtener_normalizador():
+    """Devuelve el NormalizadorTexto compartido del proceso (se crea al primer uso)."""
+    global _normalizador_defecto
+    if _normalizador_defecto is None:
+        _normalizador_defecto = NormalizadorTexto()
+    return _normalizador_defecto
+
+
+def limpiar_texto_completo(text, normalizador=None):
     """
     Limpieza completa de texto: lowercase, stopwords, lematización.
 
     Args:
         text: Texto a limpiar
+        normalizador: NormalizadorTexto a usar (por defecto, el compartido)
 
     Returns:
         Texto limpio
     """
-    # Convertir a minúsculas
-    text = text.lower()
+    if normalizador is None:
+        normalizador = obtener_normalizador()
+    return normalizador(text)
 
-    # Eliminar URLs
-    text = re.sub(r"http\S+|www\S+|https\S+", '', text, flags=re.MULTILINE)
-
-    # Eliminar puntuación y caracteres especiales
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-
-    # Eliminar números
-    text = re.sub(r'\d+', '', text)
 
-    # Eliminar espacios extra
-    text = re.sub(r'\s+', ' ', text).strip()
+def _iniciar_worker_limpieza():
+    """Carga los recursos de NLTK una sola vez al arrancar cada worker."""
+    # Los lemas nuevos se devuelven con cada lote y los vuelca el proceso
+    # principal, así que los workers nunca escriben en el diccionario
+    obtener_normalizador().max_pendientes = float('inf')
 
-    # Remover stopwords
-    stop_words = set(stopwords.words("english"))
-    tokens = nltk.word_tokenize(text)
-    filtered_words = [w for w in tokens if w and w not in stop_words]
 
-    # Lematización
-    lemmatizer = WordNetLemmatizer()
-    lemmas = [lemmatizer.lemmatize(token) for token in filtered_words]
+def _limpiar_lote(textos):
+    """
+    Aplica la limpieza completa a un lote de textos (ejecutado en un worker).
 
-    return " ".join(lemmas)
+    Returns:
+        tuple: (textos limpios, lemas nuevos calculados con WordNet)
+    """
+    normalizador = obtener_normalizador()
+    return [normalizador(texto) for texto in textos], normalizador.tomar_lemas_nuevos()
 
 
-def aplicar_limpieza_completa(df):
+def aplicar_limpieza_completa(df, normalizador=None, n_jobs=1, chunksize=CHUNKSIZE_LIMPIEZA, cache=None):
     """
     Aplica limpieza completa con stopwords y lematización.
 
+    Solo se procesan los textos distintos que no estén ya en la caché.
+    Con n_jobs distinto de 1, esos textos se dividen en lotes de chunksize
+    que se reparten entre procesos; cada worker crea su propio
+    NormalizadorTexto al arrancar y los lotes se devuelven en el orden
+    original. Al terminar, los lemas que no estaban en el diccionario se
+    guardan en él para las siguientes ejecuciones.
+
     Args:
         df: DataFrame con columna CleanText
+        normalizador: NormalizadorTexto del proceso principal (por defecto,
+            el compartido); los workers usan siempre el compartido
+        n_jobs: Número de procesos (1 para secuencial, None para os.cpu_count())
+        chunksize: Reseñas por lote en modo paralelo
+        cache: CacheLimpieza a usar (por defecto, una solo en memoria)
 
     Returns:
         DataFrame con columna adicional: ProcessedText
@@ -160,27 +546,143 @@ def aplicar_limpieza_completa(df):
     print("\n--- LIMPIEZA COMPLETA DE TEXTO ---")
     print("Aplicando stopwords removal y lematización...")
 
-    df["ProcessedText"] = df["CleanText"].apply(limpiar_texto_completo)
+    if cache is None:
+        cache = CacheLimpieza(ruta=None)
+
+    # Se crea antes de lanzar los workers para que, en la primera
+    # ejecución, las stopwords ya estén guardadas en el diccionario
+    if normalizador is None:
+        normalizador = obtener_normalizador()
+    lemas_conocidos = len(normalizador.lemas)
+
+    def limpiar(serie):
+        textos = serie.tolist()
+        if n_jobs == 1:
+            return [normalizador(texto) for texto in textos]
+
+        n_procesos = n_jobs or os.cpu_count()
+        lotes = [textos[i:i + chunksize] for i in range(0, len(textos), chunksize)]
+
+        procesados = []
+        with ProcessPoolExecutor(max_workers=n_procesos, initializer=_iniciar_worker_limpieza) as executor:
+            for lote, lemas in executor.map(_limpiar_lote, lotes):
+                procesados.extend(lote)
+                normalizador.registrar_lemas(lemas)
+
+        print(f"Procesadas {len(textos)} reseñas en {len(lotes)} lotes ({n_procesos} procesos)")
+        return procesados
+
+    df["ProcessedText"] = cache.limpiar(df["CleanText"], limpiar, ETAPA_COMPLETA)
+    normalizador.persistir()
+    # Incluye los volcados intermedios (ver NormalizadorTexto.registrar_lemas)
+    nuevos = len(normalizador.lemas) - lemas_conocidos
+
+    cache.mostrar()
+    if n_jobs == 1:
+        info = normalizador.info_cache()
+        print(f"Caché de lemas (WordNet): {info.hits} aciertos, {info.misses} fallos, {info.currsize} tokens")
+    print(f"Diccionario de lemas: {lemas_conocidos} conocidos, {nuevos} nuevos")
 
     print("✓ Limpieza completa finalizada")
 
     return df
 
 
-def preparar_dataset(df, output_path, limpieza_completa=False):
+def calcular_marca_agua(df):
+    """
+    Calcula la marca de agua (Id y Time máximos) de las reseñas procesadas.
+
+    Args:
+        df: Reseñas cargadas en esta ejecución (antes de filtrar duplicados,
+            para no volver a leer los descartados)
+
+    Returns:
+        dict con 'Id', 'Time' y 'filas'
+    """
+    marca = {'Id': 0, 'Time': 0, 'filas': len(df)}
+    if len(df) > 0:
+        marca['Id'] = int(df['Id'].max())
+        if 'Time' in df.columns:
+            marca['Time'] = int(df['Time'].max())
+    return marca
+
+
+def filtros_incrementales(output_path, filters=None):
+    """
+    Añade a los filtros de lectura la condición Id > marca de agua.
+
+    Args:
+        output_path: Dataset preparado (CSV o directorio particionado)
+        filters: Filtros de lectura existentes
+
+    Returns:
+        list: Filtros para cargar solo las reseñas no procesadas
+    """
+    # almacenamiento necesita pyarrow: se importa solo al usarlo, así el
+    # resto del módulo funciona sin él (ver el try/except de pyarrow)
+    from almacenamiento import leer_marca_agua
+
+    filtros = list(filters or [])
+    marca = leer_marca_agua(output_path)
+    if marca is not None:
+        filtros.append(('Id', '>', marca['Id']))
+    return filtros
+
+
+def preparar_dataset(df, output_path, limpieza_completa=False, incremental=False, marca_agua=None,
+                     offsets=False, tokens=False):
     """
     Prepara el dataset final para entrenamiento.
 
+    En modo incremental solo se añaden las reseñas con Id mayor que la
+    marca de agua del dataset existente y se actualiza la marca; en modo
+    normal el dataset se reescribe y la marca se elimina.
+
     Args:
         df: DataFrame procesado
-        output_path: Ruta para guardar el CSV
+        output_path: Ruta de salida. Si termina en .csv se guarda un CSV; si
+            no, un directorio Parquet particionado por año (ver almacenamiento)
         limpieza_completa: Si True, incluye ProcessedText
+        incremental: Si True, añade al dataset existente en lugar de reescribirlo
+        marca_agua: Marca de las reseñas cargadas en esta ejecución (ver
+            calcular_marca_agua); por defecto se calcula a partir de df
+        offsets: Si True, guarda los límites de oraciones (Punkt) de
+            CleanText (SentenceOffsets) para que la extracción de
+            características no vuelva a segmentar el texto. Solo sirven con
+            el motor de oraciones 'punkt'
+        tokens: Con offsets=True, guarda también TokenOffsets. La extracción
+            por lotes no los usa (tokeniza con Arrow); solo los aprovecha
+            extraer_todas_caracteristicas fila a fila
 
     Returns:
         DataFrame preparado
     """
+    from almacenamiento import guardar_dataset, leer_marca_agua, guardar_marca_agua
+
     print("\n--- PREPARANDO DATASET FINAL ---")
 
+    modo = 'completo'
+    if incremental:
+        if 'Id' not in df.columns:
+            raise ValueError("El modo incremental necesita la columna Id")
+
+        previa = leer_marca_agua(output_path)
+        if previa is not None:
+            modo = 'anadir'
+            nuevas = df['Id'] > previa['Id']
+            if not nuevas.all():
+                print(f"Omitidas {int((~nuevas).sum())} reseñas ya procesadas (Id <= {previa['Id']})")
+                df = df[nuevas]
+
+        if marca_agua is None:
+            marca_agua = calcular_marca_agua(df)
+        if previa is not None:
+            marca_agua = {
+                'Id': max(previa['Id'], marca_agua['Id']),
+                'Time': max(previa['Time'], marca_agua['Time']),
+                'filas': previa['filas'] + marca_agua['filas'],
+            }
+
     # Seleccionar columnas relevantes
     columnas = [
         'ProductId', 'UserId', 'Score', 'Time',
@@ -188,44 +690,85 @@ def preparar_dataset(df, output_path, limpieza_completa=False):
         'HelpfulnessRate', 'IsHelpful',
         'FullReview', 'CleanText'
     ]
+    if 'Id' in df.columns:
+        columnas.insert(0, 'Id')
 
     if limpieza_completa and 'ProcessedText' in df.columns:
         columnas.append('ProcessedText')
 
     df_prepared = df[columnas].copy()
 
+    if offsets:
+        if agregar_offsets is None:
+            raise ImportError("Guardar los offsets de tokens y oraciones requiere pyarrow")
+        df_prepared = agregar_offsets(df_prepared, columna='CleanText', tokens=tokens)
+        extra = bytes_columnas(df_prepared, [COLUMNA_TOKENS, COLUMNA_ORACIONES])
+        base = bytes_columnas(df_prepared, ['CleanText'])
+        print(f"Offsets de {'tokens y oraciones' if tokens else 'oraciones'}: {extra / 1024**2:.1f} MB en memoria "
+              f"(+{extra / max(base, 1) * 100:.0f}% sobre CleanText)")
+
     # Guardar
-    df_prepared.to_csv(output_path, index=False)
-    print(f"✓ Dataset guardado en: {output_path}")
+    guardar_dataset(df_prepared, output_path, modo=modo)
+    guardar_marca_agua(output_path, marca_agua if incremental else None)
+    print(f"✓ Dataset guardado en: {output_path}" + (" (añadido)" if modo == 'anadir' else ""))
     print(f"Dimensiones: {df_prepared.shape[0]} filas × {df_prepared.shape[1]} columnas")
+    if incremental:
+        print(f"Marca de agua: Id {marca_agua['Id']}, Time {marca_agua['Time']} ({marca_agua['filas']} filas leídas en total)")
 
     return df_prepared
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Limpieza y preprocesamiento de reseñas')
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Procesar solo las reseñas con Id posterior a la marca de agua y añadirlas'
+    )
+    args = parser.parse_args()
+
     print("="*60)
     print("PIPELINE DE LIMPIEZA Y PREPROCESAMIENTO")
     print("="*60)
 
-    # 1. Cargar datos
-    df = cargar_datos(DATA_PATH, nrows=50000)  # Cargar subset para pruebas
+    output_path = os.path.join(SCRIPT_DIR, "..", "data", "amazon_reviews_prepared")
+
+    if args.incremental:
+        # 1. Cargar solo las reseñas nuevas (Id > marca de agua) con votos
+        filtros = filtros_incrementales(output_path, FILTRO_VOTOS)
+        df = cargar_datos(DATA_PATH, columns=COLUMNAS_PIPELINE, filters=filtros)
+    else:
+        # 1. Cargar muestra aleatoria (solo columnas usadas y reseñas con votos)
+        df = cargar_muestra(DATA_PATH, n=50000, columns=COLUMNAS_PIPELINE, filters=FILTRO_VOTOS)  # Subset para pruebas
 
     if df is None:
         print("Error al cargar datos. Abortando.")
         sys.exit(1)
 
-    # 2. Calcular tasa de utilidad
+    if len(df) == 0:
+        print("✓ No hay reseñas nuevas que procesar")
+        sys.exit(0)
+
+    marca_agua = calcular_marca_agua(df)
+
+    # 2. Eliminar duplicados y calcular tasa de utilidad
+    df = deduplicar_resenas(df)
     df = calcular_tasa_utilidad(df, umbral=0.7)
 
-    # 3. Limpieza básica de texto
-    df = limpiar_texto_basico(df)
+    # 3. Limpieza básica de texto (con caché persistente en data/cache/)
+    cache = CacheLimpieza(CACHE_LIMPIEZA_PATH)
+    df = limpiar_texto_basico(df, cache=cache)
 
     # 4. (Opcional) Limpieza completa
-    # df = aplicar_limpieza_completa(df)
+    # df = aplicar_limpieza_completa(df, cache=cache)
 
-    # 5. Preparar y guardar dataset
-    output_path = os.path.join(SCRIPT_DIR, "..", "data", "amazon_reviews_prepared.csv")
-    df_prepared = preparar_dataset(df, output_path, limpieza_completa=False)
+    # 5. Preparar y guardar dataset (con las oraciones de CleanText)
+    df_prepared = preparar_dataset(
+        df, output_path, limpieza_completa=False,
+        incremental=args.incremental, marca_agua=marca_agua, offsets=True
+    )
 
     print("\n--- MUESTRA DEL DATASET PREPARADO ---")
     print(df_prepared[['Score', 'HelpfulnessRate', 'IsHelpful', 'CleanText']].head())
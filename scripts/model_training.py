@@ -26,6 +26,9 @@ from plotly.subplots import make_subplots
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(SCRIPT_DIR)
 
+from almacenamiento import cargar_dataset
+from segmentacion import MOTOR_ORACIONES_DEFECTO
+
 # Directorios
 MODEL_DIR = os.path.join(SCRIPT_DIR, "..", "models")
 PLOTS_DIR = os.path.join(SCRIPT_DIR, "..", "plots")
@@ -38,11 +41,19 @@ os.makedirs(PLOTS_DIR, exist_ok=True)
 class ReviewHelpfulnessModel:
     """Modelo para predecir la utilidad de reseñas."""
 
-    def __init__(self):
-        """Inicializa el modelo."""
+    def __init__(self, motor_oraciones=MOTOR_ORACIONES_DEFECTO):
+        """
+        Inicializa el modelo.
+
+        Args:
+            motor_oraciones: Motor de conteo de oraciones con el que se
+                extrajeron las características (se guarda en los metadatos
+                para que la API use el mismo)
+        """
         self.model = None
         self.feature_columns = None
         self.model_metrics = {}
+        self.motor_oraciones = motor_oraciones
 
     def preparar_datos(self, df, target='IsHelpful', test_size=0.2, random_state=42):
         """
@@ -254,6 +265,7 @@ class ReviewHelpfulnessModel:
         metadata = {
             'feature_columns': self.feature_columns,
             'metrics': self.model_metrics,
+            'sentence_engine': self.motor_oraciones,
             'timestamp': timestamp
         }
 
@@ -300,6 +312,7 @@ class ReviewHelpfulnessModel:
                 metadata = json.load(f)
                 instance.feature_columns = metadata.get('feature_columns', [])
                 instance.model_metrics = metadata.get('metrics', {})
+                instance.motor_oraciones = metadata.get('sentence_engine', MOTOR_ORACIONES_DEFECTO)
 
         print(f"✓ Modelo cargado desde: {model_path}")
 
@@ -400,7 +413,11 @@ if __name__ == "__main__":
     print("="*60)
 
     # Cargar datos con características
-    data_path = os.path.join(SCRIPT_DIR, "..", "data", "amazon_reviews_with_features.csv")
+    data_path = os.path.join(SCRIPT_DIR, "..", "data", "amazon_reviews_with_features")
+
+    # Compatibilidad con el CSV monolítico de versiones anteriores
+    if not os.path.exists(data_path) and os.path.exists(data_path + ".csv"):
+        data_path += ".csv"
 
     if not os.path.exists(data_path):
         print(f"Error: No se encuentra {data_path}")
@@ -408,7 +425,7 @@ if __name__ == "__main__":
         sys.exit(1)
 
     print(f"\nCargando datos desde: {data_path}")
-    df = pd.read_csv(data_path)
+    df = cargar_dataset(data_path)
     print(f"✓ {len(df)} reseñas cargadas")
 
     # Crear instancia del modelo
@@ -7,62 +7,147 @@ import pandas as pd
 import numpy as np
 import re
 import nltk
+import pyarrow as pa
+import pyarrow.compute as pc
 from textblob import TextBlob
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
 # Añadir el directorio scripts al path
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(SCRIPT_DIR)
 
-# ================================
-# DESCARGA DE RECURSOS NLTK
-# ================================
+from estadisticas import AcumuladorEstadisticas
+from data_loader import recortar_texto, recortar_columna, MAX_CARACTERES_TEXTO
+from almacenamiento import cargar_dataset, guardar_dataset
+from recursos_nltk import requerir, obtener_punkt
+from segmentacion import (
+    COLUMNA_ORACIONES, TIPO_OFFSETS, MOTOR_ORACIONES_DEFECTO,
+    desde_offsets, contar_oraciones, contar_oraciones_lote
+)
+from lexicos import ContadorLexicos
+from plan_caracteristicas import PlanCaracteristicas, GRUPOS
+
+# Características no léxicas que calcula el extractor por defecto, en el
+# orden de las columnas de extraer_lote. Detrás van las de los léxicos de
+# dominio (ver lexicos.json); las de sentimiento solo se calculan si se
+# piden (ver plan_caracteristicas)
+COLUMNAS_BASICAS = [
+    'char_count', 'word_count', 'avg_word_length', 'sentence_count', 'words_per_sentence',
+    'exclamation_count', 'question_count', 'uppercase_word_count', 'lexical_diversity',
+    'digit_ratio',
+]
+
+# Características básicas que son conteos (se guardan como int64, igual
+# que todas las léxicas)
+COLUMNAS_ENTERAS = [
+    'char_count', 'word_count', 'sentence_count', 'exclamation_count', 'question_count',
+    'uppercase_word_count',
+]
+
+# Reseñas por lote en procesar_dataset
+TAMANO_LOTE_CARACTERISTICAS = 10000
+
+# Grupos sin versión por columnas: en extraer_lote se calculan texto a texto
+GRUPOS_POR_FILA = ('vader', 'textblob')
 
-# VADER lexicon
-try:
-    nltk.data.find('sentiment/vader_lexicon.zip')
-except LookupError:
-    nltk.download('vader_lexicon', quiet=True)
 
-# Punkt tokenizer
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+class NLPFeatureExtractor:
+    """Extrae características NLP de reseñas de texto."""
 
-# 🔥 FIX CRÍTICO: Descargar punkt_tab (nuevo requerimiento de nltk)
-try:
-    nltk.data.find("tokenizers/punkt_tab")
-except LookupError:
-    nltk.download("punkt_tab", quiet=True)
+    def __init__(self, max_caracteres=MAX_CARACTERES_TEXTO, lexicos=None,
+                 motor_oraciones=MOTOR_ORACIONES_DEFECTO, columnas=None):
+        """
+        Inicializa el extractor con los modelos necesarios.
+
+        Solo se calculan las características de columnas (y aquellas de las
+        que dependen) según un PlanCaracteristicas; los recursos de NLTK
+        que necesita el plan se comprueban aquí (no al importar el módulo)
+        y, si falta alguno, se lanza RecursoNLTKNoDisponible sin descargar
+        nada. VADER se carga la primera vez que se usa.
+
+        Args:
+            max_caracteres: Presupuesto de caracteres por texto (ver
+                extraer_todas_caracteristicas)
+            lexicos: Léxicos de dominio (None para los de lexicos.json)
+            motor_oraciones: 'punkt' (nltk.sent_tokenize) o 'regex'
+                (segmentacion.contar_oraciones, mucho más rápido). Debe ser
+                el mismo con el que se entrenó el modelo
+            columnas: Características a calcular, p.ej. las feature_columns
+                del modelo (None para COLUMNAS_BASICAS y las de los léxicos)
+        """
+        self.lexicos = ContadorLexicos(lexicos)
+        if columnas is None:
+            columnas = COLUMNAS_BASICAS + self.lexicos.caracteristicas
+        self.plan = PlanCaracteristicas(
+            columnas, motor_oraciones=motor_oraciones, caracteristicas_dominio=self.lexicos.caracteristicas
+        )
+        self.motor_oraciones = motor_oraciones
 
+        requerir(*self.plan.recursos)
+        self._vader = None
+        self.max_caracteres = max_caracteres
 
-class NLPFeatureExtractor:
-    """Extrae características NLP de reseñas de texto."""
+        # Segmentar en oraciones es lo más caro del grupo 'longitud'
+        self.contar_oraciones = 'sentence_count' in self.plan.necesarias
 
-    def __init__(self):
-        """Inicializa el extractor con los modelos necesarios."""
-        self.vader = SentimentIntensityAnalyzer()
+        # Columnas de extraer_lote
+        self.columnas = self.plan.columnas
+        self.columnas_enteras = [
+            col for col in self.columnas if col in COLUMNAS_ENTERAS or col in self.lexicos.caracteristicas
+        ]
 
-    def extraer_longitud_texto(self, text):
-        """Calcula métricas de longitud del texto."""
+    @property
+    def vader(self):
+        """Analizador VADER (se crea la primera vez que se usa)."""
+        if self._vader is None:
+            requerir('vader_lexicon')
+            self._vader = SentimentIntensityAnalyzer()
+        return self._vader
+
+    def excede_presupuesto(self, text):
+        """Indica si el texto se recortará antes de extraer características."""
+        return len(text) > self.max_caracteres
+
+    def extraer_longitud_texto(self, text, offsets_tokens=None, offsets_oraciones=None):
+        """
+        Calcula métricas de longitud del texto.
+
+        Si se pasan los límites de tokens u oraciones guardados por
+        preparar_dataset (ver segmentacion), se usan en lugar de volver a
+        segmentar el texto. Los de oraciones vienen de Punkt, así que con
+        el motor 'regex' se ignoran. sentence_count y words_per_sentence
+        solo se calculan si el plan necesita sentence_count.
+        """
         features = {}
 
         # Longitud en caracteres
         features['char_count'] = len(text)
 
-        # Longitud en palabras
-        words = text.split()
-        features['word_count'] = len(words)
-
-        # Longitud promedio de palabras
-        features['avg_word_length'] = np.mean([len(w) for w in words]) if words else 0
-
-        # Número de oraciones
-        sentences = nltk.sent_tokenize(text)
-        features['sentence_count'] = len(sentences)
+        # Longitud en palabras y longitud promedio de palabras
+        if offsets_tokens is not None:
+            inicios, fines = desde_offsets(offsets_tokens)
+            features['word_count'] = len(inicios)
+            features['avg_word_length'] = np.mean(fines - inicios) if len(inicios) else 0
+        else:
+            words = text.split()
+            features['word_count'] = len(words)
+            features['avg_word_length'] = np.mean([len(w) for w in words]) if words else 0
+
+        # Número de oraciones (solo si el plan lo necesita)
+        if not self.contar_oraciones:
+            return features
+        if self.motor_oraciones == 'regex':
+            features['sentence_count'] = contar_oraciones(text)
+        elif offsets_oraciones is not None:
+            features['sentence_count'] = len(offsets_oraciones) // 2
+        else:
+            sentences = nltk.sent_tokenize(text)
+            features['sentence_count'] = len(sentences)
 
         # Palabras por oración
         features['words_per_sentence'] = (
@@ -113,58 +198,12 @@ class NLPFeatureExtractor:
                 'textblob_subjectivity': 0.0
             }
 
-    def extraer_especificidad_alimentos(self, text):
-        """Detecta vocabulario específico de alimentos."""
-        text_lower = text.lower()
-
-        taste_words = ['sweet', 'salty', 'bitter', 'sour', 'umami', 'flavor', 'taste', 'spicy', 'bland']
-        texture_words = ['crunchy', 'soft', 'chewy', 'tender', 'crispy', 'smooth', 'creamy', 'hard']
-        quality_words = ['fresh', 'stale', 'rancid', 'expired', 'organic', 'natural', 'premium']
-
-        taste_count = sum(text_lower.count(word) for word in taste_words)
-        texture_count = sum(text_lower.count(word) for word in texture_words)
-        quality_count = sum(text_lower.count(word) for word in quality_words)
-
-        return {
-            'specificity_score': taste_count + texture_count + quality_count
-        }
-
-    def extraer_comparaciones(self, text):
-        """Detecta si la reseña hace comparaciones."""
-        text_lower = text.lower()
-        comparison_words = ['than', 'better', 'worse', 'compared', 'versus', 'vs', 'instead', 'alternative', 'similar']
-        comparison_count = sum(text_lower.count(word) for word in comparison_words)
-        return {
-            'has_comparison': 1 if comparison_count > 0 else 0
-        }
-
-    def extraer_experiencia_personal(self, text):
-        """Detecta indicadores de experiencia personal."""
-        text_lower = text.lower()
-
-        personal_pronouns = ['i ', 'my ', 'me ', 'we ', 'our ', "i've", "i'll"]
-        time_indicators = ['days', 'weeks', 'months', 'years', 'always', 'daily', 'every', 'usually']
-
-        personal_count = sum(text_lower.count(word) for word in personal_pronouns)
-        time_count = sum(text_lower.count(word) for word in time_indicators)
-
-        return {
-            'personal_experience_score': personal_count + time_count
-        }
-
-    def extraer_menciones_precio(self, text):
-        """Detecta menciones de precio."""
-        text_lower = text.lower()
-
-        price_words = [
-            'price', 'cost', 'expensive', 'cheap',
-            'worth', 'value', 'money', 'overpriced', 'affordable'
-        ]
-        price_count = sum(text_lower.count(word) for word in price_words)
-
-        return {
-            'price_mention': 1 if price_count > 0 else 0
-        }
+    def extraer_caracteristicas_lexicas_dominio(self, text):
+        """
+        Cuenta los léxicos de dominio (alimentos, comparaciones, experiencia,
+        precio) en una sola pasada; devuelve todas sus características a la vez.
+        """
+        return self.lexicos.contar(text)
 
     def extraer_caracteristicas_adicionales(self, text, score=None):
         """Extrae características adicionales útiles."""
@@ -172,39 +211,334 @@ class NLPFeatureExtractor:
             'digit_ratio': sum(c.isdigit() for c in text) / len(text) if text else 0
         }
 
-    def extraer_todas_caracteristicas(self, text, score=None):
-        """Extrae todas las características NLP del texto."""
+    def extraer_todas_caracteristicas(self, text, score=None, offsets_tokens=None, offsets_oraciones=None):
+        """
+        Extrae todas las características NLP del texto (con offsets opcionales, ver extraer_longitud_texto).
+
+        Solo se ejecutan los extractores de los grupos del plan; se devuelven
+        todas las características que calculan (al menos self.columnas).
+
+        El coste está acotado por self.max_caracteres: un texto más largo se
+        recorta con recortar_texto y todas las características se calculan
+        sobre ese inicio, salvo char_count, que siempre es la longitud del
+        texto completo. Los conteos (palabras, oraciones, exclamaciones...)
+        quedan por tanto acotados y las proporciones (avg_word_length,
+        lexical_diversity, digit_ratio...) son estimaciones sobre el inicio.
+        """
         features = {}
 
-        features.update(self.extraer_longitud_texto(text))
-        features.update(self.extraer_caracteristicas_lexicas(text))
-        features.update(self.extraer_caracteristicas_adicionales(text, score))
-        features.update(self.extraer_especificidad_alimentos(text))
-        features.update(self.extraer_comparaciones(text))
-        features.update(self.extraer_experiencia_personal(text))
-        features.update(self.extraer_menciones_precio(text))
+        texto_completo = text
+        text, recortado = recortar_texto(text, self.max_caracteres)
+        if recortado:
+            # Los offsets describen el texto completo
+            offsets_tokens = offsets_oraciones = None
+
+        # Solo los extractores del plan, de más barato a más caro
+        argumentos = {'longitud': (offsets_tokens, offsets_oraciones), 'adicionales': (score,)}
+        for grupo, metodo in zip(self.plan.grupos, self.plan.metodos()):
+            features.update(getattr(self, metodo)(text, *argumentos.get(grupo, ())))
+        if 'char_count' in features:
+            features['char_count'] = len(texto_completo)
 
         return features
 
+    def extraer_lote(self, texts, offsets_oraciones=None):
+        """
+        Extrae las características de self.columnas de un lote de textos.
+
+        Equivale a llamar a extraer_todas_caracteristicas por texto (mismos
+        valores y mismo presupuesto de caracteres), pero calcula cada
+        característica sobre columnas completas con kernels de Arrow y NumPy.
+        Los textos con caracteres no ASCII, cuyas reglas de minúsculas,
+        espacios y dígitos difieren entre Python y Arrow, pasan por
+        extraer_todas_caracteristicas. Con el motor 'punkt', el número de
+        oraciones sale de offsets_oraciones cuando se da y, si no, de Punkt
+        texto a texto; con 'regex' se cuenta también por columnas. Solo se
+        calculan los grupos del plan; los de sentimiento, texto a texto.
+
+        Es unas 4-5 veces más rápido que fila a fila (ver README); el coste
+        restante son varias pasadas completas de Arrow y de los léxicos
+        sobre el lote, y Punkt texto a texto si no hay offsets.
+
+        Args:
+            texts: Secuencia de textos (list, np.ndarray o pd.Series)
+            offsets_oraciones: SentenceOffsets de los textos (opcional, ver
+                segmentacion)
+
+        Returns:
+            np.ndarray float64 de forma (len(texts), len(self.columnas))
+        """
+        serie = pd.Series(texts, dtype=object).astype(str).reset_index(drop=True)
+        resultado = np.zeros((len(serie), len(self.columnas)), dtype=np.float64)
+        if len(serie) == 0:
+            return resultado
+
+        longitudes = serie.str.len().to_numpy(dtype=np.int64)
+        recortada, _ = recortar_columna(serie, self.max_caracteres)
+        textos = pa.array(recortada, type=pa.string())
+
+        # Oraciones ya segmentadas (-1: sin offsets o texto recortado)
+        oraciones_guardadas = np.full(len(serie), -1, dtype=np.int64)
+        if offsets_oraciones is not None and self.motor_oraciones == 'punkt' and self.contar_oraciones:
+            valores = pa.array(offsets_oraciones, type=TIPO_OFFSETS)
+            oraciones_guardadas = (
+                pc.list_value_length(valores).fill_null(-2).to_numpy().astype(np.int64) // 2
+            )
+            oraciones_guardadas[longitudes > self.max_caracteres] = -1
+
+        es_ascii = pc.string_is_ascii(textos).to_numpy(zero_copy_only=False)
+
+        # Textos no ASCII: extracción exacta con Python
+        for fila in np.flatnonzero(~es_ascii):
+            features = self.extraer_todas_caracteristicas(serie.iloc[fila])
+            resultado[fila] = [features[col] for col in self.columnas]
+
+        filas = np.flatnonzero(es_ascii)
+        if len(filas) == 0:
+            return resultado
+
+        textos = textos.filter(pa.array(es_ascii))
+        columnas = self._caracteristicas_ascii(textos, oraciones_guardadas[filas])
+        if self.plan.incluye('longitud'):
+            columnas['char_count'] = longitudes[filas]
+        if self.plan.incluye('dominio'):
+            columnas.update(zip(self.lexicos.caracteristicas, self.lexicos.contar_lote(textos.to_pylist()).T))
+
+        # Sentimiento: texto a texto
+        grupos_fila = [grupo for grupo in GRUPOS_POR_FILA if self.plan.incluye(grupo)]
+        if grupos_fila:
+            por_texto = [{} for _ in range(len(filas))]
+            for grupo in grupos_fila:
+                metodo = getattr(self, GRUPOS[grupo]['metodo'])
+                for features, texto in zip(por_texto, textos.to_pylist()):
+                    features.update(metodo(texto))
+            columnas.update({col: [features[col] for features in por_texto] for col in por_texto[0]})
+
+        for j, col in enumerate(self.columnas):
+            resultado[filas, j] = columnas[col]
+
+        return resultado
+
+    def _caracteristicas_ascii(self, textos, oraciones_guardadas):
+        """
+        Calcula columnarmente las características de textos ASCII de los
+        grupos 'longitud', 'lexicas' y 'adicionales' incluidos en el plan.
+
+        Args:
+            textos: pa.StringArray de textos ASCII (ya recortados)
+            oraciones_guardadas: Oraciones por texto (-1 para contarlas aquí)
+
+        Returns:
+            dict: nombre -> np.ndarray (las de esos grupos salvo char_count)
+        """
+        n = len(textos)
+        features = {}
 
-def procesar_dataset(df, text_column='CleanText', score_column='Score'):
-    """Procesa todo el dataset y extrae características NLP."""
-    print("\n--- EXTRAYENDO CARACTERÍSTICAS NLP ---")
-    print(f"Procesando {len(df)} reseñas...")
+        longitud = self.plan.incluye('longitud')
+        lexicas = self.plan.incluye('lexicas')
+
+        if longitud or lexicas:
+            # Tokens de str.split(): Arrow no incluye \x1c-\x1f en sus espacios ASCII
+            separados = pc.ascii_split_whitespace(
+                pc.replace_substring_regex(textos, pattern=r'[\x1c-\x1f]', replacement=' ')
+            )
+            partes = separados.flatten()
+            fila_parte = np.repeat(np.arange(n), np.diff(separados.offsets.to_numpy()))
+            longitud_parte = pc.binary_length(partes).to_numpy().astype(np.int64)
+
+            # ascii_split_whitespace deja partes vacías en los extremos
+            validas = longitud_parte > 0
+            fila_token = fila_parte[validas]
+            longitud_token = longitud_parte[validas]
+            tokens = partes.filter(pa.array(validas))
+
+            word_count = np.bincount(fila_token, minlength=n)
+            con_palabras = word_count > 0
+
+        if longitud:
+            letras = np.bincount(fila_token, weights=longitud_token, minlength=n)
+            features['word_count'] = word_count
+            features['avg_word_length'] = np.divide(
+                letras, word_count, out=np.zeros(n), where=con_palabras
+            )
+
+        if self.contar_oraciones:
+            # Oraciones: motor 'regex', offsets guardados o Punkt
+            sentence_count = oraciones_guardadas.copy()
+            pendientes = np.flatnonzero(sentence_count < 0)
+            if self.motor_oraciones == 'regex':
+                sentence_count = contar_oraciones_lote(textos)
+            elif len(pendientes) > 0:
+                punkt = obtener_punkt()
+                sentence_count[pendientes] = [
+                    len(punkt.tokenize(texto))
+                    for texto in textos.take(pa.array(pendientes)).to_pylist()
+                ]
+            features['sentence_count'] = sentence_count
+            features['words_per_sentence'] = np.divide(
+                word_count, sentence_count, out=np.zeros(n), where=sentence_count > 0
+            )
+
+        if lexicas:
+            features['exclamation_count'] = pc.count_substring(textos, '!').to_numpy()
+            features['question_count'] = pc.count_substring(textos, '?').to_numpy()
+
+            mayusculas = pc.and_(pc.ascii_is_upper(tokens), pa.array(longitud_token > 1))
+            features['uppercase_word_count'] = np.bincount(
+                fila_token, weights=mayusculas.to_numpy(zero_copy_only=False), minlength=n
+            )
+
+            # Tokens distintos por texto: pares (texto, código del token) únicos
+            codigos = pc.dictionary_encode(tokens)
+            n_codigos = max(len(codigos.dictionary), 1)
+            pares = pd.unique(fila_token.astype(np.int64) * n_codigos + codigos.indices.to_numpy())
+            unicos = np.bincount(pares // n_codigos, minlength=n)
+            features['lexical_diversity'] = np.divide(
+                unicos, word_count, out=np.zeros(n), where=con_palabras
+            )
+
+        if self.plan.incluye('adicionales'):
+            caracteres = pc.binary_length(textos).to_numpy()
+            digitos = pc.count_substring_regex(textos, pattern='[0-9]').to_numpy()
+            features['digit_ratio'] = np.divide(
+                digitos, caracteres, out=np.zeros(n), where=caracteres > 0
+            )
 
-    extractor = NLPFeatureExtractor()
-    features_list = []
+        return features
 
-    for idx, row in df.iterrows():
-        text = str(row[text_column])
-        score = row[score_column] if score_column in df.columns else None
-        features = extractor.extraer_todas_caracteristicas(text, score)
-        features_list.append(features)
 
-        if (idx + 1) % 1000 == 0:
-            print(f"  Procesadas {idx + 1} reseñas...")
+# Estado de cada worker de procesar_dataset (se crea en _iniciar_worker_caracteristicas)
+_extractor_worker = None
+_memoria_worker = None
+_matriz_worker = None
+
+
+def _iniciar_worker_caracteristicas(nombre_memoria, forma, max_caracteres, motor_oraciones, columnas):
+    """Crea el extractor del worker y abre la matriz compartida una sola vez."""
+    global _extractor_worker, _memoria_worker, _matriz_worker
+    _extractor_worker = NLPFeatureExtractor(
+        max_caracteres=max_caracteres, motor_oraciones=motor_oraciones, columnas=columnas
+    )
+    _memoria_worker = shared_memory.SharedMemory(name=nombre_memoria)
+    _matriz_worker = np.ndarray(forma, dtype=np.float32, buffer=_memoria_worker.buf)
+
+
+def _extraer_lote_compartido(inicio, textos, offsets_oraciones):
+    """
+    Extrae las características de un lote y las escribe en la matriz
+    compartida a partir de la fila inicio (ejecutado en un worker).
+
+    Returns:
+        tuple: (pid del worker, reseñas procesadas, segundos)
+    """
+    t0 = time.perf_counter()
+    lote = _extractor_worker.extraer_lote(textos, offsets_oraciones=offsets_oraciones)
+    _matriz_worker[inicio:inicio + len(lote)] = lote
+    return os.getpid(), len(lote), time.perf_counter() - t0
+
+
+def _extraer_en_paralelo(textos, oraciones, extractor, tamano_lote, n_procesos):
+    """
+    Reparte los lotes entre procesos que escriben en una matriz float32 en
+    memoria compartida; al padre solo vuelve el tiempo de cada lote.
+
+    Returns:
+        np.ndarray float32 de forma (len(textos), len(extractor.columnas))
+    """
+    forma = (len(textos), len(extractor.columnas))
+    memoria = shared_memory.SharedMemory(create=True, size=max(int(np.prod(forma)) * 4, 1))
+    try:
+        inicios = range(0, len(textos), tamano_lote)
+        lotes = [textos.iloc[i:i + tamano_lote] for i in inicios]
+        offsets = [
+            oraciones.iloc[i:i + tamano_lote] if oraciones is not None else None for i in inicios
+        ]
 
-    features_df = pd.DataFrame(features_list)
+        por_worker = {}
+        procesadas = 0
+        argumentos = (memoria.name, forma, extractor.max_caracteres, extractor.motor_oraciones,
+                      extractor.columnas)
+        with ProcessPoolExecutor(max_workers=n_procesos, initializer=_iniciar_worker_caracteristicas,
+                                 initargs=argumentos) as executor:
+            for pid, filas, segundos in executor.map(_extraer_lote_compartido, inicios, lotes, offsets):
+                acumulado = por_worker.setdefault(pid, [0, 0.0])
+                acumulado[0] += filas
+                acumulado[1] += segundos
+                procesadas += filas
+                print(f"  Procesadas {procesadas} reseñas...")
+
+        print(f"Procesadas {len(textos)} reseñas en {len(lotes)} lotes ({n_procesos} procesos)")
+        for pid, (filas, segundos) in sorted(por_worker.items()):
+            print(f"  Worker {pid}: {filas} reseñas en {segundos:.1f}s "
+                  f"({filas / segundos if segundos > 0 else 0:,.0f} reseñas/s)")
+
+        return np.ndarray(forma, dtype=np.float32, buffer=memoria.buf).copy()
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def procesar_dataset(df, text_column='CleanText', score_column='Score',
+                     tamano_lote=TAMANO_LOTE_CARACTERISTICAS, motor_oraciones=MOTOR_ORACIONES_DEFECTO,
+                     n_jobs=1, columnas=None):
+    """
+    Procesa todo el dataset y extrae características NLP.
+
+    Las características se calculan por lotes con extraer_lote, columna a
+    columna. Con el motor 'punkt', si el dataset preparado trae
+    SentenceOffsets, el número de oraciones se lee de ahí en lugar de
+    volver a segmentar.
+
+    Con n_jobs distinto de 1, los lotes se reparten entre procesos; cada
+    worker crea su propio NLPFeatureExtractor al arrancar y escribe sus
+    filas directamente en una matriz float32 en memoria compartida. Los
+    conteos coinciden con los de la ejecución secuencial; las proporciones
+    (avg_word_length, lexical_diversity...) quedan con precisión float32.
+
+    Args:
+        n_jobs: Número de procesos (1 para secuencial, None para os.cpu_count())
+        columnas: Características a calcular (None para las de siempre, ver
+            NLPFeatureExtractor); solo se ejecutan los extractores que necesitan
+    """
+    print("\n--- EXTRAYENDO CARACTERÍSTICAS NLP ---")
+    print(f"Procesando {len(df)} reseñas (oraciones: {motor_oraciones})...")
+
+    extractor = NLPFeatureExtractor(motor_oraciones=motor_oraciones, columnas=columnas)
+    print(f"Plan: {extractor.plan.resumen()}")
+
+    # Los offsets guardados por preparar_dataset describen CleanText; en un
+    # CSV llegan como texto y no se pueden reutilizar
+    usar_oraciones = (
+        motor_oraciones == 'punkt' and extractor.contar_oraciones
+        and text_column == 'CleanText' and COLUMNA_ORACIONES in df.columns
+        and len(df) > 0 and not isinstance(df[COLUMNA_ORACIONES].iloc[0], str)
+    )
+    if usar_oraciones:
+        print("Reutilizando la segmentación de oraciones guardada en el dataset preparado")
+
+    textos = df[text_column].astype(str)
+
+    recortados = int((textos.str.len() > extractor.max_caracteres).sum())
+    if recortados:
+        print(f"⚠️ {recortados} textos superan {extractor.max_caracteres} caracteres: "
+              "sus características se calculan sobre el inicio")
+
+    oraciones = df[COLUMNA_ORACIONES] if usar_oraciones else None
+    if n_jobs == 1:
+        matriz = np.empty((len(df), len(extractor.columnas)), dtype=np.float64)
+        for inicio in range(0, len(df), tamano_lote):
+            fin = min(inicio + tamano_lote, len(df))
+            matriz[inicio:fin] = extractor.extraer_lote(
+                textos.iloc[inicio:fin],
+                offsets_oraciones=oraciones.iloc[inicio:fin] if usar_oraciones else None
+            )
+            print(f"  Procesadas {fin} reseñas...")
+    else:
+        matriz = _extraer_en_paralelo(textos, oraciones, extractor, tamano_lote, n_jobs or os.cpu_count())
+
+    # Mismo esquema en ambos modos: conteos int64 y el resto float64
+    features_df = pd.DataFrame(matriz, columns=extractor.columnas).astype('float64')
+    features_df = features_df.astype({col: 'int64' for col in extractor.columnas_enteras})
     df_con_features = pd.concat([df.reset_index(drop=True), features_df], axis=1)
 
     print(f"✓ Extracción completada. {len(features_df.columns)} características añadidas")
@@ -229,14 +563,24 @@ def obtener_estadisticas_features(df):
             print(f"  Std: {df[col].std():.3f}")
 
 
-def analizar_correlaciones(df, target='IsHelpful'):
-    """Analiza correlaciones entre características y la utilidad."""
+def analizar_correlaciones(df, target='IsHelpful', chunksize=50000):
+    """
+    Analiza correlaciones entre características y la utilidad.
+
+    Las correlaciones se obtienen de los co-momentos acumulados por
+    bloques (AcumuladorEstadisticas), sin copiar la matriz numérica
+    completa. Las filas con algún nulo en las columnas numéricas se omiten.
+    """
     print(f"\n--- CORRELACIONES CON {target} ---")
 
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    numeric_cols = list(df.select_dtypes(include=[np.number]).columns)
 
-    if target in df.columns:
-        correlations = df[numeric_cols].corrwith(df[target]).sort_values(ascending=False)
+    if target in numeric_cols:
+        acumulador = AcumuladorEstadisticas(columnas_numericas=numeric_cols, columnas_distintas=())
+        for inicio in range(0, len(df), chunksize):
+            acumulador.actualizar(df.iloc[inicio:inicio + chunksize][numeric_cols])
+
+        correlations = acumulador.correlaciones(target).sort_values(ascending=False)
 
         print("\nTop 10 características más correlacionadas:")
         print(correlations.head(10))
@@ -254,7 +598,11 @@ if __name__ == "__main__":
     print("EXTRACCIÓN DE CARACTERÍSTICAS NLP")
     print("="*60)
 
-    data_path = os.path.join(SCRIPT_DIR, "..", "data", "amazon_reviews_prepared.csv")
+    data_path = os.path.join(SCRIPT_DIR, "..", "data", "amazon_reviews_prepared")
+
+    # Compatibilidad con el CSV monolítico de versiones anteriores
+    if not os.path.exists(data_path) and os.path.exists(data_path + ".csv"):
+        data_path += ".csv"
 
     if not os.path.exists(data_path):
         print(f"Error: No se encuentra {data_path}")
@@ -262,7 +610,7 @@ if __name__ == "__main__":
         sys.exit(1)
 
     print(f"\nCargando datos desde: {data_path}")
-    df = pd.read_csv(data_path)
+    df = cargar_dataset(data_path)
     print(f"✓ {len(df)} reseñas cargadas")
 
     df_con_features = procesar_dataset(df, text_column='CleanText', score_column='Score')
@@ -272,8 +620,8 @@ if __name__ == "__main__":
     if 'IsHelpful' in df_con_features.columns:
         correlaciones = analizar_correlaciones(df_con_features, target='IsHelpful')
 
-    output_path = os.path.join(SCRIPT_DIR, "..", "data", "amazon_reviews_with_features.csv")
-    df_con_features.to_csv(output_path, index=False)
+    output_path = os.path.join(SCRIPT_DIR, "..", "data", "amazon_reviews_with_features")
+    guardar_dataset(df_con_features, output_path)
     print(f"\n✓ Dataset con características guardado en: {output_path}")
 
     print("\n--- MUESTRA DE CARACTERÍSTICAS ---")
@@ -0,0 +1,148 @@
+"""
+Plan de Características - Amazon Reviews
+Decide qué extractores de NLPFeatureExtractor hay que ejecutar para obtener
+un conjunto de características (normalmente, las feature_columns de los
+metadatos del modelo) y qué recursos de NLTK necesitan.
+
+Cada característica declara su grupo (el método del extractor que la
+calcula) y las características de las que depende; cada grupo declara sus
+recursos y un coste relativo por texto. El plan resuelve las dependencias,
+ejecuta solo los grupos necesarios (de más barato a más caro) y no carga
+analizadores que no se usen (p.ej. VADER si el modelo no usa sentimiento).
+"""
+
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(SCRIPT_DIR)
+
+from lexicos import cargar_lexicos
+from recursos_nltk import recurso_punkt
+from segmentacion import MOTORES_ORACIONES, MOTOR_ORACIONES_DEFECTO
+
+# Grupo -> método del extractor, recursos de NLTK y coste relativo por
+# texto (1: una pasada sobre el texto)
+GRUPOS = {
+    'longitud': {'metodo': 'extraer_longitud_texto', 'recursos': [], 'coste': 2},
+    'lexicas': {'metodo': 'extraer_caracteristicas_lexicas', 'recursos': [], 'coste': 2},
+    'adicionales': {'metodo': 'extraer_caracteristicas_adicionales', 'recursos': [], 'coste': 1},
+    'dominio': {'metodo': 'extraer_caracteristicas_lexicas_dominio', 'recursos': [], 'coste': 1},
+    'vader': {'metodo': 'extraer_sentimiento_vader', 'recursos': ['vader_lexicon'], 'coste': 20},
+    'textblob': {'metodo': 'extraer_sentimiento_textblob', 'recursos': [], 'coste': 30},
+}
+
+# Coste añadido al grupo 'longitud' cuando las oraciones se cuentan con Punkt
+COSTE_PUNKT = 8
+
+# Característica -> grupo y características de las que depende. Las del
+# grupo 'dominio' salen de los léxicos (ver lexicos.json)
+CARACTERISTICAS = {
+    'char_count': {'grupo': 'longitud', 'depende': []},
+    'word_count': {'grupo': 'longitud', 'depende': []},
+    'avg_word_length': {'grupo': 'longitud', 'depende': ['word_count']},
+    'sentence_count': {'grupo': 'longitud', 'depende': []},
+    'words_per_sentence': {'grupo': 'longitud', 'depende': ['word_count', 'sentence_count']},
+    'exclamation_count': {'grupo': 'lexicas', 'depende': []},
+    'question_count': {'grupo': 'lexicas', 'depende': []},
+    'uppercase_word_count': {'grupo': 'lexicas', 'depende': []},
+    'lexical_diversity': {'grupo': 'lexicas', 'depende': []},
+    'digit_ratio': {'grupo': 'adicionales', 'depende': []},
+    'vader_neg': {'grupo': 'vader', 'depende': []},
+    'vader_neu': {'grupo': 'vader', 'depende': []},
+    'vader_pos': {'grupo': 'vader', 'depende': []},
+    'vader_compound': {'grupo': 'vader', 'depende': []},
+    'textblob_polarity': {'grupo': 'textblob', 'depende': []},
+    'textblob_subjectivity': {'grupo': 'textblob', 'depende': []},
+}
+
+
+def catalogo(caracteristicas_dominio=None):
+    """
+    Catálogo completo de características, ordenado por grupo (en el orden
+    de GRUPOS) y, dentro de cada grupo, en el orden de declaración.
+
+    Args:
+        caracteristicas_dominio: Características de los léxicos (None para
+            las de lexicos.json)
+
+    Returns:
+        dict: característica -> {'grupo': ..., 'depende': [...]}
+    """
+    if caracteristicas_dominio is None:
+        caracteristicas_dominio = list(cargar_lexicos())
+
+    especificaciones = {**CARACTERISTICAS,
+                        **{nombre: {'grupo': 'dominio', 'depende': []} for nombre in caracteristicas_dominio}}
+    orden = list(GRUPOS)
+    return dict(sorted(especificaciones.items(), key=lambda item: orden.index(item[1]['grupo'])))
+
+
+class PlanCaracteristicas:
+    """Características pedidas, grupos a ejecutar y recursos que necesitan."""
+
+    def __init__(self, columnas, motor_oraciones=MOTOR_ORACIONES_DEFECTO, caracteristicas_dominio=None):
+        """
+        Args:
+            columnas: Características pedidas (p.ej. feature_columns del modelo)
+            motor_oraciones: 'punkt' o 'regex' (ver segmentacion)
+            caracteristicas_dominio: Características de los léxicos (None
+                para las de lexicos.json)
+
+        Las columnas que no son características de texto (p.ej. review_score
+        en modelos antiguos) no se calculan: se avisa y quedan en
+        self.faltantes.
+
+        Raises:
+            ValueError: Si el motor no existe
+        """
+        if motor_oraciones not in MOTORES_ORACIONES:
+            raise ValueError(f"Motor de oraciones no válido: {motor_oraciones!r} (opciones: {MOTORES_ORACIONES})")
+        self.motor_oraciones = motor_oraciones
+
+        disponibles = catalogo(caracteristicas_dominio)
+        self.faltantes = [col for col in columnas if col not in disponibles]
+        if self.faltantes:
+            print(f"⚠️ Columnas sin extractor de texto (no se calculan): {self.faltantes}")
+        columnas = [col for col in columnas if col in disponibles]
+
+        # Cierre de dependencias
+        necesarias = set()
+        pendientes = list(columnas)
+        while pendientes:
+            nombre = pendientes.pop()
+            if nombre not in necesarias:
+                necesarias.add(nombre)
+                pendientes.extend(disponibles[nombre]['depende'])
+
+        # Pedidas y necesarias en el orden del catálogo
+        self.columnas = [nombre for nombre in disponibles if nombre in set(columnas)]
+        self.necesarias = [nombre for nombre in disponibles if nombre in necesarias]
+
+        grupos = {disponibles[nombre]['grupo'] for nombre in self.necesarias}
+        self.costes = {grupo: GRUPOS[grupo]['coste'] for grupo in grupos}
+        self.recursos = sorted({recurso for grupo in grupos for recurso in GRUPOS[grupo]['recursos']})
+        if 'sentence_count' in necesarias and motor_oraciones == 'punkt':
+            self.costes['longitud'] += COSTE_PUNKT
+            self.recursos.append(recurso_punkt())
+
+        # De más barato a más caro (a igual coste, en el orden de GRUPOS)
+        self.grupos = sorted(grupos, key=lambda grupo: (self.costes[grupo], list(GRUPOS).index(grupo)))
+
+    def incluye(self, grupo):
+        """Indica si el plan ejecuta el grupo."""
+        return grupo in self.costes
+
+    def metodos(self):
+        """Nombres de los métodos del extractor a ejecutar, en orden."""
+        return [GRUPOS[grupo]['metodo'] for grupo in self.grupos]
+
+    @property
+    def coste(self):
+        """Coste relativo por texto de todo el plan."""
+        return sum(self.costes.values())
+
+    def resumen(self):
+        """Descripción de una línea del plan."""
+        return (f"{len(self.columnas)} características, grupos: {', '.join(self.grupos) or 'ninguno'} "
+                f"(coste relativo {self.coste})")
@@ -0,0 +1,124 @@
+"""
+Recursos NLTK - Amazon Reviews
+Resuelve los recursos de datos de NLTK (stopwords, punkt, wordnet, VADER...)
+de forma perezosa: solo se buscan la primera vez que una etapa los necesita
+y el resultado se guarda en memoria para el resto del proceso.
+
+Importar este módulo no importa nltk ni accede al disco o a la red. Por
+defecto nunca se descarga nada: si falta un recurso se lanza
+RecursoNLTKNoDisponible de inmediato con el comando para instalarlo. La
+descarga automática solo se intenta si se pide explícitamente con
+descargar=True o con la variable de entorno NLTK_DESCARGA_AUTOMATICA=1.
+"""
+
+import os
+
+# Nombre del paquete de nltk.download -> ruta para nltk.data.find
+RECURSOS = {
+    'stopwords': 'corpora/stopwords',
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'wordnet': 'corpora/wordnet',
+    'vader_lexicon': 'sentiment/vader_lexicon.zip',
+}
+
+VARIABLE_DESCARGA = 'NLTK_DESCARGA_AUTOMATICA'
+
+# Recursos ya localizados en este proceso
+_disponibles = set()
+
+# Segmentadores Punkt ya cargados, por idioma
+_punkt = {}
+
+
+class RecursoNLTKNoDisponible(LookupError):
+    """Un recurso de datos de NLTK no está instalado."""
+
+
+def _descarga_permitida(descargar):
+    """Decide si se puede intentar la descarga de un recurso."""
+    if descargar is not None:
+        return descargar
+    return os.environ.get(VARIABLE_DESCARGA, '0') == '1'
+
+
+def disponible(nombre):
+    """
+    Indica si un recurso está instalado (sin descargar nada).
+
+    Args:
+        nombre: Clave de RECURSOS (p.ej. 'stopwords')
+
+    Returns:
+        bool
+    """
+    if nombre in _disponibles:
+        return True
+
+    import nltk
+
+    try:
+        nltk.data.find(RECURSOS[nombre])
+    except LookupError:
+        return False
+    _disponibles.add(nombre)
+    return True
+
+
+def recurso_punkt():
+    """Recurso de Punkt que usa sent_tokenize: punkt_tab desde nltk 3.9, punkt antes."""
+    import nltk
+
+    version = tuple(int(parte) for parte in nltk.__version__.split('.')[:2])
+    return 'punkt_tab' if version >= (3, 9) else 'punkt'
+
+
+def requerir(*nombres, descargar=None):
+    """
+    Garantiza que los recursos estén instalados antes de usarlos.
+
+    Args:
+        *nombres: Claves de RECURSOS
+        descargar: Si True, intenta descargar los que falten; si None, lo
+            decide la variable de entorno NLTK_DESCARGA_AUTOMATICA
+
+    Raises:
+        RecursoNLTKNoDisponible: Si falta algún recurso y no pudo descargarse
+    """
+    for nombre in nombres:
+        if disponible(nombre):
+            continue
+
+        if _descarga_permitida(descargar):
+            import nltk
+
+            if nltk.download(nombre, quiet=True) and disponible(nombre):
+                continue
+
+        raise RecursoNLTKNoDisponible(
+            f"Falta el recurso de NLTK '{nombre}' ({RECURSOS[nombre]}). "
+            f"Instálalo con: python -m nltk.downloader {nombre} "
+            f"(o apunta NLTK_DATA a un directorio que lo contenga)"
+        )
+
+
+def obtener_punkt(idioma='english'):
+    """
+    Devuelve el segmentador Punkt que usa nltk.sent_tokenize (cargado una vez).
+
+    Args:
+        idioma: Modelo de Punkt
+
+    Returns:
+        PunktSentenceTokenizer
+    """
+    if idioma not in _punkt:
+        nombre = recurso_punkt()
+        requerir(nombre)
+        if nombre == 'punkt_tab':
+            from nltk.tokenize import PunktTokenizer
+            _punkt[idioma] = PunktTokenizer(idioma)
+        else:
+            import nltk
+            _punkt[idioma] = nltk.data.load(f'tokenizers/punkt/{idioma}.pickle')
+    return _punkt[idioma]
@@ -0,0 +1,187 @@
+"""
+Segmentación de Texto - Amazon Reviews
+Calcula una sola vez los límites de tokens y oraciones de CleanText para
+guardarlos junto al texto como columnas Arrow list<int32>.
+
+Cada fila guarda los pares [inicio, fin) aplanados:
+
+    TokenOffsets    = [ini_0, fin_0, ini_1, fin_1, ...]   (tokens de str.split)
+    SentenceOffsets = [ini_0, fin_0, ini_1, fin_1, ...]   (oraciones de Punkt)
+
+de modo que word_count = len(TokenOffsets) // 2 y la longitud del token i es
+fin_i - ini_i. Las posiciones son índices de carácter de Python.
+
+También define los motores para contar oraciones: 'punkt' (nltk.sent_tokenize)
+y 'regex', un contador de fines de oración mucho más rápido que no
+reconoce abreviaturas (ver contar_oraciones).
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from recursos_nltk import obtener_punkt
+
+COLUMNA_TOKENS = 'TokenOffsets'
+COLUMNA_ORACIONES = 'SentenceOffsets'
+
+TIPO_OFFSETS = pa.list_(pa.int32())
+
+# Motores de conteo de oraciones
+MOTORES_ORACIONES = ('punkt', 'regex')
+MOTOR_ORACIONES_DEFECTO = 'punkt'
+
+# Espacios ASCII de str.split(), escritos explícitamente para que Python y
+# RE2 (Arrow) usen la misma clase
+_CARACTERES_ESPACIO = '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f '
+_ESPACIOS_ASCII = r'\t\n\x0b\x0c\r\x1c-\x1f '
+
+# Fin de oración del motor 'regex': uno o más .!? seguidos de un espacio o
+# del final del texto
+PATRON_FIN_ORACION = re.compile(rf'[.!?]+(?:[{_ESPACIOS_ASCII}]|\Z)')
+_RE2_FIN_ORACION = rf'[.!?]+(?:[{_ESPACIOS_ASCII}]|$)'
+_RE2_CIERRE = rf'[.!?][{_ESPACIOS_ASCII}]*$'
+_RE2_VACIO = rf'^[{_ESPACIOS_ASCII}]*$'
+
+
+def offsets_tokens(serie):
+    """
+    Límites de los tokens separados por espacios de cada texto, vectorizado.
+
+    Pensado para CleanText, cuyos tokens solo se separan con ' ' (la
+    limpieza básica colapsa cualquier otro espacio); en ese caso los
+    tokens coinciden con los de str.split().
+
+    Args:
+        serie: pd.Series de textos (sin nulos)
+
+    Returns:
+        pa.ListArray list<int32> con los pares [inicio, fin) aplanados
+    """
+    textos = pa.array(serie.astype(str), type=pa.string())
+    partes = pc.split_pattern(textos, pattern=' ')
+
+    offsets_filas = partes.offsets.to_numpy()
+    longitudes = pc.utf8_length(partes.flatten()).to_numpy().astype(np.int64)
+
+    # Fin de cada parte dentro de su texto: suma acumulada de (longitud + 1
+    # separador) menos lo acumulado antes del primer token de la fila
+    acumulado = np.cumsum(longitudes + 1)
+    fila = np.repeat(np.arange(len(textos)), np.diff(offsets_filas))
+    base = np.concatenate(([0], acumulado))[offsets_filas[:-1]]
+    fines = acumulado - 1 - base[fila]
+    inicios = fines - longitudes
+
+    # Las partes vacías (texto vacío o espacios repetidos) no son tokens
+    validos = longitudes > 0
+    pares = np.empty(2 * int(validos.sum()), dtype=np.int32)
+    pares[0::2] = inicios[validos]
+    pares[1::2] = fines[validos]
+
+    por_fila = np.bincount(fila[validos], minlength=len(textos))
+    offsets_lista = np.concatenate(([0], np.cumsum(2 * por_fila))).astype(np.int32)
+
+    return pa.ListArray.from_arrays(pa.array(offsets_lista), pa.array(pares, type=pa.int32()))
+
+
+def offsets_oraciones(serie, idioma='english'):
+    """
+    Límites de las oraciones de cada texto según Punkt (nltk.sent_tokenize).
+
+    Args:
+        serie: pd.Series de textos (sin nulos)
+        idioma: Modelo de Punkt
+
+    Returns:
+        pa.ListArray list<int32> con los pares [inicio, fin) aplanados
+    """
+    punkt = obtener_punkt(idioma)
+    filas = [
+        [limite for span in punkt.span_tokenize(texto) for limite in span]
+        for texto in serie.astype(str)
+    ]
+    return pa.array(filas, type=TIPO_OFFSETS)
+
+
+def contar_oraciones(text):
+    """
+    Cuenta las oraciones de un texto con el motor 'regex'.
+
+    Cada racha de .!? seguida de un espacio (o del final) cierra una
+    oración, y el texto final sin puntuación cuenta como una más. A
+    diferencia de Punkt, corta también tras abreviaturas ('mr. smith') e
+    iniciales.
+
+    Args:
+        text: Texto
+
+    Returns:
+        int: Número de oraciones (0 para un texto vacío o solo espacios)
+    """
+    recortado = text.rstrip(_CARACTERES_ESPACIO)
+    if not recortado:
+        return 0
+    return len(PATRON_FIN_ORACION.findall(recortado)) + (0 if recortado[-1] in '.!?' else 1)
+
+
+def contar_oraciones_lote(textos):
+    """
+    contar_oraciones vectorizado sobre un array de textos ASCII.
+
+    Args:
+        textos: pa.StringArray de textos ASCII
+
+    Returns:
+        np.ndarray int64 con el número de oraciones de cada texto
+    """
+    fines = pc.count_substring_regex(textos, pattern=_RE2_FIN_ORACION).to_numpy().astype(np.int64)
+    cerrado = pc.match_substring_regex(textos, pattern=_RE2_CIERRE).to_numpy(zero_copy_only=False)
+    vacio = pc.match_substring_regex(textos, pattern=_RE2_VACIO).to_numpy(zero_copy_only=False)
+    return np.where(vacio, 0, fines + ~cerrado)
+
+
+def agregar_offsets(df, columna='CleanText', tokens=True, oraciones=True):
+    """
+    Añade TokenOffsets y/o SentenceOffsets a un DataFrame.
+
+    Args:
+        df: DataFrame con la columna de texto
+        columna: Columna de la que se calculan los límites
+        tokens: Si True, calcula los límites de tokens
+        oraciones: Si True, calcula los límites de oraciones (Punkt)
+
+    Returns:
+        DataFrame con las columnas añadidas (dtype Arrow list<int32>)
+    """
+    columnas = {}
+    if tokens:
+        columnas[COLUMNA_TOKENS] = offsets_tokens(df[columna])
+    if oraciones:
+        columnas[COLUMNA_ORACIONES] = offsets_oraciones(df[columna])
+
+    for nombre, valores in columnas.items():
+        df[nombre] = pd.Series(pd.arrays.ArrowExtensionArray(valores), index=df.index)
+
+    return df
+
+
+def bytes_columnas(df, columnas):
+    """Tamaño en memoria (formato Arrow) de las columnas indicadas."""
+    return sum(pa.array(df[col]).nbytes for col in columnas if col in df.columns)
+
+
+def desde_offsets(offsets):
+    """
+    Convierte los pares aplanados de una fila en (inicios, fines).
+
+    Args:
+        offsets: Valor de TokenOffsets o SentenceOffsets (array o lista)
+
+    Returns:
+        tuple: (np.ndarray inicios, np.ndarray fines)
+    """
+    pares = np.asarray(offsets, dtype=np.int64)
+    return pares[0::2], pares[1::2]